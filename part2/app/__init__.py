@@ -13,6 +13,8 @@ from app.api.v1.amenities import api as amenities_ns
 from app.api.v1.places import api as places_ns
 from app.api.v1.reviews import api as reviews_ns
 from app.api.v1.users import api as users_ns
+from app.persistence.journal import Journal
+from app.services import facade
 
 
 def create_app(config_class="config.DevelopmentConfig"):
@@ -43,4 +45,13 @@ def create_app(config_class="config.DevelopmentConfig"):
     api.add_namespace(places_ns, path="/api/v1/places")
     api.add_namespace(reviews_ns, path="/api/v1/reviews")
 
+    if app.config.get("JOURNAL_DIR") and facade.journal is None:
+        facade.open_journal(
+            Journal(
+                app.config["JOURNAL_DIR"],
+                fsync=app.config["JOURNAL_FSYNC"],
+                snapshot_every=app.config["JOURNAL_SNAPSHOT_EVERY"]
+            )
+        )
+
     return app
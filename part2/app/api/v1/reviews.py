@@ -165,9 +165,20 @@ class ReviewList(Resource):
                 "error": "Place not found"
             }, 404
 
-        review = facade.create_review(
-            review_data
-        )
+        if facade.get_user_review_for_place(user.id, place.id):
+            return {
+                "error": "User has already reviewed this place"
+            }, 400
+
+        try:
+            review = facade.create_review(
+                review_data
+            )
+        except ValueError:
+            # Another request created the review since the check.
+            return {
+                "error": "User has already reviewed this place"
+            }, 400
 
         if not review:
             return {
@@ -170,7 +170,13 @@ class UserList(Resource):
                 "error": "Email already registered"
             }, 400
 
-        new_user = facade.create_user(user_data)
+        try:
+            new_user = facade.create_user(user_data)
+        except ValueError:
+            # Another request registered the email since the check.
+            return {
+                "error": "Email already registered"
+            }, 400
 
         return serialize_user(new_user), 201
 
@@ -253,9 +259,14 @@ class UserResource(Resource):
                     "error": "Email already registered"
                 }, 400
 
-        updated_user = facade.update_user(
-            user_id,
-            user_data
-        )
+        try:
+            updated_user = facade.update_user(
+                user_id,
+                user_data
+            )
+        except ValueError:
+            return {
+                "error": "Email already registered"
+            }, 400
 
         return serialize_user(updated_user), 200
@@ -11,6 +11,10 @@ class Amenity(BaseModel):
     Represent an amenity that can be associated with one or more places.
     """
 
+    __slots__ = ("name",)
+
+    record_fields = ("name",)
+
     def __init__(self, name):
         """
         Initialize an Amenity instance.
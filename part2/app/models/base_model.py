@@ -1,21 +1,91 @@
 #!/usr/bin/python3
 """
 Base model class for all HBnB entities.
+
+Models declare __slots__, so instances carry no attribute dictionary,
+and keep their timestamps as integer microseconds since the epoch. The
+created_at and updated_at properties convert them to local naive
+datetimes only when read, as to_dict() does.
 """
 
 from datetime import datetime
+import time
 import uuid
 
 
+MICROSECONDS = 10 ** 6
+
+
+def now_epoch():
+    """
+    Return the current time in microseconds since the epoch.
+    """
+
+    return time.time_ns() // 1000
+
+
+def to_epoch(value):
+    """
+    Return a local naive datetime in microseconds since the epoch.
+    """
+
+    seconds = int(value.replace(microsecond=0).timestamp())
+
+    return seconds * MICROSECONDS + value.microsecond
+
+
+def from_epoch(value):
+    """
+    Return microseconds since the epoch as a local naive datetime.
+    """
+
+    seconds, microseconds = divmod(value, MICROSECONDS)
+
+    return datetime.fromtimestamp(seconds).replace(
+        microsecond=microseconds
+    )
+
+
 class BaseModel:
     """
     Parent class for all models.
+
+    Subclasses declare their attributes in __slots__, and list in
+    record_fields the ones written to the journal besides the ID and
+    timestamps.
     """
 
+    __slots__ = ("id", "_created_at", "_updated_at")
+
+    record_fields = ()
+
     def __init__(self):
         self.id = str(uuid.uuid4())
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+        self._created_at = self._updated_at = now_epoch()
+
+    @property
+    def created_at(self):
+        """
+        Returns the creation time as a datetime.
+        """
+
+        return from_epoch(self._created_at)
+
+    @created_at.setter
+    def created_at(self, value):
+        self._created_at = to_epoch(value)
+
+    @property
+    def updated_at(self):
+        """
+        Returns the last update time as a datetime.
+        """
+
+        return from_epoch(self._updated_at)
+
+    @updated_at.setter
+    def updated_at(self, value):
+        self._updated_at = to_epoch(value)
 
     def update(self, data):
         """
@@ -26,7 +96,7 @@ class BaseModel:
             if hasattr(self, key):
                 setattr(self, key, value)
 
-        self.updated_at = datetime.now()
+        self._updated_at = now_epoch()
 
     def to_dict(self):
         """
@@ -38,3 +108,36 @@ class BaseModel:
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat()
         }
+
+    def to_record(self):
+        """
+        Returns the state written to the journal.
+        """
+
+        return self.to_dict()
+
+    def load_record(self, record):
+        """
+        Sets the ID, timestamps, and record fields from a journal record.
+        """
+
+        self.id = record["id"]
+        self.created_at = datetime.fromisoformat(record["created_at"])
+        self.updated_at = datetime.fromisoformat(record["updated_at"])
+
+        for name in self.record_fields:
+            setattr(self, name, record[name])
+
+    @classmethod
+    def from_record(cls, record):
+        """
+        Returns an instance restored from a journal record.
+
+        __init__ is not called, so restoring does not generate an ID or
+        link the instance to others; subclasses add their relations.
+        """
+
+        obj = cls.__new__(cls)
+        obj.load_record(record)
+
+        return obj
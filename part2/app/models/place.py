@@ -9,8 +9,30 @@ from app.models.base_model import BaseModel
 class Place(BaseModel):
     """
     Represent a property listed in the HBnB application.
+
+    Reviews and amenities are kept in dictionaries keyed by ID, in the
+    order they were added, so membership checks do not scan them.
     """
 
+    __slots__ = (
+        "title",
+        "description",
+        "price",
+        "latitude",
+        "longitude",
+        "owner",
+        "reviews",
+        "amenities"
+    )
+
+    record_fields = (
+        "title",
+        "description",
+        "price",
+        "latitude",
+        "longitude"
+    )
+
     def __init__(
         self,
         title,
@@ -40,11 +62,34 @@ class Place(BaseModel):
         self.latitude = latitude
         self.longitude = longitude
         self.owner = owner
-        self.reviews = []
-        self.amenities = []
+        self.reviews = {}
+        self.amenities = {}
 
         owner.add_place(self)
 
+    @classmethod
+    def from_record(cls, record, owner, amenities):
+        """
+        Restore a place from a journal record.
+
+        Args:
+            record (dict): State written by to_record().
+            owner (User): User whose ID the record holds.
+            amenities (list): Amenities whose IDs the record holds.
+
+        Returns:
+            Place: Restored place, linked to its owner.
+        """
+
+        place = super().from_record(record)
+        place.owner = owner
+        place.reviews = {}
+        place.amenities = {amenity.id: amenity for amenity in amenities}
+
+        owner.add_place(place)
+
+        return place
+
     def add_review(self, review):
         """
         Associate a review with the place.
@@ -53,8 +98,17 @@ class Place(BaseModel):
             review (Review): Review associated with the place.
         """
 
-        if review not in self.reviews:
-            self.reviews.append(review)
+        self.reviews.setdefault(review.id, review)
+
+    def remove_review(self, review):
+        """
+        Dissociate a review from the place.
+
+        Args:
+            review (Review): Review to remove.
+        """
+
+        self.reviews.pop(review.id, None)
 
     def add_amenity(self, amenity):
         """
@@ -64,8 +118,7 @@ class Place(BaseModel):
             amenity (Amenity): Amenity available at the place.
         """
 
-        if amenity not in self.amenities:
-            self.amenities.append(amenity)
+        self.amenities.setdefault(amenity.id, amenity)
 
     def to_dict(self):
         """
@@ -84,3 +137,13 @@ class Place(BaseModel):
         })
 
         return data
+
+    def to_record(self):
+        """
+        Return the state written to the journal, with amenity IDs.
+        """
+
+        data = self.to_dict()
+        data["amenity_ids"] = list(self.amenities)
+
+        return data
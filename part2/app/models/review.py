@@ -11,6 +11,10 @@ class Review(BaseModel):
     Represent a review written by a user for a place.
     """
 
+    __slots__ = ("text", "user", "place")
+
+    record_fields = ("text",)
+
     def __init__(self, text, user, place):
         """
         Initialize a Review instance.
@@ -30,6 +34,53 @@ class Review(BaseModel):
         place.add_review(self)
         user.add_review(self)
 
+    @classmethod
+    def from_record(cls, record, user, place):
+        """
+        Restore a review from a journal record.
+
+        Args:
+            record (dict): State written by to_record().
+            user (User): User whose ID the record holds.
+            place (Place): Place whose ID the record holds.
+
+        Returns:
+            Review: Restored review, linked to its user and place.
+        """
+
+        review = super().from_record(record)
+        review.user = user
+        review.place = place
+
+        place.add_review(review)
+        user.add_review(review)
+
+        return review
+
+    @property
+    def user_id(self):
+        """
+        Return the ID of the review's author.
+        """
+
+        return self.user.id
+
+    @property
+    def place_id(self):
+        """
+        Return the ID of the reviewed place.
+        """
+
+        return self.place.id
+
+    @property
+    def user_place(self):
+        """
+        Return the IDs of the author and place, unique per review.
+        """
+
+        return self.user.id, self.place.id
+
     def to_dict(self):
         """
         Return a dictionary representation of the review.
@@ -39,8 +90,8 @@ class Review(BaseModel):
 
         data.update({
             "text": self.text,
-            "user_id": self.user.id,
-            "place_id": self.place.id
+            "user_id": self.user_id,
+            "place_id": self.place_id
         })
 
         return data
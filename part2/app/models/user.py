@@ -9,8 +9,15 @@ from app.models.base_model import BaseModel
 class User(BaseModel):
     """
     Represent a user in the HBnB application.
+
+    Places and reviews are kept in dictionaries keyed by ID, in the
+    order they were added.
     """
 
+    __slots__ = ("first_name", "last_name", "email", "places", "reviews")
+
+    record_fields = ("first_name", "last_name", "email")
+
     def __init__(self, first_name, last_name, email):
         """
         Initialize a User instance.
@@ -26,8 +33,26 @@ class User(BaseModel):
         self.first_name = first_name
         self.last_name = last_name
         self.email = email
-        self.places = []
-        self.reviews = []
+        self.places = {}
+        self.reviews = {}
+
+    @classmethod
+    def from_record(cls, record):
+        """
+        Restore a user from a journal record, without places or reviews.
+
+        Args:
+            record (dict): State written by to_record().
+
+        Returns:
+            User: Restored user.
+        """
+
+        user = super().from_record(record)
+        user.places = {}
+        user.reviews = {}
+
+        return user
 
     def add_place(self, place):
         """
@@ -37,8 +62,7 @@ class User(BaseModel):
             place (Place): Place owned by the user.
         """
 
-        if place not in self.places:
-            self.places.append(place)
+        self.places.setdefault(place.id, place)
 
     def add_review(self, review):
         """
@@ -48,8 +72,17 @@ class User(BaseModel):
             review (Review): Review written by the user.
         """
 
-        if review not in self.reviews:
-            self.reviews.append(review)
+        self.reviews.setdefault(review.id, review)
+
+    def remove_review(self, review):
+        """
+        Dissociate a review from the user.
+
+        Args:
+            review (Review): Review to remove.
+        """
+
+        self.reviews.pop(review.id, None)
 
     def to_dict(self):
         """
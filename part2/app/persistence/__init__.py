@@ -1 +1,4 @@
 from app.persistence.repository import Repository, InMemoryRepository
+from app.persistence.concurrent_repository import (
+    ConcurrentInMemoryRepository
+)
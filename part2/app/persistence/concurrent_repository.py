@@ -0,0 +1,374 @@
+#!/usr/bin/python3
+"""
+Thread-safe in-memory repository for multi-threaded servers.
+
+Objects are spread over shards by ID, each guarded by its own
+reader/writer lock, so writes to different objects rarely wait for one
+another and readers of a shard only wait for its writers. The attribute
+indexes are shared by all shards behind a plain lock, held only for
+dictionary updates and always taken after a shard lock.
+"""
+
+from contextlib import ExitStack
+import heapq
+import itertools
+import threading
+
+from app.persistence.repository import InMemoryRepository
+
+
+class _Guard:
+    """
+    Context manager calling a pair of acquire and release functions.
+    """
+
+    __slots__ = ("_acquire", "_release")
+
+    def __init__(self, acquire, release):
+        """
+        Bind the functions.
+        """
+
+        self._acquire = acquire
+        self._release = release
+
+    def __enter__(self):
+        """
+        Acquire on entering the with block.
+        """
+
+        self._acquire()
+
+    def __exit__(self, *exc_info):
+        """
+        Release on leaving the with block.
+        """
+
+        self._release()
+
+
+class ReadWriteLock:
+    """
+    Lock held by any number of readers or by a single writer.
+
+    Waiting writers block new readers, so a steady stream of reads
+    cannot starve writes. The lock is not reentrant. Use the read and
+    write attributes as context managers.
+    """
+
+    def __init__(self):
+        """
+        Initialize an unlocked lock.
+        """
+
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writing = False
+        self._waiting_writers = 0
+        self.read = _Guard(self.acquire_read, self.release_read)
+        self.write = _Guard(self.acquire_write, self.release_write)
+
+    def acquire_read(self):
+        """
+        Wait until no writer holds or waits for the lock, then share it.
+        """
+
+        with self._condition:
+            while self._writing or self._waiting_writers:
+                self._condition.wait()
+
+            self._readers += 1
+
+    def release_read(self):
+        """
+        Release a shared hold.
+        """
+
+        with self._condition:
+            self._readers -= 1
+
+            if not self._readers and self._waiting_writers:
+                self._condition.notify_all()
+
+    def acquire_write(self):
+        """
+        Wait until the lock is free, then hold it exclusively.
+        """
+
+        with self._condition:
+            self._waiting_writers += 1
+
+            while self._writing or self._readers:
+                self._condition.wait()
+
+            self._waiting_writers -= 1
+            self._writing = True
+
+    def release_write(self):
+        """
+        Release an exclusive hold.
+        """
+
+        with self._condition:
+            self._writing = False
+            self._condition.notify_all()
+
+
+class ConcurrentInMemoryRepository(InMemoryRepository):
+    """
+    InMemoryRepository safe to share between request threads.
+
+    Each shard maps IDs to (sequence, object) pairs, the sequence
+    recording insertion order across shards. get_all() holds every
+    shard's read lock while copying, so it returns one consistent
+    snapshot in insertion order. Journal records are appended while the
+    shard's write lock is held, so the records of one object are in the
+    order of its writes.
+    """
+
+    def __init__(self, unique=(), indexed=(), shards=16):
+        """
+        Initialize empty sharded storage.
+
+        Args:
+            unique (iterable): Attributes whose values identify at most
+                one object.
+            indexed (iterable): Attributes shared by any number of
+                objects.
+            shards (int): Number of independently locked shards.
+        """
+
+        super().__init__(unique=unique, indexed=indexed)
+
+        self._shards = [{} for _ in range(shards)]
+        self._locks = [ReadWriteLock() for _ in range(shards)]
+        self._index_lock = threading.Lock()
+        self._sequence = itertools.count()
+
+    def _shard_of(self, obj_id):
+        """
+        Return the position of the shard holding an ID.
+        """
+
+        return hash(obj_id) % len(self._shards)
+
+    def _is_indexed(self, attr_name, attr_value):
+        """
+        Return whether a lookup can be answered by an index.
+        """
+
+        return attr_value is not None and (
+            attr_name in self._unique or attr_name in self._indexes
+        )
+
+    def add(self, obj):
+        """
+        Add an object to storage.
+
+        Args:
+            obj: Object to store.
+
+        Returns:
+            The stored object.
+
+        Raises:
+            ValueError: If a unique attribute value is already taken.
+        """
+
+        position = self._shard_of(obj.id)
+        shard = self._shards[position]
+
+        with self._locks[position].write:
+            values = self._read_indexed(obj)
+
+            with self._index_lock:
+                self._check_unique(obj, values)
+
+                if obj.id in shard:
+                    self._unindex(obj.id, self._indexed_values.pop(obj.id))
+
+                self._index(obj, values)
+
+            shard[obj.id] = (next(self._sequence), obj)
+            self._record_put(obj)
+
+        return obj
+
+    def get(self, obj_id):
+        """
+        Retrieve an object by ID.
+
+        Args:
+            obj_id (str): Object identifier.
+
+        Returns:
+            The matching object, or None.
+        """
+
+        position = self._shard_of(obj_id)
+
+        with self._locks[position].read:
+            entry = self._shards[position].get(obj_id)
+
+        return entry[1] if entry is not None else None
+
+    def get_all(self):
+        """
+        Return a consistent snapshot of all stored objects.
+
+        Returns:
+            list: All objects in insertion order.
+        """
+
+        with ExitStack() as stack:
+            for lock in self._locks:
+                stack.enter_context(lock.read)
+
+            entries = [list(shard.values()) for shard in self._shards]
+
+        return [obj for _, obj in heapq.merge(*entries)]
+
+    def update(self, obj_id, data):
+        """
+        Update a stored object.
+
+        Args:
+            obj_id (str): Object identifier.
+            data (dict): Attributes and values to update.
+
+        Returns:
+            The updated object, or None.
+
+        Raises:
+            ValueError: If the update takes a unique value already held
+                by another object. The object is left unchanged.
+        """
+
+        position = self._shard_of(obj_id)
+
+        with self._locks[position].write:
+            entry = self._shards[position].get(obj_id)
+
+            if entry is None:
+                return None
+
+            obj = entry[1]
+            self._apply_update(obj, data)
+            self._record_put(obj)
+
+        return obj
+
+    def save(self, obj):
+        """
+        Record changes made to a stored object directly.
+
+        Args:
+            obj: Stored object.
+
+        Raises:
+            ValueError: If a unique attribute value is already taken.
+        """
+
+        with self._locks[self._shard_of(obj.id)].write:
+            self.reindex(obj)
+            self._record_put(obj)
+
+    def reindex(self, obj):
+        """
+        Refresh the index entries of a stored object.
+
+        Args:
+            obj: Object whose indexed attributes may have changed.
+
+        Raises:
+            ValueError: If a unique attribute value is already taken.
+        """
+
+        with self._index_lock:
+            super().reindex(obj)
+
+    def delete(self, obj_id):
+        """
+        Delete a stored object.
+
+        Args:
+            obj_id (str): Object identifier.
+
+        Returns:
+            bool: True if deleted, otherwise False.
+        """
+
+        position = self._shard_of(obj_id)
+        shard = self._shards[position]
+
+        with self._locks[position].write:
+            if obj_id not in shard:
+                return False
+
+            del shard[obj_id]
+
+            with self._index_lock:
+                self._unindex(obj_id, self._indexed_values.pop(obj_id))
+
+            self._record_delete(obj_id)
+
+        return True
+
+    def clear(self):
+        """
+        Remove every object and index entry.
+        """
+
+        for position, lock in enumerate(self._locks):
+            with lock.write:
+                self._shards[position].clear()
+
+        with self._index_lock:
+            super().clear()
+
+    def get_by_attribute(self, attr_name, attr_value):
+        """
+        Retrieve the first object matching an attribute value.
+
+        Args:
+            attr_name (str): Attribute name.
+            attr_value: Expected attribute value.
+
+        Returns:
+            The matching object, or None.
+        """
+
+        if self._is_indexed(attr_name, attr_value):
+            with self._index_lock:
+                return super().get_by_attribute(attr_name, attr_value)
+
+        return next(
+            (
+                obj
+                for obj in self.get_all()
+                if getattr(obj, attr_name, None) == attr_value
+            ),
+            None
+        )
+
+    def get_all_by_attribute(self, attr_name, attr_value):
+        """
+        Retrieve every object matching an attribute value.
+
+        Args:
+            attr_name (str): Attribute name.
+            attr_value: Expected attribute value.
+
+        Returns:
+            list: Matching objects.
+        """
+
+        if self._is_indexed(attr_name, attr_value):
+            with self._index_lock:
+                return super().get_all_by_attribute(attr_name, attr_value)
+
+        return [
+            obj
+            for obj in self.get_all()
+            if getattr(obj, attr_name, None) == attr_value
+        ]
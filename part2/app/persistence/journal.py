@@ -0,0 +1,343 @@
+#!/usr/bin/python3
+"""
+Append-only journal making the in-memory repositories durable.
+
+Every write appends one record to a log file: a 4-byte length and a
+4-byte CRC32, both big-endian, followed by the JSON body
+``[entity, op, id, data]``. A put record holds an object's full state
+and a delete record only its ID, so applying a record twice leaves the
+same state and replay never needs to know which records a snapshot
+already covers.
+
+Once ``snapshot_every`` records have been appended, a background thread
+compacts the journal: the log is renamed aside under the write lock,
+then every object is written to a new snapshot file without holding it,
+and the old log is removed once the snapshot is renamed into place.
+Startup replays the snapshot, any log left aside by an interrupted
+compaction, then the current log. A torn record at the end of the log,
+left by a crash mid-write, is truncated away.
+
+Reads never touch the journal.
+"""
+
+import json
+import os
+import shutil
+import struct
+import threading
+import zlib
+
+
+HEADER = struct.Struct(">II")
+
+PUT = "put"
+DELETE = "delete"
+
+FSYNC_ALWAYS = "always"
+FSYNC_NEVER = "never"
+
+_decode_json = json.JSONDecoder().decode
+
+
+def encode_record(entity, op, obj_id, data=None):
+    """
+    Return the bytes of one record, header included.
+
+    Args:
+        entity (str): Repository name.
+        op (str): PUT or DELETE.
+        obj_id (str): Object identifier.
+        data (dict): Full object state for PUT records.
+
+    Returns:
+        bytes: Encoded record.
+    """
+
+    body = json.dumps(
+        [entity, op, obj_id, data],
+        separators=(",", ":")
+    ).encode("utf-8")
+
+    return HEADER.pack(len(body), zlib.crc32(body)) + body
+
+
+def decode_records(buffer):
+    """
+    Decode the complete records at the start of a buffer.
+
+    Decoding stops at the first incomplete or corrupt record.
+
+    Args:
+        buffer (bytes): File contents.
+
+    Yields:
+        tuple: Decoded record as a list, and the offset just past it.
+    """
+
+    offset = 0
+    view = memoryview(buffer)
+
+    while offset + HEADER.size <= len(buffer):
+        length, checksum = HEADER.unpack_from(buffer, offset)
+        start = offset + HEADER.size
+        end = start + length
+
+        if end > len(buffer) or zlib.crc32(view[start:end]) != checksum:
+            break
+
+        yield _decode_json(str(view[start:end], "utf-8")), end
+        offset = end
+
+
+def parse_fsync(value):
+    """
+    Return an fsync policy from configuration.
+
+    Args:
+        value (str or int): "always", "never", or a number of
+            milliseconds between syncs.
+
+    Returns:
+        str or int: FSYNC_ALWAYS, FSYNC_NEVER, or milliseconds.
+
+    Raises:
+        ValueError: If the value is none of these.
+    """
+
+    if value in (FSYNC_ALWAYS, FSYNC_NEVER):
+        return value
+
+    try:
+        interval = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid fsync policy: {value}") from None
+
+    if interval <= 0:
+        raise ValueError(f"Invalid fsync policy: {value}")
+
+    return interval
+
+
+class Journal:
+    """
+    Write-ahead log and snapshot files in one directory.
+    """
+
+    def __init__(self, directory, fsync=FSYNC_ALWAYS, snapshot_every=100000):
+        """
+        Initialize the journal; files are opened by replay().
+
+        Args:
+            directory (str): Directory holding the journal files.
+            fsync (str or int): FSYNC_ALWAYS to sync every record,
+                FSYNC_NEVER to leave flushing to the operating system,
+                or milliseconds between syncs.
+            snapshot_every (int): Records appended before compaction,
+                or 0 to compact only on request.
+        """
+
+        self.directory = directory
+        self.fsync = parse_fsync(fsync)
+        self.snapshot_every = snapshot_every
+        self.log_path = os.path.join(directory, "hbnb.log")
+        self.rotated_path = os.path.join(directory, "hbnb.log.old")
+        self.snapshot_path = os.path.join(directory, "hbnb.snapshot")
+        self.appended = 0
+        self.dump = None
+        self._fd = None
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._compacting = threading.Lock()
+        self._closed = threading.Event()
+        self._syncer = None
+
+    def replay(self):
+        """
+        Yield every record to apply at startup, then open the log.
+
+        The log is only opened for appending once every record has been
+        consumed.
+
+        Yields:
+            list: Records of the snapshot, the rotated log, and the
+            current log, in that order.
+        """
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        for path in (self.snapshot_path, self.rotated_path):
+            if os.path.exists(path):
+                with open(path, "rb") as file:
+                    buffer = file.read()
+
+                for record, _ in decode_records(buffer):
+                    yield record
+
+        if os.path.exists(self.log_path):
+            with open(self.log_path, "rb") as file:
+                buffer = file.read()
+
+            length = 0
+
+            for record, length in decode_records(buffer):
+                self.appended += 1
+                yield record
+
+            os.truncate(self.log_path, length)
+
+        self._fd = os.open(
+            self.log_path,
+            os.O_WRONLY | os.O_APPEND | os.O_CREAT,
+            0o600
+        )
+
+        if isinstance(self.fsync, int):
+            self._syncer = threading.Thread(
+                target=self._sync_periodically,
+                name="hbnb-journal-sync",
+                daemon=True
+            )
+            self._syncer.start()
+
+    def append(self, entity, op, obj_id, data=None):
+        """
+        Append one record, syncing it according to the fsync policy.
+
+        Args:
+            entity (str): Repository name.
+            op (str): PUT or DELETE.
+            obj_id (str): Object identifier.
+            data (dict): Full object state for PUT records.
+        """
+
+        record = encode_record(entity, op, obj_id, data)
+
+        with self._lock:
+            os.write(self._fd, record)
+
+            if self.fsync == FSYNC_ALWAYS:
+                os.fsync(self._fd)
+            else:
+                self._dirty = True
+
+            self.appended += 1
+            due = self.snapshot_every and self.appended >= self.snapshot_every
+
+        if due and self.dump is not None and not self._compacting.locked():
+            threading.Thread(
+                target=self.compact,
+                name="hbnb-journal-compact",
+                daemon=True
+            ).start()
+
+    def _sync_periodically(self):
+        """
+        Sync the log every fsync milliseconds until closed.
+        """
+
+        while not self._closed.wait(self.fsync / 1000):
+            self.sync()
+
+    def sync(self):
+        """
+        Force appended records to disk.
+        """
+
+        with self._lock:
+            if self._dirty and self._fd is not None:
+                os.fsync(self._fd)
+                self._dirty = False
+
+    def compact(self):
+        """
+        Replace the snapshot and log with a snapshot of the current state.
+
+        Writers wait only while the log is renamed aside; the state is
+        written to the snapshot while they carry on appending to a new
+        log.
+
+        Returns:
+            int: Records written to the snapshot, or 0 if a compaction
+            was already running.
+        """
+
+        if not self._compacting.acquire(blocking=False):
+            return 0
+
+        try:
+            with self._lock:
+                os.fsync(self._fd)
+                os.close(self._fd)
+                self._rotate()
+                self._fd = os.open(
+                    self.log_path,
+                    os.O_WRONLY | os.O_APPEND | os.O_CREAT,
+                    0o600
+                )
+                self._dirty = False
+                self.appended = 0
+
+            temporary = self.snapshot_path + ".tmp"
+            written = 0
+
+            with open(temporary, "wb") as file:
+                for entity, obj_id, data in self.dump():
+                    file.write(encode_record(entity, PUT, obj_id, data))
+                    written += 1
+
+                file.flush()
+                os.fsync(file.fileno())
+
+            os.replace(temporary, self.snapshot_path)
+            os.remove(self.rotated_path)
+            self._sync_directory()
+
+            return written
+        finally:
+            self._compacting.release()
+
+    def _rotate(self):
+        """
+        Move the log aside, after any log an earlier compaction left.
+        """
+
+        if not os.path.exists(self.rotated_path):
+            os.replace(self.log_path, self.rotated_path)
+            return
+
+        with open(self.log_path, "rb") as source:
+            with open(self.rotated_path, "ab") as target:
+                shutil.copyfileobj(source, target)
+                target.flush()
+                os.fsync(target.fileno())
+
+        os.remove(self.log_path)
+
+    def _sync_directory(self):
+        """
+        Persist renames in the journal directory.
+        """
+
+        fd = os.open(self.directory, os.O_RDONLY)
+
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def close(self):
+        """
+        Sync and close the log.
+        """
+
+        self._closed.set()
+
+        if self._syncer is not None:
+            self._syncer.join()
+
+        with self._compacting:
+            with self._lock:
+                if self._fd is not None:
+                    os.fsync(self._fd)
+                    os.close(self._fd)
+                    self._fd = None
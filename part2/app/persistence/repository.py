@@ -5,6 +5,8 @@ Repository interface and in-memory implementation.
 
 from abc import ABC, abstractmethod
 
+from app.persistence.journal import DELETE, PUT
+
 
 class Repository(ABC):
     """
@@ -51,14 +53,119 @@ class Repository(ABC):
 class InMemoryRepository(Repository):
     """
     Store and manage objects in memory.
+
+    Attributes declared as unique or indexed are kept in hash indexes,
+    so get_by_attribute() on them is a dictionary lookup instead of a
+    scan of every object. The indexes follow add(), update(), and
+    delete(); an indexed attribute changed on an object directly must
+    be followed by reindex().
+
+    With a journal attached, every write also appends the object's
+    record to it, and an object changed directly is recorded by save().
     """
 
-    def __init__(self):
+    def __init__(self, unique=(), indexed=()):
         """
         Initialize empty in-memory storage.
+
+        Args:
+            unique (iterable): Attributes whose values identify at most
+                one object.
+            indexed (iterable): Attributes shared by any number of
+                objects.
         """
 
         self._storage = {}
+        self._unique = {name: {} for name in unique}
+        self._indexes = {name: {} for name in indexed}
+        self._indexed_names = (*self._unique, *self._indexes)
+        self._indexed_values = {}
+        self.journal = None
+        self.entity = None
+
+    def attach_journal(self, journal, entity):
+        """
+        Record later writes in a journal.
+
+        Args:
+            journal (Journal): Journal to append to.
+            entity (str): Name of the repository in its records.
+        """
+
+        self.journal = journal
+        self.entity = entity
+
+    def _record_put(self, obj):
+        """
+        Append an object's state to the journal, if any.
+        """
+
+        if self.journal is not None:
+            self.journal.append(self.entity, PUT, obj.id, obj.to_record())
+
+    def _record_delete(self, obj_id):
+        """
+        Append the deletion of an object to the journal, if any.
+        """
+
+        if self.journal is not None:
+            self.journal.append(self.entity, DELETE, obj_id)
+
+    def _read_indexed(self, obj):
+        """
+        Return the current values of an object's indexed attributes.
+        """
+
+        return {
+            name: getattr(obj, name, None)
+            for name in self._indexed_names
+        }
+
+    def _check_unique(self, obj, values):
+        """
+        Raise ValueError if another object holds a unique value.
+        """
+
+        for name, index in self._unique.items():
+            holder = index.get(values[name])
+
+            if holder is not None and holder is not obj:
+                raise ValueError(f"{name} already exists")
+
+    def _unindex(self, obj_id, values):
+        """
+        Remove an object from the indexes.
+        """
+
+        for name, value in values.items():
+            if value is None:
+                continue
+
+            if name in self._unique:
+                del self._unique[name][value]
+                continue
+
+            bucket = self._indexes[name][value]
+            del bucket[obj_id]
+
+            if not bucket:
+                del self._indexes[name][value]
+
+    def _index(self, obj, values):
+        """
+        Add an object to the indexes.
+        """
+
+        for name, value in values.items():
+            if value is None:
+                continue
+
+            if name in self._unique:
+                self._unique[name][value] = obj
+            else:
+                self._indexes[name].setdefault(value, {})[obj.id] = obj
+
+        self._indexed_values[obj.id] = values
 
     def add(self, obj):
         """
@@ -69,9 +176,20 @@ class InMemoryRepository(Repository):
 
         Returns:
             The stored object.
+
+        Raises:
+            ValueError: If a unique attribute value is already taken.
         """
 
+        values = self._read_indexed(obj)
+        self._check_unique(obj, values)
+
+        if obj.id in self._storage:
+            self._unindex(obj.id, self._indexed_values.pop(obj.id))
+
         self._storage[obj.id] = obj
+        self._index(obj, values)
+        self._record_put(obj)
 
         return obj
 
@@ -108,6 +226,10 @@ class InMemoryRepository(Repository):
 
         Returns:
             The updated object, or None.
+
+        Raises:
+            ValueError: If the update takes a unique value already held
+                by another object. The object is left unchanged.
         """
 
         obj = self.get(obj_id)
@@ -115,10 +237,73 @@ class InMemoryRepository(Repository):
         if not obj:
             return None
 
-        obj.update(data)
+        self._apply_update(obj, data)
+        self._record_put(obj)
 
         return obj
 
+    def _apply_update(self, obj, data):
+        """
+        Update a stored object and its index entries.
+
+        Every attribute the update may set, updated_at included, is
+        saved first and put back if the indexes reject the new values,
+        so a failed update changes nothing the journal has not seen.
+
+        Raises:
+            ValueError: If a unique attribute value is already taken.
+        """
+
+        previous = {
+            name: getattr(obj, name)
+            for name in (*data, "updated_at")
+            if hasattr(obj, name)
+        }
+        obj.update(data)
+
+        try:
+            self.reindex(obj)
+        except ValueError:
+            for name, value in previous.items():
+                setattr(obj, name, value)
+
+            raise
+
+    def save(self, obj):
+        """
+        Record changes made to a stored object directly.
+
+        Args:
+            obj: Stored object.
+
+        Raises:
+            ValueError: If a unique attribute value is already taken.
+        """
+
+        self.reindex(obj)
+        self._record_put(obj)
+
+    def reindex(self, obj):
+        """
+        Refresh the index entries of a stored object.
+
+        Args:
+            obj: Object whose indexed attributes may have changed.
+
+        Raises:
+            ValueError: If a unique attribute value is already taken.
+        """
+
+        values = self._read_indexed(obj)
+        previous = self._indexed_values[obj.id]
+
+        if values == previous:
+            return
+
+        self._check_unique(obj, values)
+        self._unindex(obj.id, previous)
+        self._index(obj, values)
+
     def delete(self, obj_id):
         """
         Delete a stored object.
@@ -134,9 +319,22 @@ class InMemoryRepository(Repository):
             return False
 
         del self._storage[obj_id]
+        self._unindex(obj_id, self._indexed_values.pop(obj_id))
+        self._record_delete(obj_id)
 
         return True
 
+    def clear(self):
+        """
+        Remove every object and index entry.
+        """
+
+        self._storage.clear()
+        self._indexed_values.clear()
+
+        for index in (*self._unique.values(), *self._indexes.values()):
+            index.clear()
+
     def get_by_attribute(self, attr_name, attr_value):
         """
         Retrieve the first object matching an attribute value.
@@ -149,6 +347,15 @@ class InMemoryRepository(Repository):
             The matching object, or None.
         """
 
+        if attr_value is not None:
+            if attr_name in self._unique:
+                return self._unique[attr_name].get(attr_value)
+
+            if attr_name in self._indexes:
+                bucket = self._indexes[attr_name].get(attr_value, {})
+
+                return next(iter(bucket.values()), None)
+
         return next(
             (
                 obj
@@ -157,3 +364,32 @@ class InMemoryRepository(Repository):
             ),
             None
         )
+
+    def get_all_by_attribute(self, attr_name, attr_value):
+        """
+        Retrieve every object matching an attribute value.
+
+        Args:
+            attr_name (str): Attribute name.
+            attr_value: Expected attribute value.
+
+        Returns:
+            list: Matching objects.
+        """
+
+        if attr_value is not None:
+            if attr_name in self._unique:
+                obj = self._unique[attr_name].get(attr_value)
+
+                return [obj] if obj is not None else []
+
+            if attr_name in self._indexes:
+                return list(
+                    self._indexes[attr_name].get(attr_value, {}).values()
+                )
+
+        return [
+            obj
+            for obj in self._storage.values()
+            if getattr(obj, attr_name, None) == attr_value
+        ]
@@ -3,7 +3,11 @@
 Service layer initialization.
 """
 
+from app.persistence.concurrent_repository import (
+    ConcurrentInMemoryRepository
+)
 from app.services.facade import HBnBFacade
 
 
-facade = HBnBFacade()
+# The development server handles each request in its own thread.
+facade = HBnBFacade(ConcurrentInMemoryRepository)
@@ -0,0 +1,4 @@
+#!/usr/bin/python3
+"""
+Performance benchmarks for the HBnB application.
+"""
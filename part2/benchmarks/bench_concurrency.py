@@ -0,0 +1,170 @@
+#!/usr/bin/python3
+"""
+Stress the in-memory repositories from several threads.
+
+Each thread adds its own users, then updates their emails and looks
+them up by ID and by email, while one more thread keeps taking full
+snapshots. The same workload runs against InMemoryRepository behind a
+single lock and against ConcurrentInMemoryRepository. Operations per
+second are printed, and the store is checked afterwards: every user
+present, every email resolving to its user, and no snapshot ever
+shrinking.
+
+Usage:
+    python -m benchmarks.bench_concurrency [--threads 1 2 4 8]
+"""
+
+import argparse
+import threading
+import time
+
+from app.models.user import User
+from app.persistence.concurrent_repository import (
+    ConcurrentInMemoryRepository
+)
+from app.persistence.repository import InMemoryRepository
+
+
+class LockedRepository:
+    """
+    InMemoryRepository with every call behind one lock.
+    """
+
+    def __init__(self, **options):
+        """
+        Wrap a new repository.
+        """
+
+        self._repository = InMemoryRepository(**options)
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        """
+        Return a method of the repository holding the lock.
+        """
+
+        method = getattr(self._repository, name)
+
+        def locked(*args):
+            with self._lock:
+                return method(*args)
+
+        return locked
+
+
+def work(repository, thread, users):
+    """
+    Add, update, and look up one thread's users.
+    """
+
+    created = []
+
+    for index in range(users):
+        user = User("Bench", "User", f"user{thread}-{index}@example.com")
+        repository.add(user)
+        created.append(user)
+
+    for user in created:
+        repository.update(user.id, {"email": f"new-{user.email}"})
+
+    for user in created:
+        repository.get(user.id)
+        repository.get_by_attribute("email", user.email)
+
+
+def snapshot(repository, done, result):
+    """
+    Take snapshots until the writers finish.
+    """
+
+    previous = 0
+
+    while not done.is_set():
+        size = len(repository.get_all())
+
+        if size < previous:
+            result["shrunk"] += 1
+
+        previous = size
+        result["snapshots"] += 1
+
+
+def run(factory, threads, users):
+    """
+    Run the workload and check the store.
+
+    Returns:
+        tuple: Operations per second, snapshots taken, and errors.
+    """
+
+    repository = factory(unique=("email",))
+    done = threading.Event()
+    result = {"shrunk": 0, "snapshots": 0}
+    reader = threading.Thread(
+        target=snapshot,
+        args=(repository, done, result)
+    )
+    writers = [
+        threading.Thread(target=work, args=(repository, thread, users))
+        for thread in range(threads)
+    ]
+
+    reader.start()
+    started = time.perf_counter()
+
+    for writer in writers:
+        writer.start()
+
+    for writer in writers:
+        writer.join()
+
+    elapsed = time.perf_counter() - started
+    done.set()
+    reader.join()
+
+    stored = repository.get_all()
+    errors = result["shrunk"] + abs(len(stored) - threads * users)
+    errors += sum(
+        repository.get_by_attribute("email", user.email) is not user
+        for user in stored
+    )
+
+    return threads * users * 4 / elapsed, result["snapshots"], errors
+
+
+def main():
+    """
+    Run both repositories at each thread count and print a table.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--threads",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8]
+    )
+    parser.add_argument("--users", type=int, default=20000)
+    args = parser.parse_args()
+
+    factories = {
+        "single lock": LockedRepository,
+        "striped": ConcurrentInMemoryRepository
+    }
+
+    print(
+        f"{'repository':<14}{'threads':>8}{'ops/s':>12}"
+        f"{'snapshots':>11}{'errors':>8}"
+    )
+
+    for threads in args.threads:
+        for name, factory in factories.items():
+            ops, snapshots, errors = run(factory, threads, args.users)
+            print(
+                f"{name:<14}{threads:>8}{ops:>12.0f}"
+                f"{snapshots:>11}{errors:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""
+Compare email lookups with and without the repository's unique index.
+
+For each size, users are stored in one repository scanning on
+get_by_attribute() and one indexing the email attribute, then random
+emails are looked up in both. The median time per lookup is printed,
+so the scan grows with the number of users while the index stays flat.
+
+Usage:
+    python -m benchmarks.bench_indexes [--sizes 1000 10000 100000 1000000]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from app.models.user import User
+from app.persistence.repository import InMemoryRepository
+
+
+def measure(repository, emails, repeat):
+    """
+    Return the median time of one lookup in microseconds.
+    """
+
+    durations = []
+
+    for email in random.choices(emails, k=repeat):
+        started = time.perf_counter()
+        repository.get_by_attribute("email", email)
+        durations.append(time.perf_counter() - started)
+
+    return statistics.median(durations) * 1e6
+
+
+def main():
+    """
+    Fill both repositories at each size and print lookup times.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 100000, 1000000]
+    )
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'users':>10}{'scan us':>14}{'index us':>12}{'speedup':>10}")
+
+    for size in args.sizes:
+        scanning = InMemoryRepository()
+        indexed = InMemoryRepository(unique=("email",))
+        emails = []
+
+        for index in range(size):
+            user = User("Bench", "User", f"user{index}@example.com")
+            scanning.add(user)
+            indexed.add(user)
+            emails.append(user.email)
+
+        scan = measure(scanning, emails, args.repeat)
+        lookup = measure(indexed, emails, args.repeat * 100)
+
+        print(
+            f"{size:>10}{scan:>14.1f}{lookup:>12.2f}"
+            f"{scan / lookup:>10.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""
+Measure the memory taken by each kind of model instance.
+
+For each model, a batch of instances is created the way the facade
+creates them and kept alive, and the memory traced while doing so is
+divided by the batch size. Places belong to one owner and reviews to
+one user and place, so their share of the relation dictionaries is
+included.
+
+Usage:
+    python -m benchmarks.bench_memory [--count 100000]
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+
+def measure(factory, count):
+    """
+    Return the traced bytes per instance created by a factory.
+    """
+
+    gc.collect()
+    tracemalloc.start()
+    instances = [factory(index) for index in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # The list holding the instances is not part of their cost.
+    size -= len(instances) * 8
+
+    return size / count
+
+
+def main():
+    """
+    Print bytes per instance for every model.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+
+    owner = User("Bench", "Owner", "owner@example.com")
+    place = Place("Place", "A quiet place", 100.0, 10.0, 20.0, owner)
+
+    factories = {
+        "User": lambda index: User(
+            "Bench",
+            "User",
+            f"user{index}@example.com"
+        ),
+        "Amenity": lambda index: Amenity(f"Amenity {index}"),
+        "Place": lambda index: Place(
+            f"Place {index}",
+            "A quiet place",
+            100.0,
+            10.0,
+            20.0,
+            owner
+        ),
+        "Review": lambda index: Review("Lovely stay", owner, place)
+    }
+
+    print(f"{'model':<10}{'bytes':>10}")
+
+    for name, factory in factories.items():
+        print(f"{name:<10}{measure(factory, args.count):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
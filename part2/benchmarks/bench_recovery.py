@@ -0,0 +1,152 @@
+#!/usr/bin/python3
+"""
+Measure startup recovery time from the journal.
+
+A facade with a journal writes users, places, and reviews through the
+same calls as the API, then updates every place once. Recovery is then
+timed twice in a fresh facade: replaying the whole log, and replaying a
+compacted snapshot followed by a short log tail. Each recovery runs in
+a fresh interpreter, as it would at startup.
+
+Usage:
+    python -m benchmarks.bench_recovery [--entities 1000000]
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from app.persistence.journal import FSYNC_NEVER, Journal
+from app.services.facade import HBnBFacade
+
+
+def open_facade(directory):
+    """
+    Return a facade restored from a journal, and the time it took.
+    """
+
+    facade = HBnBFacade()
+    started = time.perf_counter()
+    records = facade.open_journal(
+        Journal(directory, fsync=FSYNC_NEVER, snapshot_every=0)
+    )
+
+    return facade, records, time.perf_counter() - started
+
+
+def populate(facade, entities, start=0):
+    """
+    Write about a given number of entities: a fifth users, a fifth
+    places, and the rest reviews.
+    """
+
+    users = []
+
+    for index in range(start, start + max(1, entities // 5)):
+        user = facade.create_user({
+            "first_name": "Bench",
+            "last_name": "User",
+            "email": f"user{index}@example.com"
+        })
+        place = facade.create_place({
+            "title": f"Place {index}",
+            "description": "A quiet place near the beach",
+            "price": 100.0,
+            "latitude": 10.0,
+            "longitude": 20.0,
+            "owner_id": user.id
+        })
+        users.append(user)
+
+        for reviewer in users[-4:-1]:
+            facade.create_review({
+                "text": "Lovely stay",
+                "user_id": reviewer.id,
+                "place_id": place.id
+            })
+
+
+def recover(directory):
+    """
+    Replay a journal in a new interpreter.
+
+    Returns:
+        tuple: Records replayed and seconds taken.
+    """
+
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_recovery",
+         "--replay", directory],
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout.split()
+
+    return int(output[0]), float(output[1])
+
+
+def size_of(directory):
+    """
+    Return the size of the journal files in MiB.
+    """
+
+    return sum(
+        os.path.getsize(os.path.join(directory, name))
+        for name in os.listdir(directory)
+    ) / 2 ** 20
+
+
+def main():
+    """
+    Write the journal, then print recovery times before and after
+    compaction.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--entities", type=int, default=1000000)
+    parser.add_argument("--tail", type=int, default=10000)
+    parser.add_argument("--replay", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.replay:
+        _, records, seconds = open_facade(args.replay)
+        print(records, seconds)
+        return
+
+    directory = tempfile.mkdtemp(prefix="hbnb-journal-")
+    facade, _, _ = open_facade(directory)
+    started = time.perf_counter()
+    populate(facade, args.entities)
+
+    for place in facade.get_all_places():
+        facade.update_place(place.id, {"price": 120.0})
+
+    facade.journal.sync()
+    written = time.perf_counter() - started
+    log_size = size_of(directory)
+    log_records, log_replay = recover(directory)
+
+    started = time.perf_counter()
+    facade.journal.compact()
+    compaction = time.perf_counter() - started
+    populate(facade, args.tail, start=args.entities)
+    facade.journal.close()
+    snapshot_records, snapshot_replay = recover(directory)
+    snapshot_size = size_of(directory)
+    shutil.rmtree(directory)
+
+    print(f"{'step':<22}{'records':>10}{'seconds':>10}{'MiB':>8}")
+    print(f"{'write log':<22}{log_records:>10}{written:>10.1f}"
+          f"{log_size:>8.0f}")
+    print(f"{'replay log':<22}{log_records:>10}{log_replay:>10.1f}")
+    print(f"{'compact':<22}{'':>10}{compaction:>10.1f}")
+    print(f"{'replay snapshot+tail':<22}{snapshot_records:>10}"
+          f"{snapshot_replay:>10.1f}{snapshot_size:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
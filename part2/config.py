@@ -17,6 +17,15 @@ class Config:
     )
     DEBUG = False
 
+    # Directory of the write-ahead journal; unset keeps data in memory
+    # only. JOURNAL_FSYNC is "always", "never", or milliseconds between
+    # syncs.
+    JOURNAL_DIR = os.getenv("HBNB_JOURNAL_DIR")
+    JOURNAL_FSYNC = os.getenv("HBNB_JOURNAL_FSYNC", "always")
+    JOURNAL_SNAPSHOT_EVERY = int(
+        os.getenv("HBNB_JOURNAL_SNAPSHOT_EVERY", "100000")
+    )
+
 
 class DevelopmentConfig(Config):
     """
@@ -10,6 +10,7 @@ Tests:
 - Validation responses
 """
 
+import threading
 import unittest
 
 from app import create_app
@@ -30,10 +31,10 @@ class HBnBApiTestCase(unittest.TestCase):
         self.app.config["TESTING"] = True
         self.client = self.app.test_client()
 
-        facade.user_repo._storage.clear()
-        facade.place_repo._storage.clear()
-        facade.review_repo._storage.clear()
-        facade.amenity_repo._storage.clear()
+        facade.user_repo.clear()
+        facade.place_repo.clear()
+        facade.review_repo.clear()
+        facade.amenity_repo.clear()
 
     def create_user(
         self,
@@ -158,6 +159,56 @@ class HBnBApiTestCase(unittest.TestCase):
 
         self.assertEqual(response.status_code, 400)
 
+    def test_changed_email_is_released(self):
+        """
+        Test that an email change frees the previous address.
+        """
+
+        created = self.create_user()
+        user_id = created.get_json()["id"]
+
+        self.client.put(
+            f"/api/v1/users/{user_id}",
+            json={
+                "email": "jane@test.com"
+            }
+        )
+
+        reused = self.create_user(email="john@test.com")
+        taken = self.create_user(email="jane@test.com")
+
+        self.assertEqual(reused.status_code, 201)
+        self.assertEqual(taken.status_code, 400)
+        self.assertEqual(
+            facade.get_user_by_email("jane@test.com").id,
+            user_id
+        )
+
+    def test_concurrent_registrations_keep_email_unique(self):
+        """
+        Test that simultaneous registrations of one email create one user.
+        """
+
+        statuses = []
+
+        def register():
+            statuses.append(self.create_user().status_code)
+
+        threads = [
+            threading.Thread(target=register)
+            for _ in range(8)
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(statuses.count(201), 1)
+        self.assertEqual(statuses.count(400), 7)
+        self.assertEqual(len(facade.get_all_users()), 1)
+
     def test_invalid_user_payload(self):
         """
         Test rejection of an empty user payload.
@@ -564,6 +615,79 @@ class HBnBApiTestCase(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.get_json()), 1)
 
+    def test_duplicate_review_is_rejected_until_deleted(self):
+        """
+        Test that a user reviews a place at most once.
+        """
+
+        user = self.create_user()
+        user_id = user.get_json()["id"]
+
+        place = self.create_place(user_id)
+        place_id = place.get_json()["id"]
+
+        review = {
+            "text": "Great place",
+            "user_id": user_id,
+            "place_id": place_id
+        }
+
+        created = self.client.post("/api/v1/reviews/", json=review)
+        duplicate = self.client.post("/api/v1/reviews/", json=review)
+
+        self.assertEqual(duplicate.status_code, 400)
+
+        self.client.delete(
+            f"/api/v1/reviews/{created.get_json()['id']}"
+        )
+
+        listed = self.client.get(
+            f"/api/v1/reviews/places/{place_id}"
+        )
+        recreated = self.client.post("/api/v1/reviews/", json=review)
+
+        self.assertEqual(listed.get_json(), [])
+        self.assertEqual(recreated.status_code, 201)
+
+    def test_concurrent_reviews_keep_one_per_user_and_place(self):
+        """
+        Test that simultaneous reviews by one user create one review.
+        """
+
+        user_id = self.create_user().get_json()["id"]
+        place_id = self.create_place(user_id).get_json()["id"]
+        review = {
+            "text": "Great place",
+            "user_id": user_id,
+            "place_id": place_id
+        }
+        statuses = []
+
+        def post_review():
+            statuses.append(
+                self.client.post("/api/v1/reviews/", json=review).status_code
+            )
+
+        threads = [
+            threading.Thread(target=post_review)
+            for _ in range(8)
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        with self.assertRaises(ValueError):
+            facade.create_review(review)
+
+        self.assertEqual(statuses.count(201), 1)
+        self.assertEqual(statuses.count(400), 7)
+        self.assertEqual(len(facade.get_reviews_by_place(place_id)), 1)
+        self.assertEqual(len(facade.get_place(place_id).reviews), 1)
+        self.assertEqual(len(facade.get_user(user_id).reviews), 1)
+
     def test_empty_review_text(self):
         """
         Test rejection of an empty review.
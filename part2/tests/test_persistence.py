@@ -0,0 +1,170 @@
+#!/usr/bin/python3
+"""
+HBnB journal persistence tests.
+
+Tests:
+- Replay of the log and snapshot into a new facade
+- Recovery from a torn record
+- fsync policy validation
+"""
+
+import os
+import tempfile
+import unittest
+
+from app.persistence.journal import FSYNC_NEVER, Journal, parse_fsync
+from app.services.facade import HBnBFacade
+
+
+class JournalTestCase(unittest.TestCase):
+    """
+    Test cases for the write-ahead journal.
+    """
+
+    def setUp(self):
+        """
+        Create an empty journal directory.
+        """
+
+        self.directory = tempfile.mkdtemp()
+
+    def open_facade(self):
+        """
+        Return a facade restored from the journal directory.
+        """
+
+        facade = HBnBFacade()
+        facade.open_journal(
+            Journal(self.directory, fsync=FSYNC_NEVER, snapshot_every=0)
+        )
+
+        return facade
+
+    def populate(self, facade):
+        """
+        Write users, an amenity, a place, and reviews.
+
+        Returns:
+            dict: IDs of the written objects.
+        """
+
+        owner = facade.create_user({
+            "first_name": "John",
+            "last_name": "Doe",
+            "email": "john@test.com"
+        })
+        guest = facade.create_user({
+            "first_name": "Jane",
+            "last_name": "Roe",
+            "email": "jane@test.com"
+        })
+        wifi = facade.create_amenity({"name": "WiFi"})
+        place = facade.create_place({
+            "title": "Beach House",
+            "price": 100,
+            "latitude": 40.0,
+            "longitude": -70.0,
+            "owner_id": owner.id
+        })
+        facade.add_amenity_to_place(place.id, wifi.id)
+        kept = facade.create_review({
+            "text": "Great",
+            "user_id": guest.id,
+            "place_id": place.id
+        })
+        deleted = facade.create_review({
+            "text": "Noisy",
+            "user_id": owner.id,
+            "place_id": place.id
+        })
+
+        return {
+            "owner": owner.id,
+            "guest": guest.id,
+            "wifi": wifi.id,
+            "place": place.id,
+            "kept": kept.id,
+            "deleted": deleted.id
+        }
+
+    def test_replay_restores_log_and_snapshot(self):
+        """
+        Test that a new facade sees every write, before and after a
+        compaction.
+        """
+
+        facade = self.open_facade()
+        ids = self.populate(facade)
+
+        self.assertEqual(facade.journal.compact(), 6)
+
+        facade.update_user(ids["guest"], {"email": "jane@example.com"})
+        facade.update_review(ids["kept"], {"text": "Great view"})
+        facade.delete_review(ids["deleted"])
+        facade.journal.close()
+
+        restored = self.open_facade()
+        place = restored.get_place(ids["place"])
+        reviews = restored.get_reviews_by_place(ids["place"])
+
+        self.assertEqual(
+            restored.get_user_by_email("jane@example.com").id,
+            ids["guest"]
+        )
+        self.assertIsNone(restored.get_user_by_email("jane@test.com"))
+        self.assertIs(place.owner, restored.get_user(ids["owner"]))
+        self.assertEqual(list(place.amenities), [ids["wifi"]])
+        self.assertEqual(
+            [(review.id, review.text) for review in reviews],
+            [(ids["kept"], "Great view")]
+        )
+        self.assertEqual(list(place.owner.places), [ids["place"]])
+        self.assertIsNone(restored.get_review(ids["deleted"]))
+        self.assertEqual(
+            place.to_dict(),
+            facade.get_place(ids["place"]).to_dict()
+        )
+
+    def test_torn_record_is_truncated(self):
+        """
+        Test that a partial record at the end of the log is dropped.
+        """
+
+        facade = self.open_facade()
+        ids = self.populate(facade)
+        facade.journal.close()
+
+        log_path = os.path.join(self.directory, "hbnb.log")
+        size = os.path.getsize(log_path)
+
+        with open(log_path, "ab") as file:
+            file.write(b"\x00\x00\x01\x00partial")
+
+        restored = self.open_facade()
+        restored.create_amenity({"name": "Pool"})
+
+        self.assertEqual(len(restored.get_all_reviews()), 2)
+        self.assertIsNotNone(restored.get_place(ids["place"]))
+        self.assertGreater(os.path.getsize(log_path), size)
+        self.assertEqual(
+            len(self.open_facade().get_all_amenities()),
+            2
+        )
+
+    def test_fsync_policy_is_validated(self):
+        """
+        Test accepted and rejected fsync policies.
+        """
+
+        self.assertEqual(parse_fsync("always"), "always")
+        self.assertEqual(parse_fsync("25"), 25)
+
+        with self.assertRaises(ValueError):
+            parse_fsync("sometimes")
+
+        with self.assertRaises(ValueError):
+            parse_fsync(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""
+HBnB in-memory repository tests.
+
+Tests:
+- Rollback of an update rejected by a unique index
+- The same for the lock-striped repository
+"""
+
+import unittest
+
+from app.models.user import User
+from app.persistence.concurrent_repository import (
+    ConcurrentInMemoryRepository
+)
+from app.persistence.repository import InMemoryRepository
+
+
+class InMemoryRepositoryTestCase(unittest.TestCase):
+    """
+    Test cases for the indexed in-memory repository.
+    """
+
+    repository_class = InMemoryRepository
+
+    def setUp(self):
+        """
+        Create a repository holding two users.
+        """
+
+        self.repo = self.repository_class(unique=("email",))
+        self.john = self.repo.add(User("John", "Doe", "john@test.com"))
+        self.jane = self.repo.add(User("Jane", "Roe", "jane@test.com"))
+
+    def test_rejected_update_changes_nothing(self):
+        """
+        Test that an update taking a used email leaves every field of
+        the object as it was.
+        """
+
+        before = self.jane.to_dict()
+
+        with self.assertRaises(ValueError):
+            self.repo.update(self.jane.id, {
+                "first_name": "Janet",
+                "email": "john@test.com"
+            })
+
+        self.assertEqual(self.jane.to_dict(), before)
+        self.assertIs(
+            self.repo.get_by_attribute("email", "jane@test.com"),
+            self.jane
+        )
+        self.assertIs(
+            self.repo.get_by_attribute("email", "john@test.com"),
+            self.john
+        )
+
+
+class ConcurrentInMemoryRepositoryTestCase(InMemoryRepositoryTestCase):
+    """
+    Run the in-memory repository cases against the lock-striped one.
+    """
+
+    repository_class = ConcurrentInMemoryRepository
+
+
+if __name__ == "__main__":
+    unittest.main()
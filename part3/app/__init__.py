@@ -14,7 +14,19 @@ from app.api.v1.auth import api as auth_ns
 from app.api.v1.places import api as places_ns
 from app.api.v1.reviews import api as reviews_ns
 from app.api.v1.users import api as users_ns
-from app.extensions import bcrypt, cors, db, jwt
+from app.api.v1.utils import output_json
+from app.cli import hbnb_cli
+from app.extensions import (
+    cors,
+    db,
+    jwt,
+    metrics,
+    password_hasher,
+    response_cache
+)
+from app.password_hashing import PasswordHashingBusy
+from app.persistence.sqlite import configure_sqlite
+from app.services import facade
 
 
 def create_app(config_class="config.DevelopmentConfig"):
@@ -34,9 +46,13 @@ def create_app(config_class="config.DevelopmentConfig"):
     app.config.from_object(config_class)
 
     # Initialize Flask extensions
-    bcrypt.init_app(app)
+    password_hasher.init_app(app)
     jwt.init_app(app)
     db.init_app(app)
+    configure_sqlite(app)
+    metrics.init_app(app)
+    response_cache.init_app(app)
+    facade.configure_cache(app.config)
 
     cors.init_app(
         app,
@@ -58,6 +74,17 @@ def create_app(config_class="config.DevelopmentConfig"):
         description="HBnB Application API",
         doc="/api/v1/"
     )
+    api.representation("application/json")(output_json)
+
+    @api.errorhandler(PasswordHashingBusy)
+    def handle_password_hashing_busy(error):
+        """
+        Ask clients to retry when password hashing is saturated.
+        """
+
+        return {
+            "error": "Server busy, please retry"
+        }, 503, {"Retry-After": "1"}
 
     # Register API namespaces
     api.add_namespace(users_ns, path="/api/v1/users")
@@ -65,6 +92,10 @@ def create_app(config_class="config.DevelopmentConfig"):
     api.add_namespace(places_ns, path="/api/v1/places")
     api.add_namespace(reviews_ns, path="/api/v1/reviews")
     api.add_namespace(auth_ns, path="/api/v1/auth")
+
+    # Register maintenance commands
+    app.cli.add_command(hbnb_cli)
+
     with app.app_context():
         db.create_all()
 
@@ -7,6 +7,15 @@ from flask_jwt_extended import get_jwt, jwt_required
 from flask_restx import Namespace, Resource, fields
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.api.v1.utils import (
+    get_pagination_arguments,
+    make_query_etag,
+    make_etag,
+    not_modified_response,
+    validator_headers
+)
+from app.extensions import metrics, response_cache
+from app.serialization import AMENITY_PLAN
 from app.services import facade
 
 
@@ -27,12 +36,13 @@ amenity_model = api.model(
 )
 
 
+@metrics.timed("serialize")
 def serialize_amenity(amenity):
     """
     Return a dictionary representation of an amenity.
     """
 
-    return amenity.to_dict()
+    return AMENITY_PLAN(amenity)
 
 
 def validate_amenity_data(amenity_data):
@@ -130,18 +140,49 @@ class AmenityList(Resource):
 
         return serialize_amenity(amenity), 201
 
+    @api.param("limit", "Maximum number of amenities to return")
+    @api.param("cursor", "Cursor returned with the previous page")
     @api.response(200, "Amenities retrieved successfully")
+    @api.response(400, "Invalid pagination parameters")
+    @response_cache.cached(tags=("amenities",))
     def get(self):
         """
-        Retrieve all amenities.
+        Retrieve one page of amenities.
         """
 
-        amenities = facade.get_all_amenities()
+        limit, cursor, error = get_pagination_arguments()
+
+        if error:
+            return {
+                "error": error
+            }, 400
+
+        etag = make_query_etag(
+            "amenities",
+            facade.get_amenities_version()
+        )
+        not_modified = not_modified_response(etag)
+
+        if not_modified is not None:
+            return not_modified
 
-        return [
-            serialize_amenity(amenity)
-            for amenity in amenities
-        ], 200
+        try:
+            amenities, next_cursor = facade.get_amenities_page(
+                limit,
+                cursor
+            )
+        except ValueError as error:
+            return {
+                "error": str(error)
+            }, 400
+
+        return {
+            "items": [
+                serialize_amenity(amenity)
+                for amenity in amenities
+            ],
+            "next_cursor": next_cursor
+        }, 200, validator_headers(etag)
 
 
 @api.route("/<amenity_id>")
@@ -166,7 +207,16 @@ class AmenityResource(Resource):
                 "error": "Amenity not found"
             }, 404
 
-        return serialize_amenity(amenity), 200
+        etag = make_etag("amenity", amenity.id, amenity.updated_at)
+        not_modified = not_modified_response(etag, amenity.updated_at)
+
+        if not_modified is not None:
+            return not_modified
+
+        return serialize_amenity(amenity), 200, validator_headers(
+            etag,
+            amenity.updated_at
+        )
 
     @jwt_required()
     @api.expect(amenity_model, validate=True)
@@ -6,6 +6,7 @@ Authentication API endpoints.
 from flask_jwt_extended import create_access_token
 from flask_restx import Namespace, Resource, fields
 
+from app.extensions import metrics
 from app.services import facade
 
 
@@ -90,12 +91,13 @@ class Login(Resource):
                 "error": "Invalid credentials"
             }, 401
 
-        access_token = create_access_token(
-            identity=str(user.id),
-            additional_claims={
-                "is_admin": bool(user.is_admin)
-            }
-        )
+        with metrics.phase("auth"):
+            access_token = create_access_token(
+                identity=str(user.id),
+                additional_claims={
+                    "is_admin": bool(user.is_admin)
+                }
+            )
 
         return {
             "access_token": access_token
@@ -3,6 +3,9 @@
 Place API endpoints.
 """
 
+import math
+
+from flask import current_app, request
 from flask_jwt_extended import (
     get_jwt,
     get_jwt_identity,
@@ -11,6 +14,26 @@ from flask_jwt_extended import (
 from flask_restx import Namespace, Resource, fields
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.api.v1.utils import (
+    get_expand_tags,
+    get_fieldset_arguments,
+    get_list_argument,
+    get_pagination_arguments,
+    get_stream_argument,
+    make_query_etag,
+    not_modified_response,
+    stream_response,
+    validator_headers
+)
+from app.extensions import metrics, response_cache
+from app.persistence.place_repository import SORT_ORDERS
+from app.persistence.place_search import build_match_query
+from app.serialization import (
+    AMENITY_PLAN,
+    PLACE_PLAN,
+    REVIEW_PLAN,
+    USER_CONTACT_PLAN
+)
 from app.services import facade
 
 
@@ -77,6 +100,39 @@ update_place_model = api.model(
 )
 
 
+# Relationships each view serializes, loaded up front to avoid one
+# lazy SELECT per place, amenity, review, or reviewer.
+PLACE_LIST_LOAD = {
+    "amenities": "selectin"
+}
+
+PLACE_DETAIL_LOAD = {
+    "owner": "joined",
+    "amenities": "selectin",
+    "reviews": "selectin",
+    "reviews.user": "joined"
+}
+
+# Relationships clients may embed with ?expand=, and how to load them.
+PLACE_EXPANSIONS = PLACE_DETAIL_LOAD
+
+PLACE_DETAIL_EXPAND = tuple(PLACE_DETAIL_LOAD)
+
+# The amenities field lists amenity IDs, read from the relationship.
+PLACE_FIELD_LOADS = {
+    "amenities": PLACE_LIST_LOAD
+}
+
+EXPAND_CHOICES = ", ".join(PLACE_EXPANSIONS)
+
+# Response cache tags of the tables each expansion reads.
+PLACE_EXPANSION_TAGS = {
+    "owner": "users",
+    "amenities": "amenities",
+    "reviews.user": "reviews"
+}
+
+
 def validate_place_data(place_data, require_all=True):
     """
     Validate place creation or update data.
@@ -179,6 +235,151 @@ def validate_place_data(place_data, require_all=True):
     return True, None
 
 
+def parse_numbers(raw_value, count):
+    """
+    Parse a comma-separated list of numbers.
+
+    Returns:
+        list: Parsed floats, or None if the value is malformed.
+    """
+
+    parts = raw_value.split(",")
+
+    if len(parts) != count:
+        return None
+
+    try:
+        numbers = [float(part) for part in parts]
+    except ValueError:
+        return None
+
+    if not all(math.isfinite(number) for number in numbers):
+        return None
+
+    return numbers
+
+
+def get_geo_arguments():
+    """
+    Read the bbox, near, and radius_km query parameters.
+
+    Returns:
+        tuple: Geographic filter dict or None, and optional error message.
+    """
+
+    raw_bbox = request.args.get("bbox")
+    raw_near = request.args.get("near")
+    raw_radius = request.args.get("radius_km")
+
+    if raw_bbox and raw_near:
+        return None, "Use either bbox or near, not both"
+
+    if raw_bbox:
+        bbox = parse_numbers(raw_bbox, 4)
+
+        if bbox is None:
+            return None, "bbox must be minLng,minLat,maxLng,maxLat"
+
+        min_longitude, min_latitude, max_longitude, max_latitude = bbox
+
+        if not (
+            -180 <= min_longitude <= 180
+            and -180 <= max_longitude <= 180
+            and -90 <= min_latitude <= max_latitude <= 90
+        ):
+            return None, "bbox is outside valid coordinates"
+
+        return {"bbox": tuple(bbox)}, None
+
+    if raw_near:
+        near = parse_numbers(raw_near, 2)
+
+        if near is None:
+            return None, "near must be lat,lng"
+
+        latitude, longitude = near
+
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            return None, "near is outside valid coordinates"
+
+        max_radius = current_app.config.get("GEO_MAX_RADIUS_KM", 500)
+        radius = parse_numbers(raw_radius or "", 1)
+
+        if radius is None or not 0 < radius[0] <= max_radius:
+            return (
+                None,
+                f"radius_km must be between 0 and {max_radius}"
+            )
+
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "radius_km": radius[0]
+        }, None
+
+    if raw_radius:
+        return None, "radius_km requires near"
+
+    return None, None
+
+
+def get_filter_arguments():
+    """
+    Read the filter and sort query parameters of the place list.
+
+    Amenities may be repeated or comma-separated. Places must have all
+    amenity values and at least one amenity_any value.
+
+    Returns:
+        tuple: Filter dict, sort name or None, and optional error message.
+    """
+
+    filters = {}
+
+    for name in ("min_price", "max_price", "min_rating"):
+        raw_value = request.args.get(name)
+
+        if raw_value is None:
+            continue
+
+        value = parse_numbers(raw_value, 1)
+
+        if value is None or value[0] < 0:
+            return None, None, f"{name} must be a non-negative number"
+
+        filters[name] = value[0]
+
+    if (
+        "min_price" in filters
+        and "max_price" in filters
+        and filters["min_price"] > filters["max_price"]
+    ):
+        return None, None, "min_price cannot exceed max_price"
+
+    if filters.get("min_rating", 0) > 5:
+        return None, None, "min_rating must be between 0 and 5"
+
+    for name, key in (
+        ("amenity", "amenity_ids"),
+        ("amenity_any", "any_amenity_ids")
+    ):
+        amenity_ids = get_list_argument(name)
+
+        if amenity_ids:
+            filters[key] = amenity_ids
+
+    sort = request.args.get("sort") or None
+
+    if sort is not None and sort not in SORT_ORDERS:
+        return (
+            None,
+            None,
+            "sort must be one of " + ", ".join(SORT_ORDERS)
+        )
+
+    return filters, sort, None
+
+
 def clean_place_data(place_data):
     """
     Normalize place data before persistence.
@@ -210,63 +411,120 @@ def serialize_user(user):
     Return public owner or reviewer information.
     """
 
-    return {
-        "id": user.id,
-        "first_name": user.first_name,
-        "last_name": user.last_name,
-        "email": user.email
-    }
+    return USER_CONTACT_PLAN(user)
 
 
-def serialize_review(review):
+def serialize_review(review, include_user=True):
     """
     Return review information for place details.
     """
 
-    review_data = review.to_dict()
+    review_data = REVIEW_PLAN(review)
 
-    if review.user:
+    if include_user and review.user:
         review_data["user"] = serialize_user(review.user)
 
     return review_data
 
 
-def serialize_place(place, include_details=False):
+@metrics.timed("serialize")
+def serialize_place(
+    place,
+    include_details=False,
+    plan=PLACE_PLAN,
+    expand=None
+):
     """
     Serialize a place.
 
     Args:
         place (Place): Place to serialize.
         include_details (bool): Include related entity details.
+        plan (SerializationPlan): Plan selecting the place fields.
+        expand (tuple): Relationship paths to embed; overrides
+            include_details.
 
     Returns:
         dict: Serialized place data.
     """
 
-    place_data = place.to_dict()
+    if expand is None:
+        expand = PLACE_DETAIL_EXPAND if include_details else ()
 
-    if not include_details:
-        return place_data
+    place_data = plan(place)
 
-    place_data["owner"] = (
-        serialize_user(place.owner)
-        if place.owner
-        else None
-    )
+    if "owner" in expand:
+        place_data["owner"] = (
+            serialize_user(place.owner)
+            if place.owner
+            else None
+        )
 
-    place_data["amenities"] = [
-        amenity.to_dict()
-        for amenity in place.amenities
-    ]
+    if "amenities" in expand:
+        place_data["amenities"] = AMENITY_PLAN.many(place.amenities)
 
-    place_data["reviews"] = [
-        serialize_review(review)
-        for review in place.reviews
-    ]
+    if "reviews" in expand:
+        place_data["reviews"] = [
+            serialize_review(
+                review,
+                include_user="reviews.user" in expand
+            )
+            for review in place.reviews
+        ]
 
     return place_data
 
 
+def get_place_fieldset(detail=False, sort=None):
+    """
+    Read the fields and expand parameters of a place request.
+
+    Args:
+        detail (bool): Expand every relationship by default.
+        sort (str): Sort name of the page, whose keys are selected.
+
+    Returns:
+        tuple: Plan, expanded paths, load plan, and optional error.
+    """
+
+    key_columns, _ = SORT_ORDERS[sort or "newest"]
+
+    return get_fieldset_arguments(
+        PLACE_PLAN,
+        PLACE_EXPANSIONS,
+        default_expand=PLACE_DETAIL_EXPAND if detail else (),
+        field_loads=PLACE_FIELD_LOADS,
+        key_columns=key_columns
+    )
+
+
+def place_list_tags():
+    """
+    Return the response cache tags of a place listing.
+    """
+
+    return ("places", *get_expand_tags(PLACE_EXPANSION_TAGS))
+
+
+def get_place_list_versions(expand):
+    """
+    Return the versions of the tables a place listing reads.
+    """
+
+    versions = [facade.get_places_version()]
+
+    if "owner" in expand or "reviews.user" in expand:
+        versions.append(facade.get_users_version())
+
+    if "amenities" in expand:
+        versions.append(facade.get_amenities_version())
+
+    if "reviews" in expand:
+        versions.append(facade.get_reviews_version())
+
+    return versions
+
+
 def can_modify_place(place):
     """
     Determine whether the authenticated user may modify a place.
@@ -328,18 +586,216 @@ class PlaceList(Resource):
             include_details=True
         ), 201
 
+    @api.param("limit", "Maximum number of places to return")
+    @api.param("cursor", "Cursor returned with the previous page")
+    @api.param("bbox", "Bounding box as minLng,minLat,maxLng,maxLat")
+    @api.param("near", "Search center as lat,lng, nearest first")
+    @api.param("radius_km", "Search radius in kilometers, used with near")
+    @api.param("min_price", "Minimum price per night")
+    @api.param("max_price", "Maximum price per night")
+    @api.param("min_rating", "Minimum average rating")
+    @api.param("amenity", "Required amenity ID, repeatable")
+    @api.param("amenity_any", "Amenity ID of which one is required")
+    @api.param("sort", "One of price, -price, rating, newest")
+    @api.param("fields", "Comma-separated place fields to return")
+    @api.param("expand", "Relationships to embed: " + EXPAND_CHOICES)
+    @api.param("stream", "Stream all matches as json or ndjson")
     @api.response(200, "Places retrieved successfully")
+    @api.response(400, "Invalid pagination or search parameters")
+    @response_cache.cached(tags=place_list_tags)
     def get(self):
         """
-        Retrieve all places.
+        Retrieve one page of places.
+
+        With ``stream``, every matching place is streamed instead, read
+        and encoded in batches; limit and cursor do not apply.
+        """
+
+        limit, cursor, error = get_pagination_arguments()
+        geo, geo_error = get_geo_arguments()
+        filters, sort, filter_error = get_filter_arguments()
+        stream_format, stream_error = get_stream_argument()
+        error = error or geo_error or filter_error or stream_error
+
+        if not error and sort and geo and "radius_km" in geo:
+            error = "near results are sorted by distance"
+
+        if not error and stream_format and geo and "radius_km" in geo:
+            error = "near results cannot be streamed"
+
+        if not error:
+            plan, expand, load, error = get_place_fieldset(sort=sort)
+
+        if error:
+            return {
+                "error": error
+            }, 400
+
+        etag = make_query_etag(
+            "places",
+            *get_place_list_versions(expand)
+        )
+        not_modified = not_modified_response(etag)
+
+        if not_modified is not None:
+            return not_modified
+
+        if stream_format:
+            return stream_response(
+                facade.stream_places(
+                    load=load,
+                    filters=filters,
+                    sort=sort,
+                    bbox=geo["bbox"] if geo else None
+                ),
+                lambda place: serialize_place(
+                    place,
+                    plan=plan,
+                    expand=expand
+                ),
+                stream_format,
+                validator_headers(etag)
+            )
+
+        try:
+            if geo and "radius_km" in geo:
+                return self.get_near(
+                    geo,
+                    limit,
+                    cursor,
+                    filters,
+                    (plan, expand, load),
+                    etag
+                )
+
+            if geo:
+                places, next_cursor = facade.get_places_in_bbox_page(
+                    geo["bbox"],
+                    limit,
+                    cursor,
+                    load=load,
+                    filters=filters,
+                    sort=sort
+                )
+            else:
+                places, next_cursor = facade.get_places_page(
+                    limit,
+                    cursor,
+                    load=load,
+                    filters=filters,
+                    sort=sort
+                )
+        except ValueError as error:
+            return {
+                "error": str(error)
+            }, 400
+
+        return {
+            "items": [
+                serialize_place(place, plan=plan, expand=expand)
+                for place in places
+            ],
+            "next_cursor": next_cursor
+        }, 200, validator_headers(etag)
+
+    @staticmethod
+    def get_near(geo, limit, cursor, filters, fieldset, etag):
+        """
+        Retrieve one page of places around a point, nearest first.
         """
 
-        places = facade.get_all_places()
+        plan, expand, load = fieldset
+        results, next_cursor = facade.get_places_near_page(
+            geo["latitude"],
+            geo["longitude"],
+            geo["radius_km"],
+            limit,
+            cursor,
+            load=load,
+            filters=filters
+        )
+
+        items = []
+
+        for place, distance in results:
+            place_data = serialize_place(place, plan=plan, expand=expand)
+            place_data["distance_km"] = round(distance, 3)
+            items.append(place_data)
+
+        return {
+            "items": items,
+            "next_cursor": next_cursor
+        }, 200, validator_headers(etag)
 
-        return [
-            serialize_place(place)
-            for place in places
-        ], 200
+
+@api.route("/search")
+class PlaceSearch(Resource):
+    """
+    Handle full-text place search.
+    """
+
+    @api.param("q", "Words to search for in titles and descriptions")
+    @api.param("limit", "Maximum number of places to return")
+    @api.param("cursor", "Cursor returned with the previous page")
+    @api.param("fields", "Comma-separated place fields to return")
+    @api.param("expand", "Relationships to embed: " + EXPAND_CHOICES)
+    @api.response(200, "Places retrieved successfully")
+    @api.response(400, "Invalid search or pagination parameters")
+    @response_cache.cached(tags=place_list_tags)
+    def get(self):
+        """
+        Search places by title and description, best match first.
+        """
+
+        limit, cursor, error = get_pagination_arguments()
+
+        if not error:
+            plan, expand, load, error = get_place_fieldset()
+
+        if error:
+            return {
+                "error": error
+            }, 400
+
+        query = build_match_query(request.args.get("q", ""))
+
+        if query is None:
+            return {
+                "error": "q must contain at least one word"
+            }, 400
+
+        etag = make_query_etag(
+            "place_search",
+            *get_place_list_versions(expand)
+        )
+        not_modified = not_modified_response(etag)
+
+        if not_modified is not None:
+            return not_modified
+
+        try:
+            results, next_cursor = facade.search_places_page(
+                query,
+                limit,
+                cursor,
+                load=load
+            )
+        except ValueError as error:
+            return {
+                "error": str(error)
+            }, 400
+
+        items = []
+
+        for place, highlights in results:
+            place_data = serialize_place(place, plan=plan, expand=expand)
+            place_data["search"] = highlights
+            items.append(place_data)
+
+        return {
+            "items": items,
+            "next_cursor": next_cursor
+        }, 200, validator_headers(etag)
 
 
 @api.route("/<place_id>")
@@ -348,14 +804,45 @@ class PlaceResource(Resource):
     Handle individual place operations.
     """
 
+    @api.param("fields", "Comma-separated place fields to return")
+    @api.param("expand", "Relationships to embed, all by default")
     @api.response(200, "Place retrieved successfully")
+    @api.response(400, "Invalid fields or expand parameters")
     @api.response(404, "Place not found")
     def get(self, place_id):
         """
         Retrieve detailed place information.
+
+        The version of the place and its related rows is checked first,
+        so a client holding the current representation gets a 304
+        without the place, owner, amenities, and reviews being loaded.
         """
 
-        place = facade.get_place(place_id)
+        plan, expand, load, error = get_place_fieldset(detail=True)
+
+        if error:
+            return {
+                "error": error
+            }, 400
+
+        version = facade.get_place_version(place_id)
+
+        if version is None:
+            return {
+                "error": "Place not found"
+            }, 404
+
+        last_modified, _ = version
+        etag = make_query_etag("place", place_id, version)
+        not_modified = not_modified_response(etag, last_modified)
+
+        if not_modified is not None:
+            return not_modified
+
+        place = facade.get_place(
+            place_id,
+            load=load
+        )
 
         if not place:
             return {
@@ -364,8 +851,9 @@ class PlaceResource(Resource):
 
         return serialize_place(
             place,
-            include_details=True
-        ), 200
+            plan=plan,
+            expand=expand
+        ), 200, validator_headers(etag, last_modified)
 
     @jwt_required()
     @api.expect(update_place_model, validate=True)
@@ -382,7 +870,10 @@ class PlaceResource(Resource):
         any place.
         """
 
-        place = facade.get_place(place_id)
+        place = facade.get_place(
+            place_id,
+            load=PLACE_DETAIL_LOAD
+        )
 
         if not place:
             return {
@@ -11,6 +11,17 @@ from flask_jwt_extended import (
 from flask_restx import Namespace, Resource, fields
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.api.v1.utils import (
+    get_fieldset_arguments,
+    get_loaded_version,
+    get_pagination_arguments,
+    latest_datetime,
+    make_query_etag,
+    not_modified_response,
+    validator_headers
+)
+from app.extensions import metrics, response_cache
+from app.serialization import AUTHOR_PLAN, PLACE_SUMMARY_PLAN, REVIEW_PLAN
 from app.services import facade
 
 
@@ -58,38 +69,102 @@ update_review_model = api.model(
 )
 
 
+# Reviews are serialized with their author.
+REVIEW_LOAD = {
+    "user": "joined"
+}
+
+# Relationships a request may embed with ?expand=.
+REVIEW_EXPANSIONS = {
+    "user": "joined",
+    "place": "joined"
+}
+
+
 def serialize_user(user):
     """
     Return public information about a review author.
     """
-    return {
-        "id": user.id,
-        "first_name": user.first_name,
-        "last_name": user.last_name
-    }
+    return AUTHOR_PLAN(user)
 
 
-def serialize_review(review, include_user=False):
+@metrics.timed("serialize")
+def serialize_review(
+    review,
+    include_user=False,
+    plan=REVIEW_PLAN,
+    expand=None
+):
     """
     Return a dictionary representation of a review.
 
     Args:
         review (Review): Review to serialize.
         include_user (bool): Include public author information.
+        plan (SerializationPlan): Plan selecting the review fields.
+        expand (tuple): Relationships to embed; overrides include_user.
 
     Returns:
         dict: Serialized review data.
     """
-    review_data = review.to_dict()
+    if expand is None:
+        expand = ("user",) if include_user else ()
+
+    review_data = plan(review)
 
-    if include_user and review.user:
+    if "user" in expand and review.user:
         review_data["user"] = serialize_user(
             review.user
         )
 
+    if "place" in expand:
+        review_data["place"] = (
+            PLACE_SUMMARY_PLAN(review.place)
+            if review.place
+            else None
+        )
+
     return review_data
 
 
+def get_review_fieldset(key_columns=("created_at", "id")):
+    """
+    Read the fields and expand parameters of a review request.
+
+    Args:
+        key_columns (tuple): Columns always selected, by default the
+            ordering keys of review pages.
+
+    Returns:
+        tuple: Plan, expanded paths, load plan, and optional error.
+    """
+    return get_fieldset_arguments(
+        REVIEW_PLAN,
+        REVIEW_EXPANSIONS,
+        default_expand=("user",),
+        key_columns=key_columns
+    )
+
+
+def get_review_list_versions(expand):
+    """
+    Return the versions of the places embedded in review pages.
+
+    Review versions already cover the authors; places are added only
+    when they are expanded.
+
+    Args:
+        expand (tuple): Expanded relationship paths.
+
+    Returns:
+        tuple: Versions to include in the ETag.
+    """
+    if "place" in expand:
+        return (facade.get_places_version(),)
+
+    return ()
+
+
 def validate_review_data(review_data, require_place=True):
     """
     Validate review creation or update data.
@@ -237,20 +312,62 @@ class ReviewList(Resource):
             include_user=True
         ), 201
 
+    @api.param("limit", "Maximum number of reviews to return")
+    @api.param("cursor", "Cursor returned with the previous page")
+    @api.param("fields", "Comma-separated review fields to return")
+    @api.param("expand", "Relationships to embed: user, place")
     @api.response(200, "Reviews retrieved successfully")
+    @api.response(400, "Invalid query parameters")
     def get(self):
         """
-        Retrieve all reviews.
+        Retrieve one page of reviews.
         """
-        reviews = facade.get_all_reviews()
+        limit, cursor, error = get_pagination_arguments()
+
+        if error:
+            return {
+                "error": error
+            }, 400
+
+        plan, expand, load, error = get_review_fieldset()
+
+        if error:
+            return {
+                "error": error
+            }, 400
+
+        etag = make_query_etag(
+            "reviews",
+            facade.get_reviews_version(),
+            *get_review_list_versions(expand)
+        )
+        not_modified = not_modified_response(etag)
+
+        if not_modified is not None:
+            return not_modified
 
-        return [
-            serialize_review(
-                review,
-                include_user=True
+        try:
+            reviews, next_cursor = facade.get_reviews_page(
+                limit,
+                cursor,
+                load=load
             )
-            for review in reviews
-        ], 200
+        except ValueError as error:
+            return {
+                "error": str(error)
+            }, 400
+
+        return {
+            "items": [
+                serialize_review(
+                    review,
+                    plan=plan,
+                    expand=expand
+                )
+                for review in reviews
+            ],
+            "next_cursor": next_cursor
+        }, 200, validator_headers(etag)
 
 
 @api.route("/<review_id>")
@@ -259,23 +376,56 @@ class ReviewResource(Resource):
     Handle individual review operations.
     """
 
+    @api.param("fields", "Comma-separated review fields to return")
+    @api.param("expand", "Relationships to embed: user, place")
     @api.response(200, "Review retrieved successfully")
+    @api.response(400, "Invalid fields or expand parameters")
     @api.response(404, "Review not found")
     def get(self, review_id):
         """
         Retrieve a review by ID.
         """
-        review = facade.get_review(review_id)
+        plan, expand, load, error = get_review_fieldset(
+            key_columns=("updated_at",)
+        )
+
+        if error:
+            return {
+                "error": error
+            }, 400
+
+        review = facade.get_review(
+            review_id,
+            load=load
+        )
 
         if not review:
             return {
                 "error": "Review not found"
             }, 404
 
+        related_version = get_loaded_version(review, expand)
+        last_modified = latest_datetime(
+            review.updated_at,
+            related_version[0]
+        )
+
+        etag = make_query_etag(
+            "review",
+            review.id,
+            review.updated_at,
+            related_version
+        )
+        not_modified = not_modified_response(etag, last_modified)
+
+        if not_modified is not None:
+            return not_modified
+
         return serialize_review(
             review,
-            include_user=True
-        ), 200
+            plan=plan,
+            expand=expand
+        ), 200, validator_headers(etag, last_modified)
 
     @jwt_required()
     @api.expect(update_review_model, validate=True)
@@ -291,7 +441,10 @@ class ReviewResource(Resource):
         Review authors may update their own reviews. Administrators may
         update any review.
         """
-        review = facade.get_review(review_id)
+        review = facade.get_review(
+            review_id,
+            load=REVIEW_LOAD
+        )
 
         if not review:
             return {
@@ -387,25 +540,82 @@ class PlaceReviewList(Resource):
     Handle reviews associated with a specific place.
     """
 
+    @api.param("limit", "Maximum number of reviews to return")
+    @api.param("cursor", "Cursor returned with the previous page")
+    @api.param("fields", "Comma-separated review fields to return")
+    @api.param("expand", "Relationships to embed: user, place")
     @api.response(200, "Place reviews retrieved successfully")
+    @api.response(400, "Invalid query parameters")
     @api.response(404, "Place not found")
+    @response_cache.cached(
+        tags=lambda place_id: ("reviews", f"place:{place_id}")
+    )
     def get(self, place_id):
         """
-        Retrieve all reviews for a place.
+        Retrieve one page of reviews for a place, newest first.
+
+        The embedded place, if expanded, is covered by the place's own
+        cache tag.
         """
-        reviews = facade.get_reviews_by_place(
-            place_id
-        )
+        limit, cursor, error = get_pagination_arguments()
 
-        if reviews is None:
+        if error:
+            return {
+                "error": error
+            }, 400
+
+        plan, expand, load, error = get_review_fieldset()
+
+        if error:
+            return {
+                "error": error
+            }, 400
+
+        version = facade.get_reviews_by_place_version(place_id)
+
+        if version is None:
             return {
                 "error": "Place not found"
             }, 404
 
-        return [
-            serialize_review(
-                review,
-                include_user=True
+        etag = make_query_etag(
+            "place_reviews",
+            place_id,
+            version,
+            *get_review_list_versions(expand)
+        )
+        not_modified = not_modified_response(etag)
+
+        if not_modified is not None:
+            return not_modified
+
+        try:
+            page = facade.get_reviews_by_place_page(
+                place_id,
+                limit,
+                cursor,
+                load=load
             )
-            for review in reviews
-        ], 200
+        except ValueError as error:
+            return {
+                "error": str(error)
+            }, 400
+
+        if page is None:
+            return {
+                "error": "Place not found"
+            }, 404
+
+        reviews, next_cursor = page
+
+        return {
+            "items": [
+                serialize_review(
+                    review,
+                    plan=plan,
+                    expand=expand
+                )
+                for review in reviews
+            ],
+            "next_cursor": next_cursor
+        }, 200, validator_headers(etag)
@@ -11,6 +11,17 @@ from flask_jwt_extended import (
 from flask_restx import Namespace, Resource, fields
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.api.v1.utils import (
+    get_fieldset_arguments,
+    get_loaded_version,
+    get_pagination_arguments,
+    latest_datetime,
+    make_query_etag,
+    not_modified_response,
+    validator_headers
+)
+from app.extensions import metrics
+from app.serialization import PLACE_SUMMARY_PLAN, REVIEW_PLAN, USER_PLAN
 from app.services import facade
 
 
@@ -69,12 +80,78 @@ update_user_model = api.model(
 )
 
 
-def serialize_user(user):
+# Relationships a request may embed with ?expand=.
+USER_EXPANSIONS = {
+    "places": "selectin",
+    "reviews": "selectin"
+}
+
+
+@metrics.timed("serialize")
+def serialize_user(user, plan=USER_PLAN, expand=()):
     """
     Return user data without exposing the password.
+
+    Args:
+        user (User): User to serialize.
+        plan (SerializationPlan): Plan selecting the user fields.
+        expand (tuple): Relationships to embed.
+
+    Returns:
+        dict: Serialized user data.
+    """
+
+    user_data = plan(user)
+
+    if "places" in expand:
+        user_data["places"] = PLACE_SUMMARY_PLAN.many(user.places)
+
+    if "reviews" in expand:
+        user_data["reviews"] = REVIEW_PLAN.many(user.reviews)
+
+    return user_data
+
+
+def get_user_fieldset(key_columns=("created_at", "id")):
+    """
+    Read the fields and expand parameters of a user request.
+
+    Args:
+        key_columns (tuple): Columns always selected, by default the
+            ordering keys of user pages.
+
+    Returns:
+        tuple: Plan, expanded paths, load plan, and optional error.
+    """
+
+    return get_fieldset_arguments(
+        USER_PLAN,
+        USER_EXPANSIONS,
+        key_columns=key_columns
+    )
+
+
+def get_user_list_versions(expand):
+    """
+    Return the versions of the places and reviews embedded in user
+    pages.
+
+    Args:
+        expand (tuple): Expanded relationship paths.
+
+    Returns:
+        tuple: Versions to include in the ETag.
     """
 
-    return user.to_dict()
+    versions = []
+
+    if "places" in expand:
+        versions.append(facade.get_places_version())
+
+    if "reviews" in expand:
+        versions.append(facade.get_reviews_version())
+
+    return tuple(versions)
 
 
 def is_valid_email(email):
@@ -313,18 +390,63 @@ class UserList(Resource):
 
         return serialize_user(new_user), 201
 
+    @api.param("limit", "Maximum number of users to return")
+    @api.param("cursor", "Cursor returned with the previous page")
+    @api.param("fields", "Comma-separated user fields to return")
+    @api.param("expand", "Relationships to embed: places, reviews")
     @api.response(200, "Users retrieved successfully")
+    @api.response(400, "Invalid query parameters")
     def get(self):
         """
-        Retrieve all users.
+        Retrieve one page of users.
         """
 
-        users = facade.get_all_users()
+        limit, cursor, error = get_pagination_arguments()
 
-        return [
-            serialize_user(user)
-            for user in users
-        ], 200
+        if error:
+            return {
+                "error": error
+            }, 400
+
+        plan, expand, load, error = get_user_fieldset()
+
+        if error:
+            return {
+                "error": error
+            }, 400
+
+        etag = make_query_etag(
+            "users",
+            facade.get_users_version(),
+            *get_user_list_versions(expand)
+        )
+        not_modified = not_modified_response(etag)
+
+        if not_modified is not None:
+            return not_modified
+
+        try:
+            users, next_cursor = facade.get_users_page(
+                limit,
+                cursor,
+                load=load
+            )
+        except ValueError as error:
+            return {
+                "error": str(error)
+            }, 400
+
+        return {
+            "items": [
+                serialize_user(
+                    user,
+                    plan=plan,
+                    expand=expand
+                )
+                for user in users
+            ],
+            "next_cursor": next_cursor
+        }, 200, validator_headers(etag)
 
 
 @api.route("/<user_id>")
@@ -333,21 +455,59 @@ class UserResource(Resource):
     Handle individual user operations.
     """
 
+    @api.param("fields", "Comma-separated user fields to return")
+    @api.param("expand", "Relationships to embed: places, reviews")
     @api.response(200, "User retrieved successfully")
+    @api.response(400, "Invalid fields or expand parameters")
     @api.response(404, "User not found")
     def get(self, user_id):
         """
         Retrieve a user by ID.
         """
 
-        user = facade.get_user(user_id)
+        plan, expand, load, error = get_user_fieldset(
+            key_columns=("updated_at",)
+        )
+
+        if error:
+            return {
+                "error": error
+            }, 400
+
+        user = facade.get_user(
+            user_id,
+            load=load
+        )
 
         if not user:
             return {
                 "error": "User not found"
             }, 404
 
-        return serialize_user(user), 200
+        related_version = get_loaded_version(user, expand)
+        last_modified = latest_datetime(
+            user.updated_at,
+            related_version[0]
+        )
+        etag = make_query_etag(
+            "user",
+            user.id,
+            user.updated_at,
+            related_version
+        )
+        not_modified = not_modified_response(etag, last_modified)
+
+        if not_modified is not None:
+            return not_modified
+
+        return serialize_user(
+            user,
+            plan=plan,
+            expand=expand
+        ), 200, validator_headers(
+            etag,
+            last_modified
+        )
 
     @jwt_required()
     @api.expect(update_user_model, validate=True)
@@ -1,9 +1,32 @@
 #!/usr/bin/python3
 """
-API authentication and authorization helpers.
+API authentication, pagination, conditional request, and response
+encoding and streaming helpers.
 """
 
+from datetime import UTC, datetime
+import hashlib
+import json
+
+from flask import (
+    Response,
+    current_app,
+    make_response,
+    request,
+    stream_with_context
+)
 from flask_jwt_extended import get_jwt
+from werkzeug.http import http_date
+
+from app.encoding import dumps
+from app.extensions import metrics
+
+
+# Formats of the stream query parameter mapped to their media types.
+STREAM_MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson"
+}
 
 
 def is_admin():
@@ -14,3 +37,450 @@ def is_admin():
     claims = get_jwt()
 
     return claims.get("is_admin", False)
+
+
+def get_pagination_arguments():
+    """
+    Read the limit and cursor query parameters of a collection request.
+
+    Returns:
+        tuple: Page limit, cursor, and optional error message.
+    """
+
+    default_limit = current_app.config.get("PAGE_SIZE_DEFAULT", 50)
+    max_limit = current_app.config.get("PAGE_SIZE_MAX", 200)
+
+    raw_limit = request.args.get("limit")
+    cursor = request.args.get("cursor") or None
+
+    if raw_limit is None:
+        return default_limit, cursor, None
+
+    try:
+        limit = int(raw_limit)
+    except ValueError:
+        return None, None, "limit must be an integer"
+
+    if limit < 1 or limit > max_limit:
+        return (
+            None,
+            None,
+            f"limit must be between 1 and {max_limit}"
+        )
+
+    return limit, cursor, None
+
+
+def _as_utc(value):
+    """
+    Return a datetime as timezone-aware UTC.
+
+    SQLite returns naive datetimes, which the application stores in UTC.
+    """
+
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+
+    return value.astimezone(UTC)
+
+
+def _etag_default(value):
+    """
+    Convert values json cannot serialize for entity tags.
+    """
+
+    if isinstance(value, datetime):
+        return _as_utc(value).isoformat()
+
+    return str(value)
+
+
+def latest_datetime(*values):
+    """
+    Return the latest of several datetimes, ignoring None values.
+    """
+
+    values = [
+        _as_utc(value)
+        for value in values
+        if value is not None
+    ]
+
+    return max(values, default=None)
+
+
+def get_list_argument(name):
+    """
+    Read a query parameter that may be repeated or comma-separated.
+
+    Args:
+        name (str): Query parameter name.
+
+    Returns:
+        list: Non-empty values in request order, or None if the
+        parameter is absent.
+    """
+
+    if name not in request.args:
+        return None
+
+    return [
+        value.strip()
+        for raw_value in request.args.getlist(name)
+        for value in raw_value.split(",")
+        if value.strip()
+    ]
+
+
+def get_fieldset_arguments(
+    plan,
+    expansions,
+    default_expand=(),
+    field_loads=None,
+    key_columns=()
+):
+    """
+    Read the fields and expand query parameters of a request.
+
+    ``fields`` restricts the keys of each item and the columns selected
+    for it; ``id`` is always included. ``expand`` names the
+    relationships to embed and load; a nested path such as
+    ``reviews.user`` also expands its parents.
+
+    Args:
+        plan (SerializationPlan): Full plan of the resource.
+        expansions (dict): Expandable paths mapped to load strategies.
+        default_expand (tuple): Paths expanded when expand is absent.
+        field_loads (dict): Fields mapped to the load plan entries
+            they need, such as relationship ID lists.
+        key_columns (iterable): Columns always selected, such as the
+            ordering keys of the page.
+
+    Returns:
+        tuple: Serialization plan, expanded paths, load plan, and
+        optional error message.
+    """
+
+    fields = get_list_argument("fields")
+    requested = get_list_argument("expand")
+
+    if fields is not None:
+        try:
+            plan = plan.select(fields)
+        except ValueError:
+            return (
+                None,
+                None,
+                None,
+                "fields must be among " + ", ".join(plan.fields)
+            )
+
+    expand = []
+
+    for path in (default_expand if requested is None else requested):
+        if path not in expansions:
+            return (
+                None,
+                None,
+                None,
+                "expand must be among " + ", ".join(expansions)
+            )
+
+        segments = path.split(".")
+
+        for index in range(1, len(segments) + 1):
+            prefix = ".".join(segments[:index])
+
+            if prefix not in expand:
+                expand.append(prefix)
+
+    load = {}
+
+    if fields is not None:
+        columns = list(plan.columns)
+        columns.extend(
+            column
+            for column in key_columns
+            if column not in columns
+        )
+        load["columns"] = tuple(columns)
+
+    for field, entries in (field_loads or {}).items():
+        if field in plan.fields:
+            load.update(entries)
+
+    for path in expand:
+        load[path] = expansions[path]
+
+    return plan, tuple(expand), load, None
+
+
+def get_expand_tags(expansion_tags):
+    """
+    Return the response cache tags of the relationships a request
+    expands.
+
+    Args:
+        expansion_tags (dict): Expandable paths mapped to tags.
+
+    Returns:
+        tuple: Tags of the requested expansions.
+    """
+
+    return tuple(
+        expansion_tags[path]
+        for path in get_list_argument("expand") or ()
+        if path in expansion_tags
+    )
+
+
+def get_loaded_version(obj, paths):
+    """
+    Return the version of the objects reachable through relationships.
+
+    Args:
+        obj: Model instance whose relationships are loaded.
+        paths (iterable): Relationship paths, such as ``reviews.user``.
+
+    Returns:
+        tuple: Latest updated_at or None, and number of objects.
+    """
+
+    timestamps = []
+
+    for path in paths:
+        objects = [obj]
+
+        for segment in path.split("."):
+            related = []
+
+            for current in objects:
+                value = getattr(current, segment)
+
+                if isinstance(value, list):
+                    related.extend(value)
+                elif value is not None:
+                    related.append(value)
+
+            objects = related
+
+        timestamps.extend(related.updated_at for related in objects)
+
+    return latest_datetime(*timestamps), len(timestamps)
+
+
+def make_etag(*parts):
+    """
+    Build a strong entity tag from the parts identifying a version.
+
+    Args:
+        *parts: JSON-serializable values; datetimes are converted to
+            their ISO format.
+
+    Returns:
+        str: Unquoted entity tag.
+    """
+
+    payload = json.dumps(
+        parts,
+        default=_etag_default,
+        separators=(",", ":")
+    )
+
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def make_query_etag(name, *versions):
+    """
+    Build the entity tag of a response shaped by query parameters.
+
+    The tag combines the version of the data the response reads with
+    the query parameters, so every page, filter, sort order, and
+    fieldset gets its own tag.
+
+    Args:
+        name (str): Resource or collection name.
+        *versions: Values identifying the version of the data, such as
+            results of repository get_version calls.
+
+    Returns:
+        str: Unquoted entity tag.
+    """
+
+    arguments = sorted(request.args.items(multi=True))
+
+    return make_etag(name, arguments, *versions)
+
+
+def _http_datetime(value):
+    """
+    Return a UTC datetime truncated to whole seconds, as HTTP dates are.
+    """
+
+    if value is None:
+        return None
+
+    return _as_utc(value).replace(microsecond=0)
+
+
+def validator_headers(etag, last_modified=None):
+    """
+    Return the response headers carrying the cache validators.
+
+    Clients may store the response but must revalidate it before reuse.
+
+    Args:
+        etag (str): Unquoted entity tag.
+        last_modified (datetime): Last modification time, if known.
+
+    Returns:
+        dict: Response headers.
+    """
+
+    headers = {
+        "ETag": f'"{etag}"',
+        "Cache-Control": "no-cache"
+    }
+
+    last_modified = _http_datetime(last_modified)
+
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+
+    return headers
+
+
+def not_modified_response(etag, last_modified=None):
+    """
+    Return a 304 response if the client's copy is still current.
+
+    If-None-Match takes precedence over If-Modified-Since, as required
+    by RFC 9110.
+
+    Args:
+        etag (str): Unquoted entity tag of the current representation.
+        last_modified (datetime): Last modification time, if known.
+
+    Returns:
+        Response: Empty 304 response, or None if the representation
+        must be sent.
+    """
+
+    headers = validator_headers(etag, last_modified)
+
+    if request.if_none_match:
+        if request.if_none_match.contains(etag):
+            return Response(status=304, headers=headers)
+
+        return None
+
+    last_modified = _http_datetime(last_modified)
+    if_modified_since = request.if_modified_since
+
+    if (
+        last_modified is not None
+        and if_modified_since is not None
+        and last_modified <= if_modified_since
+    ):
+        return Response(status=304, headers=headers)
+
+    return None
+
+
+def output_json(data, code, headers=None):
+    """
+    Flask-RESTX representation encoding JSON responses to bytes.
+
+    Encoding is timed as part of the serialize phase.
+
+    Args:
+        data: Response data returned by a resource.
+        code (int): HTTP status code.
+        headers (dict): Additional response headers.
+
+    Returns:
+        Response: Encoded JSON response.
+    """
+
+    with metrics.phase("serialize"):
+        body = dumps(data)
+
+    response = make_response(body, code)
+    response.headers.extend(headers or {})
+    response.mimetype = "application/json"
+
+    return response
+
+
+def get_stream_argument():
+    """
+    Read the stream query parameter of a collection request.
+
+    Returns:
+        tuple: Stream format or None, and optional error message.
+    """
+
+    stream_format = request.args.get("stream")
+
+    if stream_format is None:
+        return None, None
+
+    if stream_format not in STREAM_MEDIA_TYPES:
+        return (
+            None,
+            "stream must be one of " + ", ".join(STREAM_MEDIA_TYPES)
+        )
+
+    return stream_format, None
+
+
+def stream_response(batches, serialize, stream_format, headers=None):
+    """
+    Build a response encoding a collection while it is being read.
+
+    The json format keeps the shape of a page, ``items`` followed by a
+    null ``next_cursor``; ndjson writes one item per line. Each batch is
+    encoded and sent before the next one is fetched.
+
+    Args:
+        batches (iterable): Lists of objects, such as a repository
+            stream.
+        serialize (callable): Function converting an object to data.
+        stream_format (str): Key of STREAM_MEDIA_TYPES.
+        headers (dict): Additional response headers.
+
+    Returns:
+        Response: Streamed response.
+    """
+
+    def generate_json():
+        yield b'{"items":['
+        separator = b""
+
+        for batch in batches:
+            yield separator + b",".join(
+                dumps(serialize(obj))
+                for obj in batch
+            )
+            separator = b","
+
+        yield b'],"next_cursor":null}'
+
+    def generate_ndjson():
+        for batch in batches:
+            yield b"".join(
+                dumps(serialize(obj)) + b"\n"
+                for obj in batch
+            )
+
+    generate = (
+        generate_ndjson
+        if stream_format == "ndjson"
+        else generate_json
+    )
+
+    return Response(
+        stream_with_context(generate()),
+        headers=headers,
+        mimetype=STREAM_MEDIA_TYPES[stream_format]
+    )
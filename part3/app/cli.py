@@ -0,0 +1,148 @@
+#!/usr/bin/python3
+"""
+Maintenance commands for the HBnB application.
+
+Run with ``flask --app run hbnb <command>``.
+"""
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from app.importer import IMPORTERS, Checkpoint, detect_format, read_rows
+from app.services import facade
+
+
+hbnb_cli = AppGroup(
+    "hbnb",
+    help="HBnB maintenance commands."
+)
+
+
+@hbnb_cli.command("reconcile-ratings")
+def reconcile_ratings_command():
+    """
+    Recompute place rating aggregates from their reviews.
+    """
+
+    corrected = facade.reconcile_place_ratings()
+
+    click.echo(f"Reconciled rating aggregates for {corrected} place(s).")
+
+
+@hbnb_cli.command("backfill-geo")
+def backfill_geo_command():
+    """
+    Compute the search grid cell of every place.
+    """
+
+    updated = facade.backfill_place_grid()
+
+    click.echo(f"Updated grid cells for {updated} place(s).")
+
+
+@hbnb_cli.command("rebuild-amenity-masks")
+def rebuild_amenity_masks_command():
+    """
+    Assign amenity bits and recompute place amenity masks.
+    """
+
+    assigned, updated = facade.rebuild_amenity_masks()
+
+    click.echo(
+        f"Assigned {assigned} amenity bit(s); "
+        f"updated {updated} place mask(s)."
+    )
+
+
+@hbnb_cli.command("rebuild-search")
+def rebuild_search_command():
+    """
+    Rebuild the place full-text search index.
+    """
+
+    facade.rebuild_place_search()
+
+    click.echo("Rebuilt the place search index.")
+
+
+@hbnb_cli.command("import")
+@click.argument("entity", type=click.Choice(list(IMPORTERS)))
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--format",
+    "file_format",
+    type=click.Choice(["csv", "ndjson"]),
+    help="File format, detected from the extension by default."
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    help="Rows per transaction, IMPORT_BATCH_SIZE by default."
+)
+@click.option(
+    "--checkpoint",
+    type=click.Path(dir_okay=False),
+    help="Progress file, PATH.checkpoint by default."
+)
+def import_command(entity, path, file_format, batch_size, checkpoint):
+    """
+    Import users, amenities, places, or reviews from CSV or NDJSON.
+
+    Rows are validated like API requests; rejected rows are reported
+    with their line number and skipped. An existing checkpoint resumes
+    the import after the rows it records.
+    """
+
+    try:
+        file_format = file_format or detect_format(path)
+        checkpoint = Checkpoint(
+            checkpoint or f"{path}.checkpoint",
+            path,
+            entity
+        )
+        skip = checkpoint.load()
+    except ValueError as error:
+        raise click.UsageError(str(error)) from error
+
+    importer = IMPORTERS[entity](
+        batch_size or current_app.config["IMPORT_BATCH_SIZE"],
+        source=path
+    )
+
+    if skip:
+        click.echo(f"Resuming after {skip} committed row(s).")
+
+    reported = 0
+
+    def on_batch(report):
+        nonlocal reported
+
+        checkpoint.save(report.read)
+
+        for number, error in report.rejected[reported:]:
+            click.echo(f"Line {number}: {error}", err=True)
+
+        reported = len(report.rejected)
+        click.echo(
+            f"{report.read} row(s) read, {report.imported} imported, "
+            f"{len(report.rejected)} rejected "
+            f"({report.rate:.0f} rows/s)"
+        )
+
+    newline = "" if file_format == "csv" else None
+
+    with open(path, encoding="utf-8", newline=newline) as stream:
+        report = importer.run(
+            read_rows(stream, file_format),
+            typed=file_format == "ndjson",
+            skip=skip,
+            on_batch=on_batch
+        )
+
+    click.echo(
+        f"Imported {report.imported} {entity} from "
+        f"{report.read - report.skipped} row(s) in "
+        f"{report.elapsed:.1f}s ({report.rate:.0f} rows/s); "
+        f"{len(report.rejected)} rejected."
+    )
@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""
+JSON encoding of API responses.
+
+Responses are encoded straight to bytes with orjson when it is
+installed, and with the standard library json module otherwise. Both
+backends write datetimes in ISO 8601 format, as ``isoformat()`` does.
+"""
+
+from datetime import date, datetime
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _default(value):
+    """
+    Convert values the standard library json module cannot encode.
+    """
+
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+
+    raise TypeError(
+        f"Object of type {type(value).__name__} is not JSON serializable"
+    )
+
+
+def dumps_json(data):
+    """
+    Encode data with the standard library json module.
+
+    Args:
+        data: JSON-compatible data, possibly holding datetimes.
+
+    Returns:
+        bytes: UTF-8 encoded JSON.
+    """
+
+    return json.dumps(
+        data,
+        default=_default,
+        ensure_ascii=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+def dumps(data):
+    """
+    Encode data with the fastest available backend.
+
+    Args:
+        data: JSON-compatible data, possibly holding datetimes.
+
+    Returns:
+        bytes: UTF-8 encoded JSON.
+    """
+
+    if orjson is not None:
+        return orjson.dumps(data, default=_default)
+
+    return dumps_json(data)
@@ -3,13 +3,18 @@
 Application extensions.
 """
 
-from flask_bcrypt import Bcrypt
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_sqlalchemy import SQLAlchemy
 
+from app.instrumentation import RequestMetrics
+from app.password_hashing import PasswordHasher
+from app.response_cache import ResponseCache
+
 
-bcrypt = Bcrypt()
 jwt = JWTManager()
 db = SQLAlchemy()
 cors = CORS()
+metrics = RequestMetrics()
+response_cache = ResponseCache()
+password_hasher = PasswordHasher()
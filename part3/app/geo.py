@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+"""
+Geographic helpers for place search.
+
+Places are bucketed into a fixed latitude/longitude grid. The grid cell
+of each place is stored in indexed columns, so a search area becomes a
+range scan over a few grid rows and columns instead of a full table
+scan. Exact distances are then computed with the haversine formula.
+"""
+
+import math
+
+
+# Grid cell size in degrees, about 11 km of latitude.
+GRID_SIZE_DEGREES = 0.1
+
+EARTH_RADIUS_KM = 6371.0088
+
+# North-south extent of a grid cell in kilometers.
+GRID_SIZE_KM = math.radians(GRID_SIZE_DEGREES) * EARTH_RADIUS_KM
+
+
+def grid_row(latitude):
+    """
+    Return the grid row containing a latitude.
+    """
+
+    return int(math.floor((latitude + 90) / GRID_SIZE_DEGREES))
+
+
+def grid_col(longitude):
+    """
+    Return the grid column containing a longitude.
+    """
+
+    return int(math.floor((longitude + 180) / GRID_SIZE_DEGREES))
+
+
+def haversine_km(latitude_1, longitude_1, latitude_2, longitude_2):
+    """
+    Return the great-circle distance between two points in kilometers.
+    """
+
+    phi_1 = math.radians(latitude_1)
+    phi_2 = math.radians(latitude_2)
+    delta_phi = phi_2 - phi_1
+    delta_lambda = math.radians(longitude_2 - longitude_1)
+
+    a = (
+        math.sin(delta_phi / 2) ** 2
+        + math.cos(phi_1) * math.cos(phi_2)
+        * math.sin(delta_lambda / 2) ** 2
+    )
+
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def split_bbox(min_longitude, min_latitude, max_longitude, max_latitude):
+    """
+    Split a bounding box that crosses the antimeridian.
+
+    A box whose minimum longitude is greater than its maximum longitude
+    wraps around 180 degrees.
+
+    Returns:
+        list: Boxes as (min_lng, min_lat, max_lng, max_lat) tuples.
+    """
+
+    if min_longitude <= max_longitude:
+        return [
+            (min_longitude, min_latitude, max_longitude, max_latitude)
+        ]
+
+    return [
+        (min_longitude, min_latitude, 180.0, max_latitude),
+        (-180.0, min_latitude, max_longitude, max_latitude)
+    ]
+
+
+def radius_bbox(latitude, longitude, radius_km):
+    """
+    Return bounding boxes enclosing a circle on the globe.
+
+    The box is derived from the same sphere as haversine_km, so every
+    point within the radius falls inside it. The longitude span is that
+    of the circle's widest point, which lies poleward of its center.
+
+    Returns:
+        list: Boxes as (min_lng, min_lat, max_lng, max_lat) tuples.
+    """
+
+    angular_radius = radius_km / EARTH_RADIUS_KM
+    delta_latitude = math.degrees(angular_radius)
+    min_latitude = max(-90.0, latitude - delta_latitude)
+    max_latitude = min(90.0, latitude + delta_latitude)
+    cosine = math.cos(math.radians(latitude))
+
+    # Circles reaching a pole, or wider than the parallel through their
+    # center, cover every longitude.
+    if (
+        max_latitude >= 90.0
+        or min_latitude <= -90.0
+        or math.sin(angular_radius) >= cosine
+    ):
+        return [(-180.0, min_latitude, 180.0, max_latitude)]
+
+    delta_longitude = math.degrees(
+        math.asin(math.sin(angular_radius) / cosine)
+    )
+    min_longitude = longitude - delta_longitude
+    max_longitude = longitude + delta_longitude
+
+    if min_longitude < -180.0:
+        min_longitude += 360.0
+
+    if max_longitude > 180.0:
+        max_longitude -= 360.0
+
+    return split_bbox(
+        min_longitude,
+        min_latitude,
+        max_longitude,
+        max_latitude
+    )
@@ -0,0 +1,861 @@
+#!/usr/bin/python3
+"""
+Bulk import of users, amenities, places, and reviews.
+
+Rows are read lazily from CSV or NDJSON files and validated with the
+same rules as the API. Each batch then costs a fixed number of
+statements: references are resolved with one lookup per referenced
+table, rows are written with executemany INSERTs, and the batch is
+committed on its own. A checkpoint records how many rows have been
+committed, so an interrupted import resumes after the last batch. Rows
+without an ID get one derived from the source file and line number, so
+a batch replayed after a crash before its checkpoint was saved is
+rejected as existing instead of inserted twice.
+"""
+
+from abc import ABC, abstractmethod
+import csv
+from functools import partial
+import json
+import os
+import time
+import uuid
+
+from app.api.v1.amenities import validate_amenity_data
+from app.api.v1.places import validate_place_data
+from app.api.v1.reviews import validate_review_data
+from app.api.v1.users import validate_registration_data
+from app.extensions import response_cache
+from app.geo import grid_col, grid_row
+from app.models.user import User
+from app.persistence.unit_of_work import UnitOfWork, run_after_commit
+from app.services import facade
+
+
+# File extensions mapped to import formats.
+FORMATS = {
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson"
+}
+
+# Separator of list values, such as amenity IDs, in CSV cells.
+LIST_SEPARATOR = ";"
+
+
+def detect_format(path):
+    """
+    Return the import format of a file from its extension.
+
+    Raises:
+        ValueError: If the extension is not a known format.
+    """
+
+    _, extension = os.path.splitext(path)
+
+    if extension.lower() not in FORMATS:
+        raise ValueError(
+            "Unknown file format; use --format csv or ndjson"
+        )
+
+    return FORMATS[extension.lower()]
+
+
+def read_rows(stream, file_format):
+    """
+    Read the rows of a CSV or NDJSON stream one at a time.
+
+    Empty CSV cells are left out, as absent fields. NDJSON lines that
+    are not JSON objects are returned as None.
+
+    Args:
+        stream: Open text file.
+        file_format (str): ``csv`` or ``ndjson``.
+
+    Yields:
+        tuple: Line number and row dictionary.
+    """
+
+    if file_format == "csv":
+        reader = csv.DictReader(stream)
+
+        for row in reader:
+            yield reader.line_num, {
+                key.strip(): value.strip()
+                for key, value in row.items()
+                if key and value and value.strip()
+            }
+
+        return
+
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+
+        yield number, row if isinstance(row, dict) else None
+
+
+def parse_number(value):
+    """
+    Convert a CSV cell to a number, leaving invalid values unchanged.
+    """
+
+    for convert in (int, float):
+        try:
+            return convert(value)
+        except ValueError:
+            pass
+
+    return value
+
+
+def parse_bool(value):
+    """
+    Convert a CSV cell to a boolean, leaving invalid values unchanged.
+    """
+
+    return {
+        "true": True,
+        "1": True,
+        "false": False,
+        "0": False
+    }.get(value.lower(), value)
+
+
+def parse_list(value):
+    """
+    Split a CSV cell into a list of values.
+    """
+
+    return [
+        item.strip()
+        for item in value.split(LIST_SEPARATOR)
+        if item.strip()
+    ]
+
+
+class ImportReport:
+    """
+    Counts and timing of an import run.
+    """
+
+    def __init__(self, skipped=0):
+        """
+        Start the report.
+
+        Args:
+            skipped (int): Rows already committed by a previous run.
+        """
+
+        self.skipped = skipped
+        self.read = skipped
+        self.imported = 0
+        self.rejected = []
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        """
+        Return the seconds since the import started.
+        """
+
+        return time.perf_counter() - self.started
+
+    @property
+    def rate(self):
+        """
+        Return the rows processed per second by this run.
+        """
+
+        return (self.read - self.skipped) / max(self.elapsed, 1e-9)
+
+
+class Checkpoint:
+    """
+    File recording how many rows of a source have been committed.
+    """
+
+    def __init__(self, path, source, entity):
+        """
+        Initialize the checkpoint.
+
+        Args:
+            path (str): Checkpoint file, or None to disable it.
+            source (str): Path of the imported file.
+            entity (str): Imported entity name.
+        """
+
+        self.path = path
+        self.source = os.path.abspath(source)
+        self.entity = entity
+
+    def load(self):
+        """
+        Return the rows committed by a previous run of this import.
+        """
+
+        if not self.path or not os.path.exists(self.path):
+            return 0
+
+        with open(self.path, encoding="utf-8") as file:
+            state = json.load(file)
+
+        if (
+            state.get("source") != self.source
+            or state.get("entity") != self.entity
+        ):
+            raise ValueError(
+                f"Checkpoint {self.path} belongs to another import"
+            )
+
+        return state["rows"]
+
+    def save(self, rows):
+        """
+        Record the committed rows, replacing the file atomically.
+        """
+
+        if not self.path:
+            return
+
+        temporary = f"{self.path}.tmp"
+
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "source": self.source,
+                    "entity": self.entity,
+                    "rows": rows
+                },
+                file
+            )
+
+        os.replace(temporary, self.path)
+
+
+class BulkImporter(ABC):
+    """
+    Import rows of one entity in batches.
+
+    Subclasses declare the fields parsed from CSV text, the reference
+    fields kept out of validation, and how a batch of valid rows is
+    resolved and written.
+    """
+
+    entity = None
+    parsers = {}
+    reference_fields = ()
+    tags = ()
+
+    def __init__(self, batch_size, source=None):
+        """
+        Initialize the importer.
+
+        Args:
+            batch_size (int): Rows per batch and transaction.
+            source (str): Path of the imported file, or None to give
+                rows without an ID a random one.
+        """
+
+        self.batch_size = batch_size
+        self.namespace = None
+
+        if source is not None:
+            self.namespace = uuid.uuid5(
+                uuid.NAMESPACE_URL,
+                f"file://{os.path.abspath(source)}#{self.entity}"
+            )
+
+    @abstractmethod
+    def validate(self, data):
+        """
+        Validate the entity fields of a row, as the API would.
+
+        Returns:
+            tuple: Validation result and optional error message.
+        """
+
+    @abstractmethod
+    def write(self, batch):
+        """
+        Resolve references of a batch and insert its valid rows.
+
+        Args:
+            batch (list): (line number, entity data, references) tuples.
+
+        Returns:
+            tuple: Number of rows inserted and (line number, error)
+            tuples for rejected rows.
+        """
+
+    def check(self, row, typed):
+        """
+        Split and validate one row.
+
+        Args:
+            row (dict): Row read from the file, or None.
+            typed (bool): Whether values already have JSON types.
+
+        Returns:
+            tuple: Entity data, references, and optional error.
+        """
+
+        if row is None:
+            return None, None, "Row is not a JSON object"
+
+        if not typed:
+            row = {
+                key: self.parsers[key](value) if key in self.parsers
+                else value
+                for key, value in row.items()
+            }
+
+        references = {
+            key: row.pop(key)
+            for key in ("id", *self.reference_fields)
+            if key in row
+        }
+
+        if "id" in references:
+            object_id = references["id"]
+
+            if (
+                not isinstance(object_id, str)
+                or not object_id.strip()
+                or len(object_id) > 36
+            ):
+                return None, None, "id must be a string of 1 to 36 characters"
+
+        valid, error = self.validate(row)
+
+        if not valid:
+            return None, None, error
+
+        return row, references, None
+
+    def run(self, rows, typed=True, skip=0, on_batch=None):
+        """
+        Import rows, committing one batch at a time.
+
+        Args:
+            rows (iterable): (line number, row) tuples, see read_rows.
+            typed (bool): Whether values already have JSON types.
+            skip (int): Leading rows committed by a previous run.
+            on_batch (callable): Called with the report after every
+                committed batch.
+
+        Returns:
+            ImportReport: Counts of imported and rejected rows.
+        """
+
+        report = ImportReport(skipped=skip)
+        chunk = []
+
+        for index, (number, row) in enumerate(rows):
+            if index < skip:
+                continue
+
+            chunk.append((number, row))
+
+            if len(chunk) == self.batch_size:
+                self._import_chunk(chunk, typed, report)
+                chunk = []
+
+                if on_batch is not None:
+                    on_batch(report)
+
+        if chunk:
+            self._import_chunk(chunk, typed, report)
+
+            if on_batch is not None:
+                on_batch(report)
+
+        return report
+
+    def _import_chunk(self, chunk, typed, report):
+        """
+        Validate a chunk of rows and write the valid ones in one
+        transaction.
+        """
+
+        batch = []
+        invalid = []
+
+        for number, row in chunk:
+            data, references, error = self.check(row, typed)
+
+            if error:
+                invalid.append((number, error))
+            else:
+                batch.append((number, data, references))
+
+        with UnitOfWork():
+            imported, rejected = self.write(batch)
+
+            if imported:
+                run_after_commit(
+                    partial(response_cache.invalidate, *self.tags)
+                )
+
+        report.read += len(chunk)
+        report.imported += imported
+        report.rejected.extend(sorted(invalid + rejected))
+
+    def new_id(self, number, references):
+        """
+        Return the row's own ID, or one derived from its line number.
+
+        Without a source the ID is random.
+        """
+
+        if references.get("id"):
+            return references["id"]
+
+        if self.namespace is None:
+            return str(uuid.uuid4())
+
+        return str(uuid.uuid5(self.namespace, str(number)))
+
+    def taken_ids(self, repository, batch):
+        """
+        Return the row IDs of a batch that already exist.
+        """
+
+        return set(repository.lookup(
+            "id",
+            [
+                self.new_id(number, references)
+                for number, _, references in batch
+            ]
+        ))
+
+
+class UserImporter(BulkImporter):
+    """
+    Import users; passwords of a batch are hashed in parallel.
+    """
+
+    entity = "users"
+    parsers = {
+        "is_admin": parse_bool
+    }
+    tags = ("users",)
+
+    def validate(self, data):
+        """
+        Validate user fields like administrator user creation.
+        """
+
+        return validate_registration_data(data)
+
+    def write(self, batch):
+        """
+        Insert users whose email and ID are not taken.
+        """
+
+        repository = facade.user_repo
+        taken_emails = set(repository.lookup(
+            "email",
+            [data["email"].strip().lower() for _, data, _ in batch]
+        ))
+        taken_ids = self.taken_ids(repository, batch)
+        rows = []
+        rejected = []
+
+        for number, data, references in batch:
+            email = data["email"].strip().lower()
+
+            if email in taken_emails:
+                rejected.append((number, "Email already registered"))
+                continue
+
+            row_id = self.new_id(number, references)
+
+            if row_id in taken_ids:
+                rejected.append((number, "User ID already exists"))
+                continue
+
+            taken_emails.add(email)
+            taken_ids.add(row_id)
+            rows.append({
+                "id": row_id,
+                "first_name": data["first_name"].strip(),
+                "last_name": data["last_name"].strip(),
+                "email": email,
+                "password": data["password"],
+                "is_admin": data.get("is_admin", False)
+            })
+
+        hashes = User.make_password_hashes(
+            [row["password"] for row in rows]
+        )
+
+        for row, password_hash in zip(rows, hashes):
+            row["password"] = password_hash
+
+        return repository.bulk_insert(rows), rejected
+
+
+class AmenityImporter(BulkImporter):
+    """
+    Import amenities, giving each a free amenity bit while one is left.
+    """
+
+    entity = "amenities"
+    tags = ("amenities", "places")
+
+    def validate(self, data):
+        """
+        Validate amenity fields like amenity creation.
+        """
+
+        return validate_amenity_data(data)
+
+    def write(self, batch):
+        """
+        Insert amenities whose name and ID are not taken.
+        """
+
+        repository = facade.amenity_repo
+        taken_names = set(repository.lookup(
+            "name",
+            [data["name"].strip() for _, data, _ in batch]
+        ))
+        taken_ids = self.taken_ids(repository, batch)
+        free_bits = iter(repository.free_bits())
+        rows = []
+        rejected = []
+
+        for number, data, references in batch:
+            name = data["name"].strip()
+
+            if name in taken_names:
+                rejected.append((number, "Amenity already exists"))
+                continue
+
+            row_id = self.new_id(number, references)
+
+            if row_id in taken_ids:
+                rejected.append((number, "Amenity ID already exists"))
+                continue
+
+            taken_names.add(name)
+            taken_ids.add(row_id)
+            rows.append({
+                "id": row_id,
+                "name": name,
+                "bit": next(free_bits, None)
+            })
+
+        return repository.bulk_insert(rows), rejected
+
+
+class PlaceImporter(BulkImporter):
+    """
+    Import places with their owner and amenities.
+
+    Owners are referenced by ``owner_id`` or ``owner_email``; amenities
+    by ``amenity_ids``, ``amenity_names``, or both.
+    """
+
+    entity = "places"
+    parsers = {
+        "price": parse_number,
+        "latitude": parse_number,
+        "longitude": parse_number,
+        "amenity_ids": parse_list,
+        "amenity_names": parse_list
+    }
+    reference_fields = ("owner_id", "owner_email", "amenity_names")
+    tags = ("places",)
+
+    def validate(self, data):
+        """
+        Validate place fields like place creation.
+        """
+
+        return validate_place_data(data, require_all=True)
+
+    def check(self, row, typed):
+        """
+        Split and validate a row, which must reference an owner.
+        """
+
+        data, references, error = super().check(row, typed)
+
+        if error:
+            return data, references, error
+
+        if not references.get("owner_id") and not references.get(
+            "owner_email"
+        ):
+            return None, None, "owner_id or owner_email is required"
+
+        names = references.get("amenity_names", [])
+
+        if not isinstance(names, list) or not all(
+            isinstance(name, str) for name in names
+        ):
+            return None, None, "amenity_names must be a list of names"
+
+        return data, references, None
+
+    def write(self, batch):
+        """
+        Insert places whose owner and amenities exist, with their
+        amenity links.
+        """
+
+        users = facade.user_repo
+        amenities = facade.amenity_repo
+        owners_by_id = users.lookup(
+            "id",
+            [ref["owner_id"] for _, _, ref in batch if "owner_id" in ref]
+        )
+        owners_by_email = users.lookup(
+            "email",
+            [
+                ref["owner_email"].strip().lower()
+                for _, _, ref in batch
+                if "owner_email" in ref
+            ]
+        )
+        amenities_by_name = amenities.lookup(
+            "name",
+            [
+                name.strip()
+                for _, _, ref in batch
+                for name in ref.get("amenity_names", [])
+            ]
+        )
+        bits = amenities.lookup(
+            "id",
+            [
+                amenity_id.strip()
+                for _, data, _ in batch
+                for amenity_id in data.get("amenity_ids", [])
+            ] + list(amenities_by_name.values()),
+            column="bit"
+        )
+        taken_ids = self.taken_ids(facade.place_repo, batch)
+        rows = []
+        links = []
+        rejected = []
+
+        for number, data, references in batch:
+            owner_id = (
+                owners_by_id.get(references["owner_id"])
+                if "owner_id" in references
+                else owners_by_email.get(
+                    references["owner_email"].strip().lower()
+                )
+            )
+            names = [
+                name.strip()
+                for name in references.get("amenity_names", [])
+            ]
+            amenity_ids = {
+                amenity_id.strip()
+                for amenity_id in data.get("amenity_ids", [])
+            }
+            amenity_ids.update(
+                amenities_by_name[name]
+                for name in names
+                if name in amenities_by_name
+            )
+
+            if owner_id is None:
+                rejected.append((number, "Owner not found"))
+                continue
+
+            if (
+                not amenity_ids.issubset(bits)
+                or not set(names).issubset(amenities_by_name)
+            ):
+                rejected.append((number, "Amenity not found"))
+                continue
+
+            place_id = self.new_id(number, references)
+
+            if place_id in taken_ids:
+                rejected.append((number, "Place ID already exists"))
+                continue
+
+            taken_ids.add(place_id)
+            rows.append({
+                "id": place_id,
+                "title": data["title"].strip(),
+                "description": data["description"].strip(),
+                "price": data["price"],
+                "latitude": data["latitude"],
+                "longitude": data["longitude"],
+                "owner_id": owner_id,
+                "geo_row": grid_row(data["latitude"]),
+                "geo_col": grid_col(data["longitude"]),
+                "amenity_mask": sum(
+                    1 << bits[amenity_id]
+                    for amenity_id in amenity_ids
+                    if bits[amenity_id] is not None
+                )
+            })
+            links.extend(
+                {
+                    "place_id": place_id,
+                    "amenity_id": amenity_id
+                }
+                for amenity_id in sorted(amenity_ids)
+            )
+
+        imported = facade.place_repo.bulk_insert(rows)
+        facade.place_repo.bulk_link_amenities(links)
+
+        return imported, rejected
+
+
+class ReviewImporter(BulkImporter):
+    """
+    Import reviews and update the rating aggregates of their places.
+
+    Authors are referenced by ``user_id`` or ``user_email``. As through
+    the API, a user may review a place only once.
+    """
+
+    entity = "reviews"
+    parsers = {
+        "rating": parse_number
+    }
+    reference_fields = ("user_id", "user_email")
+    tags = ("reviews", "places")
+
+    def validate(self, data):
+        """
+        Validate review fields like review creation.
+        """
+
+        return validate_review_data(data, require_place=True)
+
+    def check(self, row, typed):
+        """
+        Split and validate a row, which must reference an author.
+        """
+
+        data, references, error = super().check(row, typed)
+
+        if error:
+            return data, references, error
+
+        if not references.get("user_id") and not references.get(
+            "user_email"
+        ):
+            return None, None, "user_id or user_email is required"
+
+        return data, references, None
+
+    def write(self, batch):
+        """
+        Insert reviews of existing places by existing users, then
+        reconcile the rating aggregates of the reviewed places.
+        """
+
+        users = facade.user_repo
+        places = facade.place_repo
+        reviews = facade.review_repo
+        users_by_id = users.lookup(
+            "id",
+            [ref["user_id"] for _, _, ref in batch if "user_id" in ref]
+        )
+        users_by_email = users.lookup(
+            "email",
+            [
+                ref["user_email"].strip().lower()
+                for _, _, ref in batch
+                if "user_email" in ref
+            ]
+        )
+        place_ids = set(places.lookup(
+            "id",
+            [data["place_id"].strip() for _, data, _ in batch]
+        ))
+        resolved = []
+
+        for number, data, references in batch:
+            user_id = (
+                users_by_id.get(references["user_id"])
+                if "user_id" in references
+                else users_by_email.get(
+                    references["user_email"].strip().lower()
+                )
+            )
+            resolved.append((
+                number,
+                data,
+                references,
+                user_id,
+                data["place_id"].strip()
+            ))
+
+        reviewed = reviews.get_reviewed_pairs(
+            (user_id, place_id)
+            for _, _, _, user_id, place_id in resolved
+            if user_id is not None and place_id in place_ids
+        )
+        taken_ids = self.taken_ids(reviews, batch)
+        rows = []
+        rejected = []
+
+        for number, data, references, user_id, place_id in resolved:
+            if user_id is None:
+                rejected.append((number, "User not found"))
+                continue
+
+            if place_id not in place_ids:
+                rejected.append((number, "Place not found"))
+                continue
+
+            if (user_id, place_id) in reviewed:
+                rejected.append(
+                    (number, "User has already reviewed this place")
+                )
+                continue
+
+            row_id = self.new_id(number, references)
+
+            if row_id in taken_ids:
+                rejected.append((number, "Review ID already exists"))
+                continue
+
+            reviewed.add((user_id, place_id))
+            taken_ids.add(row_id)
+            rows.append({
+                "id": row_id,
+                "text": data["text"].strip(),
+                "rating": data["rating"],
+                "user_id": user_id,
+                "place_id": place_id
+            })
+
+        imported = reviews.bulk_insert(rows)
+
+        if rows:
+            places.reconcile_ratings({row["place_id"] for row in rows})
+
+            if places.cache is not None:
+                run_after_commit(places.cache.clear)
+
+        return imported, rejected
+
+
+IMPORTERS = {
+    importer.entity: importer
+    for importer in (
+        UserImporter,
+        AmenityImporter,
+        PlaceImporter,
+        ReviewImporter
+    )
+}
@@ -0,0 +1,236 @@
+#!/usr/bin/python3
+"""
+Per-request instrumentation for the HBnB application.
+
+Counts SQL statements, accumulates database time, times named phases
+of each request, and keeps the peak of named gauges such as queue
+depths. Results are emitted as a Server-Timing header and as a
+structured log line.
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+import json
+import time
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+
+class RequestMetrics:
+    """
+    Flask extension collecting query counts and phase timings.
+    """
+
+    def __init__(self, app=None):
+        """
+        Initialize the extension.
+
+        Args:
+            app (Flask): Optional application to initialize.
+        """
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Register request hooks and SQLAlchemy engine listeners.
+
+        Flask-SQLAlchemy must be initialized on the application first.
+
+        Args:
+            app (Flask): Application to instrument.
+        """
+
+        app.config.setdefault("SERVER_TIMING_ENABLED", False)
+        app.config.setdefault("REQUEST_METRICS_LOG_ENABLED", False)
+
+        if not (
+            app.config["SERVER_TIMING_ENABLED"]
+            or app.config["REQUEST_METRICS_LOG_ENABLED"]
+        ):
+            return
+
+        db = app.extensions["sqlalchemy"]
+
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(
+                    engine,
+                    "before_cursor_execute",
+                    self._before_cursor_execute
+                )
+                event.listen(
+                    engine,
+                    "after_cursor_execute",
+                    self._after_cursor_execute
+                )
+
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+
+    @staticmethod
+    def _current():
+        """
+        Return the metrics of the active request, or None.
+        """
+
+        if not has_request_context():
+            return None
+
+        return g.get("request_metrics")
+
+    def _start_request(self):
+        """
+        Reset metrics at the start of a request.
+        """
+
+        g.request_metrics = {
+            "started": time.perf_counter(),
+            "queries": 0,
+            "phases": defaultdict(float),
+            "gauges": {},
+            "active": set()
+        }
+
+    def _before_cursor_execute(self, conn, *args):
+        """
+        Record the start time of a SQL statement.
+        """
+
+        conn.info.setdefault("query_started", []).append(
+            time.perf_counter()
+        )
+
+    def _after_cursor_execute(self, conn, *args):
+        """
+        Add a finished SQL statement to the request metrics.
+        """
+
+        started = conn.info["query_started"].pop()
+        metrics = self._current()
+
+        if metrics is None:
+            return
+
+        metrics["queries"] += 1
+        metrics["phases"]["db"] += time.perf_counter() - started
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a named phase of the current request.
+
+        Outside a request, or when metrics are disabled, the block runs
+        without being timed. Nested blocks of the same phase are counted
+        once.
+
+        Args:
+            name (str): Phase name, such as ``serialize`` or ``auth``.
+        """
+
+        metrics = self._current()
+
+        if metrics is None or name in metrics["active"]:
+            yield
+            return
+
+        metrics["active"].add(name)
+        started = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            metrics["phases"][name] += time.perf_counter() - started
+            metrics["active"].discard(name)
+
+    def gauge(self, name, value):
+        """
+        Record a gauge of the current request, keeping its peak.
+
+        Outside a request, or when metrics are disabled, the value is
+        dropped.
+
+        Args:
+            name (str): Gauge name, such as ``hash_queue``.
+            value (int): Observed value.
+        """
+
+        metrics = self._current()
+
+        if metrics is None:
+            return
+
+        gauges = metrics["gauges"]
+        gauges[name] = max(gauges.get(name, value), value)
+
+    def timed(self, name):
+        """
+        Decorate a function so each call is timed as a phase.
+
+        Args:
+            name (str): Phase name.
+        """
+
+        def decorator(function):
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.phase(name):
+                    return function(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def _finish_request(self, response):
+        """
+        Emit the collected metrics for a finished request.
+        """
+
+        metrics = self._current()
+
+        if metrics is None:
+            return response
+
+        total = time.perf_counter() - metrics["started"]
+        phases = {
+            name: round(seconds * 1000, 3)
+            for name, seconds in metrics["phases"].items()
+        }
+        phases.setdefault("db", 0.0)
+
+        if current_app.config["SERVER_TIMING_ENABLED"]:
+            entries = [
+                f"db;dur={phases['db']};"
+                f'desc="{metrics["queries"]} queries"'
+            ]
+            entries.extend(
+                f"{name};dur={duration}"
+                for name, duration in sorted(phases.items())
+                if name != "db"
+            )
+            entries.extend(
+                f'{name};desc="{value}"'
+                for name, value in sorted(metrics["gauges"].items())
+            )
+            entries.append(f"total;dur={round(total * 1000, 3)}")
+
+            response.headers.add(
+                "Server-Timing",
+                ", ".join(entries)
+            )
+
+        if current_app.config["REQUEST_METRICS_LOG_ENABLED"]:
+            current_app.logger.info(json.dumps({
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "queries": metrics["queries"],
+                "phases_ms": phases,
+                "gauges": metrics["gauges"],
+                "total_ms": round(total * 1000, 3)
+            }, sort_keys=True))
+
+        return response
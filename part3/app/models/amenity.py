@@ -8,13 +8,29 @@ from app.models.base_model import BaseModel
 from app.models.place_amenity import place_amenity
 
 
+# Bits available in a signed 64-bit place amenity mask.
+AMENITY_BITS = 63
+
+
 class Amenity(BaseModel):
     """
     SQLAlchemy model representing an amenity.
+
+    Each amenity owns one bit of Place.amenity_mask. Amenities created
+    after all bits are taken have no bit and are filtered through the
+    place_amenity table instead.
     """
 
     __tablename__ = "amenities"
 
+    __table_args__ = (
+        db.Index(
+            "ix_amenities_created_at_id",
+            "created_at",
+            "id"
+        ),
+    )
+
     name = db.Column(
         db.String(50),
         nullable=False,
@@ -22,6 +38,12 @@ class Amenity(BaseModel):
         index=True
     )
 
+    bit = db.Column(
+        db.Integer,
+        nullable=True,
+        unique=True
+    )
+
     places = db.relationship(
         "Place",
         secondary=place_amenity,
@@ -39,6 +61,17 @@ class Amenity(BaseModel):
 
         self.name = name.strip()
 
+    @property
+    def mask(self):
+        """
+        Return the amenity bit as a mask, or 0 if it has none.
+        """
+
+        if self.bit is None:
+            return 0
+
+        return 1 << self.bit
+
     def update(self, data):
         """
         Update amenity attributes safely.
@@ -51,6 +84,8 @@ class Amenity(BaseModel):
                 "name"
             ].strip()
 
+        update_data.pop("bit", None)
+
         super().update(update_data)
 
     def to_dict(self):
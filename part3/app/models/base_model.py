@@ -11,10 +11,14 @@ from app.extensions import db
 
 def utc_now():
     """
-    Return the current timezone-aware UTC datetime.
+    Return the current UTC time as a naive datetime.
+
+    SQLite keeps no offset and reads every timestamp back naive, so
+    objects serialized straight after a write must hold the same form
+    as those loaded from the database.
     """
 
-    return datetime.now(UTC)
+    return datetime.now(UTC).replace(tzinfo=None)
 
 
 class BaseModel(db.Model):
@@ -40,7 +44,8 @@ class BaseModel(db.Model):
         db.DateTime(timezone=True),
         nullable=False,
         default=utc_now,
-        onupdate=utc_now
+        onupdate=utc_now,
+        index=True
     )
 
     def update(self, data):
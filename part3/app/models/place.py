@@ -4,17 +4,49 @@ Place model for the HBnB application.
 """
 
 from app.extensions import db
-from app.models.base_model import BaseModel
+from app.geo import grid_col, grid_row
+from app.models.base_model import BaseModel, utc_now
 from app.models.place_amenity import place_amenity
 
 
+RATING_VALUES = (1, 2, 3, 4, 5)
+
+
 class Place(BaseModel):
     """
     SQLAlchemy model representing a place.
+
+    Review aggregates are denormalized onto the place and maintained by
+    the facade in the same transaction as each review write.
     """
 
     __tablename__ = "places"
 
+    __table_args__ = (
+        db.Index(
+            "ix_places_created_at_id",
+            "created_at",
+            "id"
+        ),
+        db.Index(
+            "ix_places_price_id",
+            "price",
+            "id"
+        ),
+        db.Index(
+            "ix_places_average_rating_id",
+            "average_rating",
+            "id"
+        ),
+        db.Index(
+            "ix_places_geo_grid",
+            "geo_row",
+            "geo_col",
+            "latitude",
+            "longitude"
+        )
+    )
+
     title = db.Column(
         db.String(100),
         nullable=False
@@ -47,6 +79,82 @@ class Place(BaseModel):
         index=True
     )
 
+    # Bitwise OR of the amenity bits, see Amenity.bit.
+    amenity_mask = db.Column(
+        db.BigInteger,
+        nullable=False,
+        default=0,
+        server_default="0"
+    )
+
+    # Grid cell of the coordinates, see app.geo.
+    geo_row = db.Column(
+        db.Integer,
+        nullable=True
+    )
+
+    geo_col = db.Column(
+        db.Integer,
+        nullable=True
+    )
+
+    review_count = db.Column(
+        db.Integer,
+        nullable=False,
+        default=0,
+        server_default="0"
+    )
+
+    rating_sum = db.Column(
+        db.Integer,
+        nullable=False,
+        default=0,
+        server_default="0"
+    )
+
+    rating_1 = db.Column(
+        db.Integer,
+        nullable=False,
+        default=0,
+        server_default="0"
+    )
+
+    rating_2 = db.Column(
+        db.Integer,
+        nullable=False,
+        default=0,
+        server_default="0"
+    )
+
+    rating_3 = db.Column(
+        db.Integer,
+        nullable=False,
+        default=0,
+        server_default="0"
+    )
+
+    rating_4 = db.Column(
+        db.Integer,
+        nullable=False,
+        default=0,
+        server_default="0"
+    )
+
+    rating_5 = db.Column(
+        db.Integer,
+        nullable=False,
+        default=0,
+        server_default="0"
+    )
+
+    # Zero when the place has no reviews.
+    average_rating = db.Column(
+        db.Float,
+        nullable=False,
+        default=0.0,
+        server_default="0"
+    )
+
     owner = db.relationship(
         "User",
         back_populates="places",
@@ -91,6 +199,28 @@ class Place(BaseModel):
         self.latitude = latitude
         self.longitude = longitude
         self.owner_id = owner_id
+        self.update_grid_cell()
+        self.amenity_mask = 0
+        self.review_count = 0
+        self.rating_sum = 0
+        self.average_rating = 0.0
+
+        for rating in RATING_VALUES:
+            setattr(self, f"rating_{rating}", 0)
+
+    @property
+    def rating_histogram(self):
+        """
+        Return the number of reviews for each rating.
+
+        Returns:
+            dict: Rating values as strings mapped to review counts.
+        """
+
+        return {
+            str(rating): getattr(self, f"rating_{rating}")
+            for rating in RATING_VALUES
+        }
 
     def add_amenity(self, amenity):
         """
@@ -99,6 +229,8 @@ class Place(BaseModel):
 
         if amenity not in self.amenities:
             self.amenities.append(amenity)
+            self.amenity_mask |= amenity.mask
+            self.updated_at = utc_now()
 
     def remove_amenity(self, amenity):
         """
@@ -107,6 +239,34 @@ class Place(BaseModel):
 
         if amenity in self.amenities:
             self.amenities.remove(amenity)
+            self.amenity_mask &= ~amenity.mask
+            self.updated_at = utc_now()
+
+    def set_amenities(self, amenities):
+        """
+        Replace the amenities of this place.
+        """
+
+        self.amenities = list(amenities)
+        self.amenity_mask = 0
+
+        for amenity in self.amenities:
+            self.amenity_mask |= amenity.mask
+
+        self.updated_at = utc_now()
+
+    @staticmethod
+    def rating_fields():
+        """
+        Return the names of the denormalized rating columns.
+        """
+
+        return (
+            "review_count",
+            "rating_sum",
+            "average_rating",
+            *(f"rating_{rating}" for rating in RATING_VALUES)
+        )
 
     def update(self, data):
         """
@@ -129,9 +289,26 @@ class Place(BaseModel):
             ].strip()
 
         update_data.pop("owner_id", None)
+        update_data.pop("amenity_mask", None)
+        update_data.pop("geo_row", None)
+        update_data.pop("geo_col", None)
+
+        for field in self.rating_fields():
+            update_data.pop(field, None)
 
         super().update(update_data)
 
+        if "latitude" in update_data or "longitude" in update_data:
+            self.update_grid_cell()
+
+    def update_grid_cell(self):
+        """
+        Recompute the grid cell from the coordinates.
+        """
+
+        self.geo_row = grid_row(self.latitude)
+        self.geo_col = grid_col(self.longitude)
+
     def to_dict(self):
         """
         Return a dictionary representation of the place.
@@ -146,6 +323,10 @@ class Place(BaseModel):
             "latitude": self.latitude,
             "longitude": self.longitude,
             "owner_id": self.owner_id,
+            "review_count": self.review_count,
+            "rating_sum": self.rating_sum,
+            "average_rating": self.average_rating,
+            "rating_histogram": self.rating_histogram,
             "amenities": [
                 amenity.id
                 for amenity in self.amenities
@@ -21,5 +21,10 @@ place_amenity = db.Table(
         db.ForeignKey("amenities.id"),
         primary_key=True,
         nullable=False
+    ),
+    db.Index(
+        "ix_place_amenity_amenity_id_place_id",
+        "amenity_id",
+        "place_id"
     )
 )
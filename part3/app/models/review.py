@@ -23,6 +23,17 @@ class Review(BaseModel):
         db.CheckConstraint(
             "rating >= 1 AND rating <= 5",
             name="ck_review_rating"
+        ),
+        db.Index(
+            "ix_reviews_created_at_id",
+            "created_at",
+            "id"
+        ),
+        db.Index(
+            "ix_reviews_place_id_created_at_id",
+            "place_id",
+            "created_at",
+            "id"
         )
     )
 
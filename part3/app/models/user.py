@@ -3,7 +3,7 @@
 User model for the HBnB application.
 """
 
-from app.extensions import bcrypt, db
+from app.extensions import db, metrics, password_hasher
 from app.models.base_model import BaseModel
 
 
@@ -14,6 +14,14 @@ class User(BaseModel):
 
     __tablename__ = "users"
 
+    __table_args__ = (
+        db.Index(
+            "ix_users_created_at_id",
+            "created_at",
+            "id"
+        ),
+    )
+
     first_name = db.Column(
         db.String(50),
         nullable=False
@@ -92,12 +100,53 @@ class User(BaseModel):
             ValueError: If the password is empty or invalid.
         """
 
+        self.password = self.make_password_hash(password)
+
+    @staticmethod
+    def make_password_hash(password):
+        """
+        Return the bcrypt hash of a plain-text password.
+
+        Args:
+            password (str): Plain-text password.
+
+        Returns:
+            str: Password hash.
+
+        Raises:
+            ValueError: If the password is empty or invalid.
+        """
+
         if not isinstance(password, str) or not password.strip():
             raise ValueError("Password is required")
 
-        self.password = bcrypt.generate_password_hash(
-            password
-        ).decode("utf-8")
+        with metrics.phase("auth"):
+            metrics.gauge("hash_queue", password_hasher.pool.pending)
+
+            return password_hasher.hash(password)
+
+    @staticmethod
+    def make_password_hashes(passwords):
+        """
+        Return the bcrypt hashes of several passwords, hashed in
+        parallel by the hashing pool.
+
+        Args:
+            passwords (list): Plain-text passwords.
+
+        Returns:
+            list: Password hashes, in the same order.
+
+        Raises:
+            ValueError: If a password is empty or invalid.
+        """
+
+        for password in passwords:
+            if not isinstance(password, str) or not password.strip():
+                raise ValueError("Password is required")
+
+        with metrics.phase("auth"):
+            return password_hasher.hash_many(passwords)
 
     def verify_password(self, password):
         """
@@ -117,10 +166,13 @@ class User(BaseModel):
         ):
             return False
 
-        return bcrypt.check_password_hash(
-            self.password,
-            password
-        )
+        with metrics.phase("auth"):
+            metrics.gauge("hash_queue", password_hasher.pool.pending)
+
+            return password_hasher.verify(
+                self.password,
+                password
+            )
 
     def update(self, data):
         """
@@ -0,0 +1,294 @@
+#!/usr/bin/python3
+"""
+bcrypt password hashing off the request threads.
+
+At the default cost factor a hash or check keeps a core busy for about
+250 ms. Requests submit that work to a bounded process pool and wait
+for the result, so at most PASSWORD_HASH_WORKERS hashes run at once
+however many logins arrive together, and request threads never compete
+with them for the interpreter. Once PASSWORD_HASH_MAX_PENDING jobs are
+queued, further requests wait up to PASSWORD_HASH_TIMEOUT seconds for a
+slot, then fail with PasswordHashingBusy.
+
+With PASSWORD_HASH_WORKERS set to 0 the work runs on the calling
+thread, as in tests.
+
+Workers are never forked from the application process, whose threads
+may hold locks and database connections at that moment. They start
+from the forkserver where the platform has one, which imports the main
+module once and forks every worker from that clean process, and are
+spawned otherwise.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import threading
+
+import bcrypt
+from flask import current_app
+
+
+DEFAULT_START_METHOD = (
+    "forkserver"
+    if "forkserver" in multiprocessing.get_all_start_methods()
+    else "spawn"
+)
+
+
+class PasswordHashingBusy(RuntimeError):
+    """
+    Raised when no hashing slot frees up in time.
+    """
+
+
+def hash_password(password, rounds):
+    """
+    Return the bcrypt hash of a password.
+
+    Args:
+        password (str): Plain-text password.
+        rounds (int): bcrypt cost factor.
+
+    Returns:
+        str: Password hash.
+    """
+
+    return bcrypt.hashpw(
+        password.encode("utf-8"),
+        bcrypt.gensalt(rounds)
+    ).decode("utf-8")
+
+
+def check_password(password_hash, password):
+    """
+    Return whether a password matches a bcrypt hash.
+
+    Args:
+        password_hash (str): Stored hash.
+        password (str): Plain-text password.
+
+    Returns:
+        bool: True if the password matches.
+    """
+
+    return bcrypt.checkpw(
+        password.encode("utf-8"),
+        password_hash.encode("utf-8")
+    )
+
+
+class HashingPool:
+    """
+    Bounded process pool running hashing jobs of one application.
+    """
+
+    def __init__(self, workers, max_pending, timeout, start_method):
+        """
+        Initialize the pool; worker processes start on first use.
+
+        Args:
+            workers (int): Worker processes, or 0 to run inline.
+            max_pending (int): Jobs queued or running at most.
+            timeout (float): Seconds to wait for a free slot.
+            start_method (str): multiprocessing start method.
+        """
+
+        self.workers = workers
+        self.timeout = timeout
+        self.start_method = start_method
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self):
+        """
+        Return the process pool, starting it if needed.
+        """
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(
+                        self.start_method
+                    )
+                )
+
+            return self._executor
+
+    def submit(self, function, *args):
+        """
+        Queue a job once a slot is free.
+
+        Args:
+            function (callable): Module-level function to run.
+            *args: Arguments of the function.
+
+        Returns:
+            Future: Result of the job.
+
+        Raises:
+            PasswordHashingBusy: If no slot frees up in time.
+        """
+
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self.rejected += 1
+
+            raise PasswordHashingBusy("Password hashing is saturated")
+
+        with self._lock:
+            self.pending += 1
+            self.peak_pending = max(self.peak_pending, self.pending)
+
+        try:
+            future = self._get_executor().submit(function, *args)
+        except BaseException:
+            self._finish(None)
+            raise
+
+        future.add_done_callback(self._finish)
+
+        return future
+
+    def _finish(self, _future):
+        """
+        Release the slot of a finished job.
+        """
+
+        with self._lock:
+            self.pending -= 1
+            self.completed += 1
+
+        self._slots.release()
+
+    def run(self, function, *args):
+        """
+        Run a job and wait for its result.
+        """
+
+        if not self.workers:
+            return function(*args)
+
+        return self.submit(function, *args).result()
+
+    def run_many(self, function, arguments):
+        """
+        Run a job per argument tuple and return the results in order.
+        """
+
+        if not self.workers:
+            return [function(*args) for args in arguments]
+
+        futures = [self.submit(function, *args) for args in arguments]
+
+        return [future.result() for future in futures]
+
+    def stats(self):
+        """
+        Return the queue depth and job counters.
+        """
+
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "pending": self.pending,
+                "peak_pending": self.peak_pending,
+                "completed": self.completed,
+                "rejected": self.rejected
+            }
+
+    def shutdown(self):
+        """
+        Stop the worker processes.
+        """
+
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown()
+
+
+class PasswordHasher:
+    """
+    Flask extension hashing and checking passwords in a process pool.
+    """
+
+    def __init__(self, app=None):
+        """
+        Initialize the extension.
+
+        Args:
+            app (Flask): Optional application to initialize.
+        """
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Create the application's hashing pool.
+
+        Args:
+            app (Flask): Application to configure.
+        """
+
+        app.config.setdefault("BCRYPT_LOG_ROUNDS", 12)
+        app.config.setdefault("PASSWORD_HASH_WORKERS", 0)
+        app.config.setdefault("PASSWORD_HASH_MAX_PENDING", 64)
+        app.config.setdefault("PASSWORD_HASH_TIMEOUT", 10.0)
+        app.config.setdefault(
+            "PASSWORD_HASH_START_METHOD",
+            DEFAULT_START_METHOD
+        )
+
+        app.extensions["password_hasher"] = HashingPool(
+            app.config["PASSWORD_HASH_WORKERS"],
+            app.config["PASSWORD_HASH_MAX_PENDING"],
+            app.config["PASSWORD_HASH_TIMEOUT"],
+            app.config["PASSWORD_HASH_START_METHOD"]
+        )
+
+    @property
+    def pool(self):
+        """
+        Return the hashing pool of the current application.
+        """
+
+        return current_app.extensions["password_hasher"]
+
+    def hash(self, password):
+        """
+        Return the bcrypt hash of a password.
+        """
+
+        return self.pool.run(
+            hash_password,
+            password,
+            current_app.config["BCRYPT_LOG_ROUNDS"]
+        )
+
+    def hash_many(self, passwords):
+        """
+        Return the bcrypt hashes of several passwords, hashed in
+        parallel.
+        """
+
+        rounds = current_app.config["BCRYPT_LOG_ROUNDS"]
+
+        return self.pool.run_many(
+            hash_password,
+            [(password, rounds) for password in passwords]
+        )
+
+    def verify(self, password_hash, password):
+        """
+        Return whether a password matches a bcrypt hash.
+        """
+
+        return self.pool.run(check_password, password_hash, password)
@@ -3,7 +3,9 @@
 Amenity-specific SQLAlchemy repository.
 """
 
-from app.models.amenity import Amenity
+from sqlalchemy import func, literal, select, union_all
+
+from app.models.amenity import AMENITY_BITS, Amenity
 from app.persistence.repository import SQLAlchemyRepository
 
 
@@ -18,3 +20,82 @@ class AmenityRepository(SQLAlchemyRepository):
         """
 
         super().__init__(Amenity)
+
+    def next_free_bit(self):
+        """
+        Return the lowest amenity bit not yet assigned.
+
+        Returns:
+            int: Free bit, or None if every bit is taken.
+        """
+
+        return next(iter(self.free_bits()), None)
+
+    def lowest_free_bit(self):
+        """
+        Return a SQL expression selecting the lowest unassigned bit.
+
+        Assigned to Amenity.bit, the expression is evaluated inside the
+        INSERT itself, so concurrent creations cannot both read the same
+        bit as free before either one is written.
+
+        Returns:
+            ScalarSelect: Lowest free bit, or NULL if every bit is taken.
+        """
+
+        assigned = Amenity.bit.is_not(None)
+        # The lowest free bit is 0 or follows an assigned one.
+        candidates = union_all(
+            select(literal(0).label("bit")),
+            select((Amenity.bit + 1).label("bit")).where(assigned)
+        ).subquery()
+
+        return select(
+            func.min(candidates.c.bit)
+        ).where(
+            candidates.c.bit < AMENITY_BITS,
+            candidates.c.bit.not_in(select(Amenity.bit).where(assigned))
+        ).scalar_subquery()
+
+    def free_bits(self):
+        """
+        Return every amenity bit not yet assigned, lowest first.
+
+        Returns:
+            list: Free bits.
+        """
+
+        used = set(
+            self.session.execute(
+                select(Amenity.bit).where(Amenity.bit.is_not(None))
+            ).scalars()
+        )
+
+        return [bit for bit in range(AMENITY_BITS) if bit not in used]
+
+    def assign_missing_bits(self):
+        """
+        Give a free bit to amenities created without one.
+
+        Returns:
+            int: Number of amenities that received a bit.
+        """
+
+        assigned = 0
+        amenities = self.session.execute(
+            select(Amenity)
+            .where(Amenity.bit.is_(None))
+            .order_by(Amenity.created_at, Amenity.id)
+        ).scalars().all()
+
+        for amenity in amenities:
+            bit = self.next_free_bit()
+
+            if bit is None:
+                break
+
+            amenity.bit = bit
+            self.session.flush()
+            assigned += 1
+
+        return assigned
@@ -0,0 +1,330 @@
+#!/usr/bin/python3
+"""
+Read-through entity cache for SQLAlchemy repositories.
+"""
+
+from collections import OrderedDict
+import threading
+import time
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+
+from app.persistence.unit_of_work import run_after_commit
+
+
+class LRUCache:
+    """
+    Bounded least-recently-used cache with per-entry expiry.
+    """
+
+    def __init__(self, maxsize, ttl=None, clock=time.monotonic):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of entries.
+            ttl (float): Seconds an entry stays valid, or None.
+            clock (callable): Monotonic time source.
+        """
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """
+        Return a cached value, or None on a miss.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+
+            if expires_at is not None and expires_at <= self.clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return value
+
+    def generation(self):
+        """
+        Return a token that changes whenever an entry is invalidated.
+
+        Read it before loading a value to cache, and pass it to set().
+        """
+
+        with self._lock:
+            return self._generation
+
+    def set(self, key, value, generation=None):
+        """
+        Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key.
+            value: Value to store.
+            generation (int): Token from generation() read before the
+                value was loaded. The value is discarded if an entry
+                was invalidated since, as it may predate that write.
+
+        Returns:
+            bool: Whether the value was stored.
+        """
+
+        expires_at = (
+            self.clock() + self.ttl
+            if self.ttl is not None
+            else None
+        )
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return True
+
+    def delete(self, key):
+        """
+        Remove an entry if present.
+        """
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generation += 1
+
+    def clear(self):
+        """
+        Remove every entry.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def stats(self):
+        """
+        Return hit, miss, and eviction counters.
+
+        Returns:
+            dict: Cache counters and current size.
+        """
+
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+
+class CachedRepository:
+    """
+    Wrap a SQLAlchemy repository with a read-through primary-key cache.
+
+    The cache stores column values only. A hit rebuilds a persistent
+    instance in the current session without a SELECT, and relationships
+    are loaded normally when accessed, so cached entries never hold
+    stale related objects. Writes made through the repository invalidate
+    the affected entry, again once the transaction commits, and a row
+    loaded while any entry was invalidated is not cached, since it may
+    predate that write.
+    """
+
+    def __init__(self, repository, cache=None):
+        """
+        Initialize the wrapper.
+
+        Args:
+            repository (SQLAlchemyRepository): Repository to wrap.
+            cache (LRUCache): Cache to use, or None to disable caching.
+        """
+
+        self.repository = repository
+        self.cache = cache
+
+    def __getattr__(self, name):
+        """
+        Delegate other repository operations to the wrapped repository.
+        """
+
+        return getattr(self.repository, name)
+
+    def _snapshot(self, obj):
+        """
+        Return the column values of an object.
+        """
+
+        return {
+            attribute.key: getattr(obj, attribute.key)
+            for attribute in inspect(self.model).column_attrs
+        }
+
+    def _restore(self, snapshot):
+        """
+        Attach an instance built from cached column values.
+        """
+
+        obj = inspect(self.model).class_manager.new_instance()
+
+        for key, value in snapshot.items():
+            set_committed_value(obj, key, value)
+
+        make_transient_to_detached(obj)
+        self.session.add(obj)
+
+        return obj
+
+    def _from_session_or_cache(self, obj_id):
+        """
+        Return an object already known to the session or the cache.
+        """
+
+        key = identity_key(self.model, obj_id)
+        obj = self.session.identity_map.get(key)
+
+        if obj is not None:
+            return obj
+
+        snapshot = self.cache.get(obj_id)
+
+        if snapshot is None:
+            return None
+
+        return self._restore(snapshot)
+
+    def get(self, obj_id, load=None):
+        """
+        Retrieve an object by primary key through the cache.
+
+        Requests with a load plan bypass the cache because they need
+        related rows from the database.
+        """
+
+        if self.cache is None or load:
+            return self.repository.get(obj_id, load=load)
+
+        obj = self._from_session_or_cache(obj_id)
+
+        if obj is not None:
+            return obj
+
+        generation = self.cache.generation()
+        obj = self.repository.get(obj_id)
+
+        if obj is not None:
+            self.cache.set(obj_id, self._snapshot(obj), generation)
+
+        return obj
+
+    def get_many(self, obj_ids, load=None):
+        """
+        Retrieve several objects, querying only the uncached IDs.
+
+        Returns:
+            tuple: Objects in input order and the IDs not found.
+        """
+
+        if self.cache is None or load:
+            return self.repository.get_many(obj_ids, load=load)
+
+        obj_ids = list(obj_ids)
+        by_id = {}
+
+        for obj_id in obj_ids:
+            obj = self._from_session_or_cache(obj_id)
+
+            if obj is not None:
+                by_id[obj_id] = obj
+
+        uncached = [
+            obj_id
+            for obj_id in obj_ids
+            if obj_id not in by_id
+        ]
+
+        generation = self.cache.generation()
+        fetched, _ = self.repository.get_many(uncached)
+
+        for obj in fetched:
+            by_id[obj.id] = obj
+            self.cache.set(obj.id, self._snapshot(obj), generation)
+
+        found = []
+        missing = []
+
+        for obj_id in obj_ids:
+            if obj_id in by_id:
+                found.append(by_id[obj_id])
+            else:
+                missing.append(obj_id)
+
+        return found, missing
+
+    def update(self, obj_id, data):
+        """
+        Update an object and invalidate its cache entry.
+
+        The entry is dropped before the write and again after the
+        commit, so a concurrent read cannot keep the old row cached.
+        """
+
+        self.invalidate(obj_id)
+
+        return self.repository.update(obj_id, data)
+
+    def delete(self, obj_id):
+        """
+        Delete an object and invalidate its cache entry.
+        """
+
+        self.invalidate(obj_id)
+
+        return self.repository.delete(obj_id)
+
+    def invalidate(self, obj_id):
+        """
+        Drop a cached entry now and after the current transaction.
+
+        Also used by the facade for changes made outside the repository.
+        """
+
+        if self.cache is None:
+            return
+
+        cache = self.cache
+
+        cache.delete(obj_id)
+        run_after_commit(
+            lambda: cache.delete(obj_id),
+            self.session
+        )
@@ -3,8 +3,55 @@
 Place-specific SQLAlchemy repository.
 """
 
-from app.models.place import Place
-from app.persistence.repository import SQLAlchemyRepository
+from sqlalchemy import (
+    and_,
+    case,
+    cast,
+    false,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    union_all,
+    update
+)
+from sqlalchemy import Integer
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm.util import identity_key
+
+from app.geo import (
+    GRID_SIZE_DEGREES,
+    GRID_SIZE_KM,
+    grid_col,
+    grid_row,
+    haversine_km,
+    radius_bbox,
+    split_bbox
+)
+from app.models.amenity import Amenity
+from app.models.base_model import utc_now
+from app.models.place import RATING_VALUES, Place
+from app.models.place_amenity import place_amenity
+from app.models.review import Review
+from app.models.user import User
+from app.persistence import place_search
+from app.persistence.repository import (
+    STREAM_BATCH_SIZE,
+    SQLAlchemyRepository,
+    decode_cursor_values,
+    encode_cursor_values
+)
+
+
+# Sort names mapped to keyset columns and whether they are descending.
+# Each ordering has a matching composite index on places.
+SORT_ORDERS = {
+    "newest": (("created_at", "id"), True),
+    "price": (("price", "id"), False),
+    "-price": (("price", "id"), True),
+    "rating": (("average_rating", "id"), True)
+}
 
 
 class PlaceRepository(SQLAlchemyRepository):
@@ -18,3 +65,768 @@ class PlaceRepository(SQLAlchemyRepository):
         """
 
         super().__init__(Place)
+
+    @staticmethod
+    def sort_keys(sort):
+        """
+        Return the keyset columns and direction of a sort name.
+
+        Args:
+            sort (str): Key of SORT_ORDERS, or None for creation order.
+
+        Returns:
+            tuple: Ordering columns or None, and whether descending.
+
+        Raises:
+            ValueError: If the sort name is unknown.
+        """
+
+        if sort is None:
+            return None, False
+
+        if sort not in SORT_ORDERS:
+            raise ValueError("Invalid sort")
+
+        names, descending = SORT_ORDERS[sort]
+
+        return tuple(getattr(Place, name) for name in names), descending
+
+    def apply_filters(self, statement, filters=None):
+        """
+        Restrict a place statement with search filters.
+
+        Args:
+            statement: Select statement over places.
+            filters (dict): Optional min_price, max_price, min_rating,
+                amenity_ids (places must have all of them), and
+                any_amenity_ids (places must have at least one).
+
+        Returns:
+            Select: Filtered statement.
+        """
+
+        if not filters:
+            return statement
+
+        if filters.get("min_price") is not None:
+            statement = statement.where(
+                Place.price >= filters["min_price"]
+            )
+
+        if filters.get("max_price") is not None:
+            statement = statement.where(
+                Place.price <= filters["max_price"]
+            )
+
+        if filters.get("min_rating") is not None:
+            statement = statement.where(
+                Place.average_rating >= filters["min_rating"]
+            )
+
+        if filters.get("amenity_ids"):
+            statement = statement.where(
+                self._all_amenities_criteria(filters["amenity_ids"])
+            )
+
+        if filters.get("any_amenity_ids"):
+            statement = statement.where(
+                self._any_amenity_criteria(filters["any_amenity_ids"])
+            )
+
+        return statement
+
+    def _amenity_bits(self, amenity_ids):
+        """
+        Return the bits of amenities by ID.
+        """
+
+        return dict(
+            self.session.execute(
+                select(Amenity.id, Amenity.bit).where(
+                    Amenity.id.in_(set(amenity_ids))
+                )
+            ).all()
+        )
+
+    def _all_amenities_criteria(self, amenity_ids):
+        """
+        Match places having every amenity.
+
+        Uses the amenity mask when every amenity has a bit, and the
+        place_amenity table otherwise.
+        """
+
+        amenity_ids = set(amenity_ids)
+        bits = self._amenity_bits(amenity_ids)
+
+        if len(bits) < len(amenity_ids):
+            return false()
+
+        if None not in bits.values():
+            mask = 0
+
+            for bit in bits.values():
+                mask |= 1 << bit
+
+            return Place.amenity_mask.op("&")(mask) == mask
+
+        return Place.id.in_(
+            select(
+                place_amenity.c.place_id
+            ).where(
+                place_amenity.c.amenity_id.in_(amenity_ids)
+            ).group_by(
+                place_amenity.c.place_id
+            ).having(
+                func.count() == len(amenity_ids)
+            )
+        )
+
+    def _any_amenity_criteria(self, amenity_ids):
+        """
+        Match places having at least one of the amenities.
+        """
+
+        bits = self._amenity_bits(amenity_ids)
+        mask = 0
+        without_bit = []
+
+        for amenity_id, bit in bits.items():
+            if bit is None:
+                without_bit.append(amenity_id)
+            else:
+                mask |= 1 << bit
+
+        criteria = []
+
+        if mask:
+            criteria.append(Place.amenity_mask.op("&")(mask) != 0)
+
+        if without_bit:
+            criteria.append(
+                Place.id.in_(
+                    select(place_amenity.c.place_id).where(
+                        place_amenity.c.amenity_id.in_(without_bit)
+                    )
+                )
+            )
+
+        if not criteria:
+            return false()
+
+        return or_(*criteria)
+
+    def get_page(
+        self,
+        limit,
+        cursor=None,
+        load=None,
+        filters=None,
+        sort=None
+    ):
+        """
+        Retrieve one page of places matching optional filters.
+
+        Args:
+            limit (int): Maximum number of places to return.
+            cursor (str): Cursor returned with the previous page.
+            load (dict): Optional load plan for related objects.
+            filters (dict): Optional filters, see apply_filters.
+            sort (str): Optional key of SORT_ORDERS.
+
+        Returns:
+            tuple: Places on the page and the next cursor, or None.
+
+        Raises:
+            ValueError: If the sort or cursor is invalid.
+        """
+
+        keys, descending = self.sort_keys(sort)
+
+        return self.paginate(
+            self.apply_filters(self.select(load), filters),
+            limit,
+            cursor,
+            keys=keys,
+            descending=descending
+        )
+
+    def adjust_ratings(self, place_id, added=None, removed=None):
+        """
+        Apply a review change to the rating aggregates of a place.
+
+        The aggregates are incremented in a single UPDATE so concurrent
+        review writes cannot overwrite each other's counts.
+
+        Args:
+            place_id (str): ID of the reviewed place.
+            added (int): Rating of a review created or updated to.
+            removed (int): Rating of a review deleted or updated from.
+        """
+
+        if added == removed:
+            return
+
+        count_delta = (added is not None) - (removed is not None)
+        sum_delta = (added or 0) - (removed or 0)
+
+        new_count = Place.review_count + count_delta
+        new_sum = Place.rating_sum + sum_delta
+
+        values = {
+            "updated_at": utc_now(),
+            "review_count": new_count,
+            "rating_sum": new_sum,
+            "average_rating": case(
+                (new_count > 0, new_sum * 1.0 / new_count),
+                else_=0.0
+            )
+        }
+
+        if added is not None:
+            column = f"rating_{added}"
+            values[column] = getattr(Place, column) + 1
+
+        if removed is not None:
+            column = f"rating_{removed}"
+            values[column] = getattr(Place, column) - 1
+
+        self.session.execute(
+            update(Place)
+            .where(Place.id == place_id)
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+
+        place = self.session.identity_map.get(
+            identity_key(Place, place_id)
+        )
+
+        if place is not None:
+            self.session.expire(
+                place,
+                ("updated_at", *Place.rating_fields())
+            )
+
+    def get_detail_version(self, place_id):
+        """
+        Return the latest update time of a place and everything its
+        detail view includes: owner, amenities, reviews, and authors.
+
+        Args:
+            place_id (str): ID of the place.
+
+        Returns:
+            tuple: Latest updated_at and number of rows, or None if the
+            place does not exist.
+        """
+
+        Owner = aliased(User)
+        Author = aliased(User)
+
+        rows = union_all(
+            select(
+                Place.updated_at.label("updated_at"),
+                literal(1).label("is_place")
+            ).where(Place.id == place_id),
+            select(Owner.updated_at, literal(0)).join(
+                Place,
+                Place.owner_id == Owner.id
+            ).where(Place.id == place_id),
+            select(Amenity.updated_at, literal(0)).join(
+                place_amenity,
+                place_amenity.c.amenity_id == Amenity.id
+            ).where(place_amenity.c.place_id == place_id),
+            select(Review.updated_at, literal(0)).where(
+                Review.place_id == place_id
+            ),
+            select(Author.updated_at, literal(0)).join(
+                Review,
+                Review.user_id == Author.id
+            ).where(Review.place_id == place_id)
+        ).subquery()
+
+        last_modified, count, found = self.session.execute(
+            select(
+                func.max(rows.c.updated_at),
+                func.count(),
+                func.sum(rows.c.is_place)
+            )
+        ).one()
+
+        if not found:
+            return None
+
+        return last_modified, count
+
+    def reconcile_ratings(self, place_ids=None):
+        """
+        Recompute the rating aggregates of places from their reviews.
+
+        Only places whose stored aggregates differ are updated.
+
+        Args:
+            place_ids (iterable): Places to check, or None for all.
+
+        Returns:
+            int: Number of places corrected.
+        """
+
+        def aggregate(expression, *criteria):
+            return (
+                select(expression)
+                .where(Review.place_id == Place.id, *criteria)
+                .scalar_subquery()
+            )
+
+        values = {
+            "review_count": aggregate(func.count(Review.id)),
+            "rating_sum": aggregate(
+                func.coalesce(func.sum(Review.rating), 0)
+            ),
+            "average_rating": aggregate(
+                func.coalesce(func.avg(Review.rating), 0.0)
+            )
+        }
+
+        for rating in RATING_VALUES:
+            values[f"rating_{rating}"] = aggregate(
+                func.count(Review.id),
+                Review.rating == rating
+            )
+
+        drifted = or_(*(
+            getattr(Place, column).is_distinct_from(expression)
+            for column, expression in values.items()
+        ))
+
+        if place_ids is not None:
+            drifted = and_(Place.id.in_(set(place_ids)), drifted)
+
+        result = self.session.execute(
+            update(Place)
+            .where(drifted)
+            .values(updated_at=utc_now(), **values)
+            .execution_options(synchronize_session=False)
+        )
+
+        self.session.expire_all()
+
+        return result.rowcount
+
+    @staticmethod
+    def _bbox_criteria(boxes):
+        """
+        Build a filter matching places inside any of the boxes.
+
+        The grid cell bounds select an index range; the coordinate
+        bounds then drop places in partially covered cells.
+        """
+
+        return or_(*(
+            and_(
+                Place.geo_row.between(
+                    grid_row(min_latitude),
+                    grid_row(max_latitude)
+                ),
+                Place.geo_col.between(
+                    grid_col(min_longitude),
+                    grid_col(max_longitude)
+                ),
+                Place.latitude.between(min_latitude, max_latitude),
+                Place.longitude.between(min_longitude, max_longitude)
+            )
+            for min_longitude, min_latitude, max_longitude, max_latitude
+            in boxes
+        ))
+
+    def get_page_in_bbox(
+        self,
+        bbox,
+        limit,
+        cursor=None,
+        load=None,
+        filters=None,
+        sort=None
+    ):
+        """
+        Retrieve one page of places inside a bounding box.
+
+        Args:
+            bbox (tuple): (min_lng, min_lat, max_lng, max_lat). A box with
+                min_lng greater than max_lng crosses the antimeridian.
+            limit (int): Maximum number of places to return.
+            cursor (str): Cursor returned with the previous page.
+            load (dict): Optional load plan for related objects.
+            filters (dict): Optional filters, see apply_filters.
+            sort (str): Optional key of SORT_ORDERS.
+
+        Returns:
+            tuple: Places on the page and the next cursor, or None.
+        """
+
+        keys, descending = self.sort_keys(sort)
+        statement = self.select(load).where(
+            self._bbox_criteria(split_bbox(*bbox))
+        )
+
+        return self.paginate(
+            self.apply_filters(statement, filters),
+            limit,
+            cursor,
+            keys=keys,
+            descending=descending
+        )
+
+    def bulk_link_amenities(self, links):
+        """
+        Insert place and amenity links with one executemany statement.
+
+        Args:
+            links (list): Dictionaries with place_id and amenity_id.
+
+        Returns:
+            int: Number of links inserted.
+        """
+
+        if links:
+            self.session.execute(insert(place_amenity), links)
+
+        return len(links)
+
+    def stream_places(
+        self,
+        load=None,
+        filters=None,
+        sort=None,
+        bbox=None,
+        batch_size=STREAM_BATCH_SIZE
+    ):
+        """
+        Iterate over every place matching optional filters in batches.
+
+        Args:
+            load (dict): Optional load plan for related objects.
+            filters (dict): Optional filters, see apply_filters.
+            sort (str): Optional key of SORT_ORDERS.
+            bbox (tuple): Optional bounding box, as for get_page_in_bbox.
+            batch_size (int): Number of places per batch.
+
+        Returns:
+            generator: Lists of places, in sort order.
+
+        Raises:
+            ValueError: If the sort is invalid.
+        """
+
+        keys, descending = self.sort_keys(sort)
+        statement = self.select(load)
+
+        if bbox is not None:
+            statement = statement.where(
+                self._bbox_criteria(split_bbox(*bbox))
+            )
+
+        return self.stream(
+            self.apply_filters(statement, filters),
+            keys=keys,
+            descending=descending,
+            batch_size=batch_size
+        )
+
+    def get_page_near(
+        self,
+        latitude,
+        longitude,
+        radius_km,
+        limit,
+        cursor=None,
+        load=None,
+        filters=None
+    ):
+        """
+        Retrieve one page of places within a radius, nearest first.
+
+        The search starts with a ring one grid cell wide beyond the
+        cursor's distance, and the ring doubles until it holds more
+        than a page of places or reaches the radius. Each pass reads
+        the grid cells covering the ring as (id, latitude, longitude)
+        rows and keeps those within the ring by exact haversine
+        distance, which are exactly the nearest ones not yet returned.
+        A page therefore reads the places around it rather than every
+        place in the radius, and only the places on it are loaded.
+
+        Args:
+            latitude (float): Latitude of the center.
+            longitude (float): Longitude of the center.
+            radius_km (float): Search radius in kilometers.
+            limit (int): Maximum number of places to return.
+            cursor (str): Cursor returned with the previous page.
+            load (dict): Optional load plan for related objects.
+            filters (dict): Optional filters, see apply_filters.
+
+        Returns:
+            tuple: (place, distance_km) pairs and the next cursor, or None.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+
+        after = None
+
+        if cursor:
+            after = decode_cursor_values(cursor, 2)
+
+            if not (
+                isinstance(after[0], (int, float))
+                and isinstance(after[1], str)
+            ):
+                raise ValueError("Invalid cursor")
+
+            after = tuple(after)
+
+        start = after[0] if after is not None else 0.0
+        width = GRID_SIZE_KM
+
+        while True:
+            covered = min(radius_km, start + width)
+            matches = self._near_candidates(
+                latitude,
+                longitude,
+                covered,
+                after,
+                filters
+            )
+
+            if len(matches) > limit or covered >= radius_km:
+                break
+
+            width *= 2
+
+        matches.sort()
+        page = matches[:limit]
+
+        next_cursor = None
+
+        if len(matches) > limit:
+            next_cursor = encode_cursor_values(list(page[-1]))
+
+        places, _ = self.get_many(
+            [place_id for _, place_id in page],
+            load=load
+        )
+        distances = {
+            place_id: distance
+            for distance, place_id in page
+        }
+
+        return [
+            (place, distances[place.id])
+            for place in places
+        ], next_cursor
+
+    def _near_candidates(
+        self,
+        latitude,
+        longitude,
+        radius_km,
+        after,
+        filters
+    ):
+        """
+        Return (distance, id) pairs of places within a radius.
+
+        Places at or before the cursor position ``after`` are skipped.
+        """
+
+        statement = self.apply_filters(
+            select(
+                Place.id,
+                Place.latitude,
+                Place.longitude
+            ).where(
+                self._bbox_criteria(
+                    radius_bbox(latitude, longitude, radius_km)
+                )
+            ),
+            filters
+        )
+
+        matches = []
+
+        for place_id, place_latitude, place_longitude in (
+            self.session.execute(statement)
+        ):
+            distance = haversine_km(
+                latitude,
+                longitude,
+                place_latitude,
+                place_longitude
+            )
+
+            if distance > radius_km:
+                continue
+
+            if after is not None and (distance, place_id) <= after:
+                continue
+
+            matches.append((distance, place_id))
+
+        return matches
+
+    def backfill_grid(self):
+        """
+        Compute the grid cell of places missing or holding a stale one.
+
+        Returns:
+            int: Number of places updated.
+        """
+
+        row = cast((Place.latitude + 90) / GRID_SIZE_DEGREES, Integer)
+        col = cast((Place.longitude + 180) / GRID_SIZE_DEGREES, Integer)
+
+        result = self.session.execute(
+            update(Place)
+            .where(
+                or_(
+                    Place.geo_row.is_distinct_from(row),
+                    Place.geo_col.is_distinct_from(col)
+                )
+            )
+            .values(geo_row=row, geo_col=col)
+            .execution_options(synchronize_session=False)
+        )
+
+        self.session.expire_all()
+
+        return result.rowcount
+
+    def search_page(self, query, limit, cursor=None, load=None):
+        """
+        Retrieve one page of places matching a full-text query.
+
+        Matches are ordered by bm25 rank, best first, then by ID, and
+        the cursor holds the (rank, id) of the last returned match.
+
+        Args:
+            query (str): FTS5 MATCH expression, see build_match_query.
+            limit (int): Maximum number of places to return.
+            cursor (str): Cursor returned with the previous page.
+            load (dict): Optional load plan for related objects.
+
+        Returns:
+            tuple: (place, highlights) pairs and the next cursor, or None.
+            Highlights hold the rank, title, and description snippet.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+
+        rank = place_search.rank_expression()
+        title, snippet = place_search.highlight_expressions()
+
+        statement = select(
+            Place.id,
+            rank,
+            title,
+            snippet
+        ).select_from(
+            place_search.fts
+        ).join(
+            Place,
+            place_search.places_rowid == place_search.fts.c.rowid
+        ).where(
+            place_search.fts_table.op("MATCH")(query)
+        )
+
+        if cursor:
+            after_rank, after_id = decode_cursor_values(cursor, 2)
+
+            if not (
+                isinstance(after_rank, (int, float))
+                and isinstance(after_id, str)
+            ):
+                raise ValueError("Invalid cursor")
+
+            statement = statement.where(
+                or_(
+                    rank > after_rank,
+                    and_(rank == after_rank, Place.id > after_id)
+                )
+            )
+
+        rows = self.session.execute(
+            statement.order_by(rank, Place.id).limit(limit + 1)
+        ).all()
+
+        next_cursor = None
+
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor_values(
+                [rows[-1][1], rows[-1][0]]
+            )
+
+        places, _ = self.get_many(
+            [row[0] for row in rows],
+            load=load
+        )
+        highlights = {
+            place_id: {
+                "rank": place_rank,
+                "title": place_search.render_highlight(place_title),
+                "description": place_search.render_highlight(
+                    place_snippet
+                )
+            }
+            for place_id, place_rank, place_title, place_snippet in rows
+        }
+
+        return [
+            (place, highlights[place.id])
+            for place in places
+        ], next_cursor
+
+    def rebuild_search_index(self):
+        """
+        Recreate the full-text index from the places table.
+        """
+
+        place_search.rebuild_place_search(self.session)
+
+    def rebuild_amenity_masks(self):
+        """
+        Recompute every place's amenity mask from place_amenity.
+
+        Bits are distinct, so their sum equals their bitwise OR.
+
+        Returns:
+            int: Number of places whose mask changed.
+        """
+
+        mask = (
+            select(
+                func.coalesce(
+                    func.sum(literal(1).op("<<")(Amenity.bit)),
+                    0
+                )
+            )
+            .select_from(place_amenity)
+            .join(Amenity, Amenity.id == place_amenity.c.amenity_id)
+            .where(
+                place_amenity.c.place_id == Place.id,
+                Amenity.bit.is_not(None)
+            )
+            .scalar_subquery()
+        )
+
+        result = self.session.execute(
+            update(Place)
+            .where(Place.amenity_mask != mask)
+            .values(amenity_mask=mask)
+            .execution_options(synchronize_session=False)
+        )
+
+        self.session.expire_all()
+
+        return result.rowcount
@@ -0,0 +1,190 @@
+#!/usr/bin/python3
+"""
+SQLite FTS5 full-text index over place titles and descriptions.
+
+The index is an external-content FTS5 table keyed by the rowid of
+``places``. Triggers keep it in sync with every insert, delete, and
+title or description update, in the same transaction as the write.
+"""
+
+import html
+import re
+
+from sqlalchemy import (
+    DDL,
+    column,
+    event,
+    func,
+    literal_column,
+    table,
+    text
+)
+
+from app.models.place import Place
+
+
+FTS_TABLE = "places_fts"
+
+# Relative weights of the title and description columns in bm25.
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+# Highlight markers, replaced by <mark> tags after HTML escaping.
+MARK_START = "\x02"
+MARK_END = "\x03"
+
+SNIPPET_TOKENS = 16
+
+SEARCH_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title,
+        description,
+        content='places',
+        content_rowid='rowid',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS places_fts_after_insert
+    AFTER INSERT ON places
+    BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, title, description)
+        VALUES (new.rowid, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS places_fts_after_delete
+    AFTER DELETE ON places
+    BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS places_fts_after_update
+    AFTER UPDATE OF title, description ON places
+    BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+        INSERT INTO {FTS_TABLE} (rowid, title, description)
+        VALUES (new.rowid, new.title, new.description);
+    END
+    """
+]
+
+fts = table(FTS_TABLE, column("rowid"))
+fts_table = literal_column(FTS_TABLE)
+places_rowid = literal_column("places.rowid")
+
+
+for statement in SEARCH_DDL:
+    event.listen(
+        Place.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite")
+    )
+
+event.listen(
+    Place.__table__,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect="sqlite")
+)
+
+
+def build_match_query(search_text):
+    """
+    Convert user input into a safe FTS5 query.
+
+    Every word is quoted so FTS5 operators in the input are treated as
+    text. All words must match; the last one also matches as a prefix
+    so partially typed words find results.
+
+    Args:
+        search_text (str): Search text entered by the user.
+
+    Returns:
+        str: FTS5 MATCH expression, or None if the text has no words.
+    """
+
+    words = re.findall(r"\w+", search_text)
+
+    if not words:
+        return None
+
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+
+    return " ".join(terms)
+
+
+def rank_expression():
+    """
+    Return the bm25 rank expression; lower values rank higher.
+    """
+
+    return func.bm25(fts_table, TITLE_WEIGHT, DESCRIPTION_WEIGHT)
+
+
+def highlight_expressions():
+    """
+    Return expressions for the highlighted title and description snippet.
+    """
+
+    return (
+        func.highlight(fts_table, 0, MARK_START, MARK_END),
+        func.snippet(
+            fts_table,
+            1,
+            MARK_START,
+            MARK_END,
+            "…",
+            SNIPPET_TOKENS
+        )
+    )
+
+
+def render_highlight(value):
+    """
+    Escape highlighted text and convert markers to <mark> tags.
+    """
+
+    if value is None:
+        return None
+
+    return html.escape(value).replace(
+        MARK_START,
+        "<mark>"
+    ).replace(
+        MARK_END,
+        "</mark>"
+    )
+
+
+def install_place_search(session):
+    """
+    Create the search table and triggers if they do not exist.
+
+    Args:
+        session: SQLAlchemy session.
+    """
+
+    for statement in SEARCH_DDL:
+        session.execute(text(statement))
+
+
+def rebuild_place_search(session):
+    """
+    Recreate the search index from the places table.
+
+    Needed for databases created before the index existed, and after a
+    VACUUM, which may renumber the rowids the index refers to.
+
+    Args:
+        session: SQLAlchemy session.
+    """
+
+    install_place_search(session)
+    session.execute(
+        text(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')")
+    )
@@ -4,12 +4,254 @@ Repository interfaces and persistence implementations.
 """
 
 from abc import ABC, abstractmethod
+import base64
+from datetime import datetime
+from decimal import Decimal
+import json
 
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import joinedload, load_only, selectinload
 
 from app.extensions import db
 
 
+LOAD_STRATEGIES = {
+    "joined": joinedload,
+    "selectin": selectinload
+}
+
+# Rows fetched per round trip when streaming a collection.
+STREAM_BATCH_SIZE = 500
+
+
+def build_load_options(model, load):
+    """
+    Convert a load plan into SQLAlchemy loader options.
+
+    A load plan maps relationship paths to a loading strategy, for
+    example ``{"reviews": "selectin", "reviews.user": "joined"}``.
+    Intermediate path segments without their own entry are loaded with
+    the selectin strategy. The optional ``columns`` entry restricts the
+    columns selected for the model itself; the primary key is always
+    selected.
+
+    Args:
+        model: SQLAlchemy model class the plan starts from.
+        load (dict): Relationship paths mapped to strategy names.
+
+    Returns:
+        list: Loader options for a select statement.
+
+    Raises:
+        ValueError: If a path or strategy is unknown.
+    """
+
+    options = []
+
+    for path, strategy in load.items():
+        if path == "columns":
+            options.append(load_only_columns(model, strategy))
+            continue
+
+        option = None
+        current_model = model
+        segments = path.split(".")
+
+        for index, segment in enumerate(segments):
+            attribute = getattr(current_model, segment, None)
+            prefix = ".".join(segments[:index + 1])
+            loader_name = load.get(prefix, "selectin")
+
+            if (
+                attribute is None
+                or not hasattr(attribute.property, "mapper")
+                or loader_name not in LOAD_STRATEGIES
+            ):
+                raise ValueError(
+                    f"Invalid load plan entry: {path}={strategy}"
+                )
+
+            if option is None:
+                option = LOAD_STRATEGIES[loader_name](attribute)
+            else:
+                option = getattr(option, f"{loader_name}load")(
+                    attribute
+                )
+
+            current_model = attribute.property.mapper.class_
+
+        options.append(option)
+
+    return options
+
+
+def load_only_columns(model, names):
+    """
+    Return a loader option selecting only some columns of a model.
+
+    Args:
+        model: SQLAlchemy model class.
+        names (iterable): Column attribute names.
+
+    Returns:
+        Load: load_only option.
+
+    Raises:
+        ValueError: If a name is not a column of the model.
+    """
+
+    columns = db.inspect(model).column_attrs
+    attributes = []
+
+    for name in names:
+        if name not in columns:
+            raise ValueError(f"Invalid load plan column: {name}")
+
+        attributes.append(getattr(model, name))
+
+    return load_only(*attributes)
+
+
+def encode_cursor(obj, keys):
+    """
+    Encode the ordering key values of an object as an opaque cursor.
+
+    Args:
+        obj: Last object of the current page.
+        keys (tuple): Model columns used to order the page.
+
+    Returns:
+        str: URL-safe cursor string.
+    """
+
+    return encode_cursor_values([
+        getattr(obj, key.key)
+        for key in keys
+    ])
+
+
+def encode_cursor_values(values):
+    """
+    Encode a list of ordering values as an opaque cursor.
+
+    Args:
+        values (list): JSON-serializable values; datetimes are allowed.
+
+    Returns:
+        str: URL-safe cursor string.
+    """
+
+    values = [
+        value.isoformat()
+        if isinstance(value, datetime)
+        else value
+        for value in values
+    ]
+
+    payload = json.dumps(values, separators=(",", ":"))
+
+    return base64.urlsafe_b64encode(
+        payload.encode("utf-8")
+    ).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, keys):
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): Cursor received from a client.
+        keys (tuple): Model columns used to order the page.
+
+    Returns:
+        list: Ordering key values typed for the given columns.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+
+    values = decode_cursor_values(cursor, len(keys))
+
+    return [
+        decode_cursor_value(key, value)
+        for key, value in zip(keys, values)
+    ]
+
+
+def decode_cursor_value(key, value):
+    """
+    Check one decoded cursor value against the type of its column.
+
+    Args:
+        key: Model column the value orders.
+        value: Value decoded from JSON.
+
+    Returns:
+        Value converted to the column's Python type.
+
+    Raises:
+        ValueError: If the value does not fit the column.
+    """
+
+    if value is None:
+        return None
+
+    try:
+        python_type = key.type.python_type
+    except NotImplementedError:
+        python_type = None
+
+    if python_type is datetime:
+        try:
+            return datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor") from None
+
+    if python_type in (int, float, Decimal):
+        valid = (
+            isinstance(value, (int, float))
+            and not isinstance(value, bool)
+        )
+    elif python_type is str:
+        valid = isinstance(value, str)
+    else:
+        valid = not isinstance(value, (dict, list))
+
+    if not valid:
+        raise ValueError("Invalid cursor")
+
+    return value
+
+
+def decode_cursor_values(cursor, length):
+    """
+    Decode the raw values of a cursor produced by encode_cursor_values.
+
+    Args:
+        cursor (str): Cursor received from a client.
+        length (int): Expected number of values.
+
+    Returns:
+        list: Decoded JSON values.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        payload = base64.urlsafe_b64decode(
+            (cursor + padding).encode("ascii")
+        )
+        values = json.loads(payload.decode("utf-8"))
+    except (TypeError, ValueError, UnicodeError) as error:
+        raise ValueError("Invalid cursor") from error
+
+    if not isinstance(values, list) or len(values) != length:
+        raise ValueError("Invalid cursor")
+
+    return values
+
+
 class Repository(ABC):
     """
     Define the common repository interface.
@@ -27,6 +269,15 @@ class Repository(ABC):
         Retrieve an object by ID.
         """
 
+    @abstractmethod
+    def get_many(self, obj_ids):
+        """
+        Retrieve several objects by ID in one operation.
+
+        Returns:
+            tuple: Objects in input order and the IDs not found.
+        """
+
     @abstractmethod
     def get_all(self):
         """
@@ -55,21 +306,100 @@ class Repository(ABC):
 class InMemoryRepository(Repository):
     """
     Store and manage objects in memory.
+
+    Attributes declared as unique or indexed are kept in hash indexes,
+    so get_by_attribute() on them does not scan every object. The
+    indexes follow add(), update(), and delete(); an indexed attribute
+    changed on an object directly must be followed by reindex().
     """
 
-    def __init__(self):
+    def __init__(self, unique=(), indexed=()):
         """
         Initialize empty in-memory storage.
+
+        Args:
+            unique (iterable): Attributes identifying at most one object.
+            indexed (iterable): Attributes shared by any number of
+                objects.
         """
 
         self._storage = {}
+        self._unique = {name: {} for name in unique}
+        self._indexes = {name: {} for name in indexed}
+        self._indexed_values = {}
+
+    def _read_indexed(self, obj):
+        """
+        Return the current values of an object's indexed attributes.
+        """
+
+        return {
+            name: getattr(obj, name, None)
+            for name in (*self._unique, *self._indexes)
+        }
+
+    def _check_unique(self, obj, values):
+        """
+        Raise ValueError if another object holds a unique value.
+        """
+
+        for name, index in self._unique.items():
+            holder = index.get(values[name])
+
+            if holder is not None and holder is not obj:
+                raise ValueError(f"{name} already exists")
+
+    def _unindex(self, obj_id, values):
+        """
+        Remove an object from the indexes.
+        """
+
+        for name, value in values.items():
+            if value is None:
+                continue
+
+            if name in self._unique:
+                del self._unique[name][value]
+                continue
+
+            bucket = self._indexes[name][value]
+            del bucket[obj_id]
+
+            if not bucket:
+                del self._indexes[name][value]
+
+    def _index(self, obj, values):
+        """
+        Add an object to the indexes.
+        """
+
+        for name, value in values.items():
+            if value is None:
+                continue
+
+            if name in self._unique:
+                self._unique[name][value] = obj
+            else:
+                self._indexes[name].setdefault(value, {})[obj.id] = obj
+
+        self._indexed_values[obj.id] = values
 
     def add(self, obj):
         """
         Add an object to memory.
+
+        Raises:
+            ValueError: If a unique attribute value is already taken.
         """
 
+        values = self._read_indexed(obj)
+        self._check_unique(obj, values)
+
+        if obj.id in self._storage:
+            self._unindex(obj.id, self._indexed_values.pop(obj.id))
+
         self._storage[obj.id] = obj
+        self._index(obj, values)
 
         return obj
 
@@ -80,6 +410,27 @@ class InMemoryRepository(Repository):
 
         return self._storage.get(obj_id)
 
+    def get_many(self, obj_ids):
+        """
+        Retrieve several objects by ID.
+
+        Returns:
+            tuple: Objects in input order and the IDs not found.
+        """
+
+        found = []
+        missing = []
+
+        for obj_id in obj_ids:
+            obj = self._storage.get(obj_id)
+
+            if obj is None:
+                missing.append(obj_id)
+            else:
+                found.append(obj)
+
+        return found, missing
+
     def get_all(self):
         """
         Retrieve all stored objects.
@@ -90,6 +441,10 @@ class InMemoryRepository(Repository):
     def update(self, obj_id, data):
         """
         Update an object in memory.
+
+        Raises:
+            ValueError: If the update takes a unique value held by
+                another object. The object is left unchanged.
         """
 
         obj = self.get(obj_id)
@@ -97,10 +452,40 @@ class InMemoryRepository(Repository):
         if not obj:
             return None
 
+        previous = {
+            attribute.key: getattr(obj, attribute.key)
+            for attribute in db.inspect(obj).mapper.column_attrs
+        }
         obj.update(data)
 
+        try:
+            self.reindex(obj)
+        except ValueError:
+            for name, value in previous.items():
+                setattr(obj, name, value)
+
+            raise
+
         return obj
 
+    def reindex(self, obj):
+        """
+        Refresh the index entries of a stored object.
+
+        Raises:
+            ValueError: If a unique attribute value is already taken.
+        """
+
+        values = self._read_indexed(obj)
+        previous = self._indexed_values[obj.id]
+
+        if values == previous:
+            return
+
+        self._check_unique(obj, values)
+        self._unindex(obj.id, previous)
+        self._index(obj, values)
+
     def delete(self, obj_id):
         """
         Delete an object from memory.
@@ -110,14 +495,35 @@ class InMemoryRepository(Repository):
             return False
 
         del self._storage[obj_id]
+        self._unindex(obj_id, self._indexed_values.pop(obj_id))
 
         return True
 
+    def clear(self):
+        """
+        Remove every object and index entry.
+        """
+
+        self._storage.clear()
+        self._indexed_values.clear()
+
+        for index in (*self._unique.values(), *self._indexes.values()):
+            index.clear()
+
     def get_by_attribute(self, attr_name, attr_value):
         """
         Retrieve the first object matching an attribute.
         """
 
+        if attr_value is not None:
+            if attr_name in self._unique:
+                return self._unique[attr_name].get(attr_value)
+
+            if attr_name in self._indexes:
+                bucket = self._indexes[attr_name].get(attr_value, {})
+
+                return next(iter(bucket.values()), None)
+
         return next(
             (
                 obj
@@ -127,65 +533,321 @@ class InMemoryRepository(Repository):
             None
         )
 
+    def get_all_by_attribute(self, attr_name, attr_value):
+        """
+        Retrieve every object matching an attribute.
+        """
+
+        if attr_value is not None:
+            if attr_name in self._unique:
+                obj = self._unique[attr_name].get(attr_value)
+
+                return [obj] if obj is not None else []
+
+            if attr_name in self._indexes:
+                return list(
+                    self._indexes[attr_name].get(attr_value, {}).values()
+                )
+
+        return [
+            obj
+            for obj in self._storage.values()
+            if getattr(obj, attr_name, None) == attr_value
+        ]
+
 
 class SQLAlchemyRepository(Repository):
     """
     Generic repository backed by SQLAlchemy.
+
+    Write operations only flush their changes. Committing is left to the
+    enclosing UnitOfWork so that one facade operation is one
+    transaction.
     """
 
-    def __init__(self, model):
+    def __init__(self, model, session=None):
         """
         Initialize the repository.
 
         Args:
             model: SQLAlchemy model class managed by the repository.
+            session: SQLAlchemy session, or None for the request session.
         """
 
         self.model = model
+        self._session = session
+
+    @property
+    def session(self):
+        """
+        Return the session used by the repository.
+        """
+
+        if self._session is not None:
+            return self._session
+
+        return db.session()
 
     def add(self, obj):
         """
-        Add and persist an object.
+        Add an object and flush it to the database.
 
         Raises:
             SQLAlchemyError: If the database operation fails.
         """
 
-        try:
-            db.session.add(obj)
-            db.session.commit()
+        self.session.add(obj)
+        self.session.flush()
 
-            return obj
-        except SQLAlchemyError:
-            db.session.rollback()
-            raise
+        return obj
 
-    def get(self, obj_id):
+    def get(self, obj_id, load=None):
         """
         Retrieve an object by primary key.
+
+        Args:
+            obj_id (str): Primary key of the object.
+            load (dict): Optional load plan for related objects.
+        """
+
+        if not load:
+            return self.session.get(
+                self.model,
+                obj_id
+            )
+
+        statement = self.select(load).filter_by(id=obj_id)
+
+        return self.session.execute(
+            statement
+        ).unique().scalar_one_or_none()
+
+    def get_many(self, obj_ids, load=None):
+        """
+        Retrieve several objects with a single IN query.
+
+        Args:
+            obj_ids (list): Primary keys to retrieve.
+            load (dict): Optional load plan for related objects.
+
+        Returns:
+            tuple: Objects in input order and the IDs not found.
         """
 
-        return db.session.get(
-            self.model,
-            obj_id
+        obj_ids = list(obj_ids)
+
+        if not obj_ids:
+            return [], []
+
+        statement = self.select(load).where(
+            self.model.id.in_(set(obj_ids))
         )
 
-    def get_all(self):
+        by_id = {
+            obj.id: obj
+            for obj in self.session.execute(
+                statement
+            ).unique().scalars()
+        }
+
+        found = []
+        missing = []
+
+        for obj_id in obj_ids:
+            obj = by_id.get(obj_id)
+
+            if obj is None:
+                missing.append(obj_id)
+            else:
+                found.append(obj)
+
+        return found, missing
+
+    def get_all(self, load=None):
         """
         Retrieve all objects.
+
+        Args:
+            load (dict): Optional load plan for related objects.
         """
 
-        statement = db.select(self.model)
+        statement = self.select(load)
 
         return list(
-            db.session.execute(
+            self.session.execute(
                 statement
-            ).scalars().all()
+            ).unique().scalars().all()
         )
 
+    def select(self, load=None):
+        """
+        Build a select statement for the model.
+
+        Args:
+            load (dict): Optional load plan for related objects.
+
+        Returns:
+            Select: Statement with the load plan applied.
+        """
+
+        statement = db.select(self.model)
+
+        if load:
+            statement = statement.options(
+                *build_load_options(self.model, load)
+            )
+
+        return statement
+
+    def get_page(self, limit, cursor=None, load=None):
+        """
+        Retrieve one page of objects ordered by creation time.
+
+        Args:
+            limit (int): Maximum number of objects to return.
+            cursor (str): Cursor returned with the previous page.
+            load (dict): Optional load plan for related objects.
+
+        Returns:
+            tuple: Objects on the page and the next cursor, or None.
+        """
+
+        return self.paginate(
+            self.select(load),
+            limit,
+            cursor
+        )
+
+    def paginate(
+        self,
+        statement,
+        limit,
+        cursor=None,
+        keys=None,
+        descending=False
+    ):
+        """
+        Apply keyset pagination to a select statement.
+
+        Rows are ordered by the key columns and the next page starts
+        strictly after the last returned key, so every page costs the
+        same index range scan regardless of its position.
+
+        Args:
+            statement: Select statement for the model.
+            limit (int): Maximum number of objects to return.
+            cursor (str): Cursor returned with the previous page.
+            keys (tuple): Ordering columns, ending with a unique column.
+            descending (bool): Whether to walk the keys in reverse.
+
+        Returns:
+            tuple: Objects on the page and the next cursor, or None.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+
+        if keys is None:
+            keys = (
+                self.model.created_at,
+                self.model.id
+            )
+
+        if cursor:
+            values = decode_cursor(cursor, keys)
+            position = db.tuple_(
+                *[
+                    db.literal(value, key.type)
+                    for key, value in zip(keys, values)
+                ]
+            )
+
+            if descending:
+                statement = statement.where(
+                    db.tuple_(*keys) < position
+                )
+            else:
+                statement = statement.where(
+                    db.tuple_(*keys) > position
+                )
+
+        statement = statement.order_by(
+            *self._ordering(keys, descending)
+        ).limit(limit + 1)
+
+        items = list(
+            self.session.execute(
+                statement
+            ).unique().scalars().all()
+        )
+
+        next_cursor = None
+
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor(items[-1], keys)
+
+        return items, next_cursor
+
+    def stream(
+        self,
+        statement,
+        keys=None,
+        descending=False,
+        batch_size=STREAM_BATCH_SIZE
+    ):
+        """
+        Iterate over every object of a select statement in batches.
+
+        Rows are fetched ``batch_size`` at a time with ``yield_per``,
+        so the collection is never held in memory at once. The session
+        keeps loaded objects only weakly, and a batch is released once
+        the caller moves on to the next one.
+
+        Collections must not be loaded with the joined strategy, which
+        cannot be combined with ``yield_per``.
+
+        Args:
+            statement: Select statement for the model.
+            keys (tuple): Ordering columns, as for paginate.
+            descending (bool): Whether to walk the keys in reverse.
+            batch_size (int): Number of rows per batch.
+
+        Yields:
+            list: Objects of one batch.
+        """
+
+        if keys is None:
+            keys = (
+                self.model.created_at,
+                self.model.id
+            )
+
+        statement = statement.order_by(
+            *self._ordering(keys, descending)
+        ).execution_options(yield_per=batch_size)
+        result = self.session.scalars(statement)
+
+        try:
+            for batch in result.partitions():
+                yield batch
+        finally:
+            result.close()
+
+    @staticmethod
+    def _ordering(keys, descending):
+        """
+        Return the ORDER BY clauses of a keyset.
+        """
+
+        return [
+            key.desc() if descending else key.asc()
+            for key in keys
+        ]
+
     def update(self, obj_id, data):
         """
-        Update and persist an existing object.
+        Update an existing object and flush the change.
 
         Raises:
             SQLAlchemyError: If the database operation fails.
@@ -196,18 +858,14 @@ class SQLAlchemyRepository(Repository):
         if not obj:
             return None
 
-        try:
-            obj.update(data)
-            db.session.commit()
+        obj.update(data)
+        self.session.flush()
 
-            return obj
-        except SQLAlchemyError:
-            db.session.rollback()
-            raise
+        return obj
 
     def delete(self, obj_id):
         """
-        Delete an object from the database.
+        Delete an object and flush the change.
 
         Raises:
             SQLAlchemyError: If the database operation fails.
@@ -218,14 +876,37 @@ class SQLAlchemyRepository(Repository):
         if not obj:
             return False
 
-        try:
-            db.session.delete(obj)
-            db.session.commit()
+        self.session.delete(obj)
+        self.session.flush()
 
-            return True
-        except SQLAlchemyError:
-            db.session.rollback()
-            raise
+        return True
+
+    def get_version(self, *criteria):
+        """
+        Return the latest update time and row count of the model.
+
+        Together they change whenever a matching row is created,
+        updated, or deleted, and serve as conditional GET validators.
+
+        Args:
+            *criteria: Optional filter expressions.
+
+        Returns:
+            tuple: Latest updated_at or None, and number of rows.
+        """
+
+        last_modified, count = self.session.execute(
+            db.select(
+                db.func.max(self.model.updated_at),
+                db.func.count()
+            ).select_from(
+                self.model
+            ).where(
+                *criteria
+            )
+        ).one()
+
+        return last_modified, count
 
     def get_by_attribute(self, attr_name, attr_value):
         """
@@ -243,6 +924,53 @@ class SQLAlchemyRepository(Repository):
             }
         )
 
-        return db.session.execute(
+        return self.session.execute(
             statement
         ).scalar_one_or_none()
+
+    def lookup(self, attr_name, values, column="id"):
+        """
+        Map attribute values to a column of the objects holding them.
+
+        Used to resolve references of many rows with a single query.
+
+        Args:
+            attr_name (str): Column to match, such as ``email``.
+            values (iterable): Values to look up.
+            column (str): Column to return for each match.
+
+        Returns:
+            dict: Found values mapped to the column value.
+        """
+
+        values = set(values)
+
+        if not values:
+            return {}
+
+        key = getattr(self.model, attr_name)
+        statement = db.select(
+            key,
+            getattr(self.model, column)
+        ).where(key.in_(values))
+
+        return dict(self.session.execute(statement).all())
+
+    def bulk_insert(self, rows):
+        """
+        Insert column dictionaries with a single executemany statement.
+
+        Column defaults, such as the ID and timestamps, are applied to
+        each row. No objects are added to the session.
+
+        Args:
+            rows (list): Column values of each row.
+
+        Returns:
+            int: Number of rows inserted.
+        """
+
+        if rows:
+            self.session.execute(db.insert(self.model), rows)
+
+        return len(rows)
@@ -5,6 +5,7 @@ Review-specific SQLAlchemy repository.
 
 from app.extensions import db
 from app.models.review import Review
+from app.models.user import User
 from app.persistence.repository import SQLAlchemyRepository
 
 
@@ -20,6 +21,43 @@ class ReviewRepository(SQLAlchemyRepository):
 
         super().__init__(Review)
 
+    def get_version(self, *criteria):
+        """
+        Return the latest update time of reviews and their authors.
+
+        Review responses include author names, so an author update
+        changes the version too.
+
+        Args:
+            *criteria: Optional filter expressions on reviews.
+
+        Returns:
+            tuple: Latest updated_at or None, and number of reviews.
+        """
+
+        rows = db.union_all(
+            db.select(
+                Review.updated_at.label("updated_at"),
+                db.literal(1).label("counted")
+            ).where(*criteria),
+            db.select(
+                User.updated_at,
+                db.literal(0)
+            ).join(
+                Review,
+                Review.user_id == User.id
+            ).where(*criteria)
+        ).subquery()
+
+        last_modified, count = self.session.execute(
+            db.select(
+                db.func.max(rows.c.updated_at),
+                db.func.coalesce(db.func.sum(rows.c.counted), 0)
+            )
+        ).one()
+
+        return last_modified, count
+
     def get_reviews_by_place(self, place_id):
         """
         Retrieve all reviews associated with a place.
@@ -38,11 +76,41 @@ class ReviewRepository(SQLAlchemyRepository):
         )
 
         return list(
-            db.session.execute(
+            self.session.execute(
                 statement
             ).scalars().all()
         )
 
+    def get_reviews_by_place_page(
+        self,
+        place_id,
+        limit,
+        cursor=None,
+        load=None
+    ):
+        """
+        Retrieve one page of reviews for a place, newest first.
+
+        Args:
+            place_id (str): ID of the place.
+            limit (int): Maximum number of reviews to return.
+            cursor (str): Cursor returned with the previous page.
+            load (dict): Optional load plan for related objects.
+
+        Returns:
+            tuple: Reviews on the page and the next cursor, or None.
+        """
+
+        statement = self.select(load).filter_by(place_id=place_id)
+
+        return self.paginate(
+            statement,
+            limit,
+            cursor,
+            keys=(Review.created_at, Review.id),
+            descending=True
+        )
+
     def get_review_by_user_and_place(
         self,
         user_id,
@@ -67,6 +135,35 @@ class ReviewRepository(SQLAlchemyRepository):
             )
         )
 
-        return db.session.execute(
+        return self.session.execute(
             statement
         ).scalars().first()
+
+    def get_reviewed_pairs(self, pairs):
+        """
+        Return which (user, place) pairs already have a review.
+
+        Args:
+            pairs (iterable): (user_id, place_id) tuples.
+
+        Returns:
+            set: Pairs with an existing review.
+        """
+
+        pairs = set(pairs)
+
+        if not pairs:
+            return set()
+
+        statement = db.select(
+            Review.user_id,
+            Review.place_id
+        ).where(
+            Review.user_id.in_({user_id for user_id, _ in pairs}),
+            Review.place_id.in_({place_id for _, place_id in pairs})
+        )
+
+        return pairs.intersection(
+            tuple(row)
+            for row in self.session.execute(statement)
+        )
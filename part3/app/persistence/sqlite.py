@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+"""
+SQLite connection tuning.
+"""
+
+from functools import partial
+
+from sqlalchemy import event
+
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas):
+    """
+    Apply PRAGMA settings to a new SQLite connection.
+
+    Args:
+        dbapi_connection: Raw sqlite3 connection.
+        pragmas (dict): PRAGMA names mapped to values.
+    """
+
+    cursor = dbapi_connection.cursor()
+
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def _on_connect(dbapi_connection, connection_record, pragmas):
+    """
+    Engine connect listener applying the configured pragmas.
+    """
+
+    apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+
+def configure_sqlite(app):
+    """
+    Apply SQLITE_PRAGMAS to every connection of the application's
+    SQLite engines.
+
+    Flask-SQLAlchemy must be initialized on the application first.
+
+    Args:
+        app (Flask): Application to configure.
+    """
+
+    pragmas = app.config.get("SQLITE_PRAGMAS")
+
+    if not pragmas:
+        return
+
+    db = app.extensions["sqlalchemy"]
+
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name != "sqlite":
+                continue
+
+            event.listen(
+                engine,
+                "connect",
+                partial(_on_connect, pragmas=dict(pragmas))
+            )
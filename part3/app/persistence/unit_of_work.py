@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+"""
+Unit of work for grouping repository writes into one transaction.
+"""
+
+from flask import current_app, has_app_context
+
+from app.extensions import db
+
+
+DEPTH_KEY = "unit_of_work_depth"
+CALLBACKS_KEY = "unit_of_work_after_commit"
+
+
+class UnitOfWork:
+    """
+    Run a block of repository operations as a single transaction.
+
+    Repositories only flush their changes. The outermost unit of work
+    commits once when the block succeeds and rolls back when it raises.
+    Nested units of work join the enclosing transaction.
+
+    The SQLALCHEMY_EXPIRE_ON_COMMIT setting controls whether committed
+    objects are expired. When it is False, the objects just written are
+    serialized from memory instead of being reloaded.
+    """
+
+    def __init__(self, session=None):
+        """
+        Initialize the unit of work.
+
+        Args:
+            session: SQLAlchemy session, or None for the request session.
+        """
+
+        self.session = session if session is not None else db.session()
+
+    def __enter__(self):
+        """
+        Start or join a transaction.
+
+        Returns:
+            UnitOfWork: The active unit of work.
+        """
+
+        self._depth = self.session.info.get(DEPTH_KEY, 0)
+        self.session.info[DEPTH_KEY] = self._depth + 1
+
+        if self._depth == 0:
+            self.session.info[CALLBACKS_KEY] = []
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Commit or roll back the outermost transaction.
+        """
+
+        self.session.info[DEPTH_KEY] = self._depth
+
+        if self._depth > 0:
+            return False
+
+        callbacks = self.session.info.pop(CALLBACKS_KEY, [])
+
+        if exc_type is not None:
+            self.session.rollback()
+            return False
+
+        if has_app_context():
+            self.session.expire_on_commit = current_app.config.get(
+                "SQLALCHEMY_EXPIRE_ON_COMMIT",
+                True
+            )
+
+        try:
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+        for callback in callbacks:
+            callback()
+
+        return False
+
+
+def run_after_commit(callback, session=None):
+    """
+    Run a callback once the current unit of work commits.
+
+    Outside a unit of work the callback runs immediately. Callbacks of a
+    rolled-back unit of work are discarded.
+
+    Args:
+        callback (callable): Function taking no arguments.
+        session: SQLAlchemy session, or None for the request session.
+    """
+
+    session = session if session is not None else db.session()
+
+    if session.info.get(DEPTH_KEY, 0) > 0:
+        session.info[CALLBACKS_KEY].append(callback)
+    else:
+        callback()
@@ -0,0 +1,694 @@
+#!/usr/bin/python3
+"""
+HTTP response cache for hot collection endpoints.
+
+Successful GET responses are stored as encoded JSON bodies keyed by the
+request path and normalized query string. Each entry carries tags such
+as ``places`` or ``place:<id>``; the facade invalidates tags after its
+writes commit. Entries also expire after a TTL, and the least recently
+used entries are evicted once the cache exceeds its byte budget.
+
+Two backends are available: an in-process backend, and a SQLite backend
+whose file can be shared by several workers on one host.
+"""
+
+from collections import OrderedDict
+from functools import wraps
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode
+
+from flask import Response, current_app, has_app_context, request
+
+from app.encoding import dumps
+
+
+# Invalidations older than this many seconds can no longer race with a
+# response being rendered and are forgotten.
+INVALIDATION_WINDOW = 300
+
+
+class MemoryResponseBackend:
+    """
+    In-process response cache backend.
+
+    Entries are only visible to the worker that stored them, so writes
+    made through another worker are seen once the entry expires.
+    """
+
+    def __init__(self, max_bytes, clock=time.monotonic):
+        """
+        Initialize the backend.
+
+        Args:
+            max_bytes (int): Maximum total size of cached bodies.
+            clock (callable): Monotonic time source.
+        """
+
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._tags = {}
+        self._invalidated = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Return the cached body and headers, or None on a miss.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            body, headers, tags, expires_at = entry
+
+            if expires_at is not None and expires_at <= self.clock():
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return body, headers
+
+    def set(self, key, body, headers, tags, ttl=None, started=None):
+        """
+        Store a response.
+
+        Args:
+            key (str): Cache key.
+            body (bytes): Encoded response body.
+            headers (dict): Response headers.
+            tags (iterable): Invalidation tags of the entry.
+            ttl (float): Seconds the entry stays valid, or None.
+            started (float): Clock value read before the response was
+                rendered. The entry is discarded if one of its tags was
+                invalidated since, as it may hold data from before
+                that write.
+
+        Returns:
+            bool: Whether the entry was stored.
+        """
+
+        tags = frozenset(tags)
+        size = len(body)
+
+        if size > self.max_bytes:
+            return False
+
+        now = self.clock()
+        expires_at = now + ttl if ttl is not None else None
+
+        with self._lock:
+            if started is not None and any(
+                self._invalidated.get(tag, float("-inf")) >= started
+                for tag in tags
+            ):
+                return False
+
+            self._remove(key)
+            self._entries[key] = (body, dict(headers), tags, expires_at)
+            self._size += size
+
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+        return True
+
+    def invalidate(self, tags):
+        """
+        Remove every entry carrying one of the tags.
+        """
+
+        now = self.clock()
+
+        with self._lock:
+            for tag in tags:
+                self._invalidated[tag] = now
+
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+
+            horizon = now - INVALIDATION_WINDOW
+            self._invalidated = {
+                tag: invalidated_at
+                for tag, invalidated_at in self._invalidated.items()
+                if invalidated_at >= horizon
+            }
+
+    def clear(self):
+        """
+        Remove every entry.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._size = 0
+
+    def stats(self):
+        """
+        Return hit, miss, and eviction counters.
+
+        Returns:
+            dict: Cache counters and current size.
+        """
+
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+    def _remove(self, key):
+        """
+        Remove an entry and its tag references; the lock must be held.
+        """
+
+        entry = self._entries.pop(key, None)
+
+        if entry is None:
+            return
+
+        body, _, tags, _ = entry
+        self._size -= len(body)
+
+        for tag in tags:
+            keys = self._tags.get(tag)
+
+            if keys is None:
+                continue
+
+            keys.discard(key)
+
+            if not keys:
+                del self._tags[tag]
+
+
+class SQLiteResponseBackend:
+    """
+    Response cache backend stored in a SQLite file.
+
+    Workers sharing the file share entries and invalidations. Each
+    thread uses its own connection; WAL lets lookups proceed while
+    another worker stores an entry.
+    """
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS response_entries (
+            key TEXT PRIMARY KEY,
+            body BLOB NOT NULL,
+            headers TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            expires_at REAL,
+            accessed_at REAL NOT NULL
+        )
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS ix_response_entries_accessed_at
+        ON response_entries(accessed_at)
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS response_tags (
+            tag TEXT NOT NULL,
+            key TEXT NOT NULL,
+            PRIMARY KEY (tag, key)
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS ix_response_tags_key
+        ON response_tags(key)
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS response_invalidations (
+            tag TEXT PRIMARY KEY,
+            invalidated_at REAL NOT NULL
+        ) WITHOUT ROWID
+        """
+    )
+
+    # Hits refresh the recency of an entry at most this often, so
+    # lookups rarely need the write lock.
+    TOUCH_INTERVAL = 1.0
+
+    def __init__(self, path, max_bytes, clock=time.time, timeout=5.0):
+        """
+        Initialize the backend and create its tables.
+
+        Args:
+            path (str): Path of the SQLite file.
+            max_bytes (int): Maximum total size of cached bodies.
+            clock (callable): Wall-clock time source shared by workers.
+            timeout (float): Seconds to wait for the database lock.
+        """
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.timeout = timeout
+        self._local = threading.local()
+
+        connection = self._connection()
+
+        with connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+
+            for statement in self.SCHEMA:
+                connection.execute(statement)
+
+    def _connection(self):
+        """
+        Return the connection of the current thread.
+        """
+
+        connection = getattr(self._local, "connection", None)
+
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None
+            )
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+
+        return connection
+
+    def get(self, key):
+        """
+        Return the cached body and headers, or None on a miss.
+        """
+
+        connection = self._connection()
+        row = connection.execute(
+            """
+            SELECT body, headers, expires_at, accessed_at
+            FROM response_entries
+            WHERE key = ?
+            """,
+            (key,)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        body, headers, expires_at, accessed_at = row
+        now = self.clock()
+
+        if expires_at is not None and expires_at <= now:
+            with connection:
+                self._remove(connection, [key])
+
+            return None
+
+        if accessed_at + self.TOUCH_INTERVAL <= now:
+            connection.execute(
+                "UPDATE response_entries SET accessed_at = ? WHERE key = ?",
+                (now, key)
+            )
+
+        return bytes(body), json.loads(headers)
+
+    def set(self, key, body, headers, tags, ttl=None, started=None):
+        """
+        Store a response.
+
+        Args:
+            key (str): Cache key.
+            body (bytes): Encoded response body.
+            headers (dict): Response headers.
+            tags (iterable): Invalidation tags of the entry.
+            ttl (float): Seconds the entry stays valid, or None.
+            started (float): Clock value read before the response was
+                rendered; see MemoryResponseBackend.set.
+
+        Returns:
+            bool: Whether the entry was stored.
+        """
+
+        tags = sorted(set(tags))
+        size = len(body)
+
+        if size > self.max_bytes:
+            return False
+
+        now = self.clock()
+        expires_at = now + ttl if ttl is not None else None
+        connection = self._connection()
+
+        connection.execute("BEGIN IMMEDIATE")
+
+        try:
+            if started is not None and tags:
+                placeholders = ", ".join("?" for _ in tags)
+                stale = connection.execute(
+                    f"""
+                    SELECT 1 FROM response_invalidations
+                    WHERE tag IN ({placeholders}) AND invalidated_at >= ?
+                    LIMIT 1
+                    """,
+                    (*tags, started)
+                ).fetchone()
+
+                if stale is not None:
+                    connection.execute("ROLLBACK")
+                    return False
+
+            self._remove(connection, [key])
+            connection.execute(
+                """
+                INSERT INTO response_entries
+                (key, body, headers, size, expires_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, body, json.dumps(headers), size, expires_at, now)
+            )
+            connection.executemany(
+                "INSERT INTO response_tags (tag, key) VALUES (?, ?)",
+                [(tag, key) for tag in tags]
+            )
+            self._evict(connection)
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+        return True
+
+    def invalidate(self, tags):
+        """
+        Remove every entry carrying one of the tags.
+        """
+
+        tags = sorted(set(tags))
+        now = self.clock()
+        connection = self._connection()
+
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.executemany(
+                """
+                INSERT INTO response_invalidations (tag, invalidated_at)
+                VALUES (?, ?)
+                ON CONFLICT (tag) DO UPDATE SET
+                invalidated_at = excluded.invalidated_at
+                """,
+                [(tag, now) for tag in tags]
+            )
+            connection.execute(
+                "DELETE FROM response_invalidations WHERE invalidated_at < ?",
+                (now - INVALIDATION_WINDOW,)
+            )
+
+            placeholders = ", ".join("?" for _ in tags)
+            keys = [
+                key
+                for key, in connection.execute(
+                    f"SELECT key FROM response_tags WHERE tag IN "
+                    f"({placeholders})",
+                    tags
+                )
+            ]
+
+            self._remove(connection, keys)
+
+    def clear(self):
+        """
+        Remove every entry.
+        """
+
+        connection = self._connection()
+
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute("DELETE FROM response_tags")
+            connection.execute("DELETE FROM response_entries")
+
+    def stats(self):
+        """
+        Return the number and total size of cached entries.
+
+        Returns:
+            dict: Cache size counters.
+        """
+
+        entries, size = self._connection().execute(
+            "SELECT count(*), coalesce(sum(size), 0) FROM response_entries"
+        ).fetchone()
+
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes
+        }
+
+    @staticmethod
+    def _remove(connection, keys):
+        """
+        Delete entries and their tags inside the current transaction.
+        """
+
+        rows = [(key,) for key in keys]
+        connection.executemany(
+            "DELETE FROM response_tags WHERE key = ?",
+            rows
+        )
+        connection.executemany(
+            "DELETE FROM response_entries WHERE key = ?",
+            rows
+        )
+
+    def _evict(self, connection):
+        """
+        Delete least recently used entries until under the byte budget.
+        """
+
+        total, = connection.execute(
+            "SELECT coalesce(sum(size), 0) FROM response_entries"
+        ).fetchone()
+
+        if total <= self.max_bytes:
+            return
+
+        evicted = []
+
+        for key, size in connection.execute(
+            "SELECT key, size FROM response_entries ORDER BY accessed_at"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+
+            evicted.append(key)
+            total -= size
+
+        self._remove(connection, evicted)
+
+
+class ResponseCache:
+    """
+    Flask extension caching the JSON responses of decorated views.
+    """
+
+    def __init__(self, app=None):
+        """
+        Initialize the extension.
+
+        Args:
+            app (Flask): Optional application to initialize.
+        """
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Create the configured backend for an application.
+
+        Args:
+            app (Flask): Application to configure.
+        """
+
+        app.config.setdefault("RESPONSE_CACHE_ENABLED", False)
+        app.config.setdefault("RESPONSE_CACHE_BACKEND", "memory")
+        app.config.setdefault("RESPONSE_CACHE_TTL", 60)
+        app.config.setdefault("RESPONSE_CACHE_MAX_BYTES", 32 * 1024 * 1024)
+        app.config.setdefault("RESPONSE_CACHE_PATH", None)
+
+        app.extensions["response_cache"] = (
+            self.create_backend(app)
+            if app.config["RESPONSE_CACHE_ENABLED"]
+            else None
+        )
+
+    @staticmethod
+    def create_backend(app):
+        """
+        Build the backend named by RESPONSE_CACHE_BACKEND.
+
+        Raises:
+            ValueError: If the backend name is unknown.
+        """
+
+        name = app.config["RESPONSE_CACHE_BACKEND"]
+        max_bytes = app.config["RESPONSE_CACHE_MAX_BYTES"]
+
+        if name == "memory":
+            return MemoryResponseBackend(max_bytes)
+
+        if name == "sqlite":
+            path = app.config["RESPONSE_CACHE_PATH"]
+
+            if path is None:
+                os.makedirs(app.instance_path, exist_ok=True)
+                path = os.path.join(app.instance_path, "response_cache.db")
+
+            return SQLiteResponseBackend(path, max_bytes)
+
+        raise ValueError(f"Unknown response cache backend: {name}")
+
+    @staticmethod
+    def backend():
+        """
+        Return the backend of the current application, or None.
+        """
+
+        if not has_app_context():
+            return None
+
+        return current_app.extensions.get("response_cache")
+
+    @staticmethod
+    def make_key():
+        """
+        Return the cache key of the current request.
+
+        Query parameters are sorted so equivalent URLs share an entry.
+        """
+
+        arguments = sorted(request.args.items(multi=True))
+
+        return f"{request.path}?{urlencode(arguments)}"
+
+    def invalidate(self, *tags):
+        """
+        Remove cached responses carrying any of the tags.
+        """
+
+        backend = self.backend()
+
+        if backend is not None and tags:
+            backend.invalidate(tags)
+
+    def clear(self):
+        """
+        Remove every cached response.
+        """
+
+        backend = self.backend()
+
+        if backend is not None:
+            backend.clear()
+
+    def cached(self, tags):
+        """
+        Cache the successful responses of a GET view.
+
+        The view must return a (data, 200, headers) tuple to be cached;
+        any other result is passed through. A cached response that
+        carries an ETag still answers If-None-Match with 304.
+
+        Args:
+            tags (iterable or callable): Invalidation tags, or a
+                function receiving the view arguments and returning
+                them.
+
+        Returns:
+            callable: View decorator.
+        """
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                backend = self.backend()
+
+                if backend is None or request.method != "GET":
+                    return view(*args, **kwargs)
+
+                key = self.make_key()
+                entry = backend.get(key)
+
+                if entry is not None:
+                    body, headers = entry
+                    return self._respond(body, headers, "HIT")
+
+                started = backend.clock()
+                result = view(*args, **kwargs)
+
+                if not (
+                    isinstance(result, tuple)
+                    and len(result) == 3
+                    and result[1] == 200
+                ):
+                    return result
+
+                data, _, headers = result
+                body = dumps(data)
+                entry_tags = tags(**kwargs) if callable(tags) else tags
+
+                backend.set(
+                    key,
+                    body,
+                    dict(headers),
+                    entry_tags,
+                    ttl=current_app.config["RESPONSE_CACHE_TTL"],
+                    started=started
+                )
+
+                return self._respond(body, headers, "MISS")
+
+            return wrapper
+
+        return decorator
+
+    @staticmethod
+    def _respond(body, headers, status):
+        """
+        Build the response for a cached body, or a 304 if the client's
+        copy matches its ETag.
+        """
+
+        headers = dict(headers)
+        headers["X-Cache"] = status
+        etag = headers.get("ETag")
+
+        if etag and request.if_none_match.contains(etag.strip('"')):
+            return Response(status=304, headers=headers)
+
+        return Response(
+            body,
+            status=200,
+            headers=headers,
+            mimetype="application/json"
+        )
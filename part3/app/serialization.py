@@ -0,0 +1,261 @@
+#!/usr/bin/python3
+"""
+Precompiled serialization plans for API responses.
+
+A plan maps response keys to model columns once, at import time, and
+reads every loaded column of an object from its instance dictionary
+with a single itemgetter call, bypassing the attribute instrumentation.
+When orjson is installed, datetimes are left for it to encode natively;
+otherwise the plan formats them, as the standard library encoder would
+call back into Python for each one.
+"""
+
+from operator import attrgetter, itemgetter
+
+from sqlalchemy import DateTime, inspect
+
+from app.encoding import orjson
+from app.models.amenity import Amenity
+from app.models.place import RATING_VALUES, Place
+from app.models.review import Review
+from app.models.user import User
+
+
+BASE_COLUMNS = ("id", "created_at", "updated_at")
+
+
+class SerializationPlan:
+    """
+    Serialize objects of one model into dictionaries.
+    """
+
+    def __init__(
+        self,
+        model,
+        columns,
+        computed=None,
+        requires=None,
+        format_datetimes=orjson is None
+    ):
+        """
+        Build the plan.
+
+        Args:
+            model: SQLAlchemy model class.
+            columns (iterable): Column names, also used as keys.
+            computed (dict): Keys mapped to functions of the object,
+                added after the columns.
+            requires (dict): Computed keys mapped to the column names
+                their function reads.
+            format_datetimes (bool): Convert datetime columns to ISO
+                8601 strings.
+
+        Raises:
+            ValueError: If a name is not a column of the model.
+        """
+
+        column_attrs = inspect(model).column_attrs
+        self.model = model
+        self.keys = tuple(columns)
+        self.format_datetimes = format_datetimes
+
+        if not self.keys:
+            raise ValueError("A plan needs at least one column")
+
+        for name in self.keys:
+            if name not in column_attrs:
+                raise ValueError(
+                    f"{model.__name__} has no column {name}"
+                )
+
+        getters = (
+            (itemgetter(*self.keys), attrgetter(*self.keys))
+            if len(self.keys) > 1
+            else (
+                lambda values: (values[self.keys[0]],),
+                lambda obj: (getattr(obj, self.keys[0]),)
+            )
+        )
+        self._get_loaded, self._get_columns = getters
+        self.computed = tuple((computed or {}).items())
+        self.requires = dict(requires or {})
+        self.fields = self.keys + tuple(key for key, _ in self.computed)
+        self._subsets = {}
+        self.datetime_keys = tuple(
+            name
+            for name in self.keys
+            if format_datetimes
+            and isinstance(column_attrs[name].columns[0].type, DateTime)
+        )
+
+    def __call__(self, obj):
+        """
+        Return the dictionary for one object.
+        """
+
+        try:
+            values = self._get_loaded(obj.__dict__)
+        except KeyError:
+            # Expired or deferred columns are loaded through the
+            # instrumented attributes.
+            values = self._get_columns(obj)
+
+        data = dict(zip(self.keys, values))
+
+        for key in self.datetime_keys:
+            value = data[key]
+
+            if value is not None:
+                data[key] = value.isoformat()
+
+        for key, function in self.computed:
+            data[key] = function(obj)
+
+        return data
+
+    def many(self, objects):
+        """
+        Return the dictionaries for a sequence of objects.
+        """
+
+        return [self(obj) for obj in objects]
+
+    @property
+    def columns(self):
+        """
+        Return the names of every column the plan reads.
+        """
+
+        names = list(self.keys)
+
+        for key, _ in self.computed:
+            names.extend(
+                name
+                for name in self.requires.get(key, ())
+                if name not in names
+            )
+
+        return tuple(names)
+
+    def select(self, fields):
+        """
+        Return a plan producing only some of this plan's keys.
+
+        The ``id`` key is always kept. Plans are built once per set of
+        fields and reused.
+
+        Args:
+            fields (iterable): Keys to keep, in any order.
+
+        Returns:
+            SerializationPlan: Plan for the selected keys.
+
+        Raises:
+            ValueError: If a field is not a key of this plan.
+        """
+
+        fields = frozenset(fields) | {"id"}
+        subset = self._subsets.get(fields)
+
+        if subset is not None:
+            return subset
+
+        unknown = fields.difference(self.fields)
+
+        if unknown:
+            raise ValueError(f"Unknown field: {sorted(unknown)[0]}")
+
+        subset = SerializationPlan(
+            self.model,
+            [key for key in self.keys if key in fields],
+            computed={
+                key: function
+                for key, function in self.computed
+                if key in fields
+            },
+            requires=self.requires,
+            format_datetimes=self.format_datetimes
+        )
+        self._subsets[fields] = subset
+
+        return subset
+
+
+def _rating_histogram(place):
+    """
+    Return the number of reviews per rating, keyed by rating.
+    """
+
+    return {
+        str(rating): getattr(place, f"rating_{rating}")
+        for rating in RATING_VALUES
+    }
+
+
+def _amenity_ids(place):
+    """
+    Return the IDs of a place's amenities.
+    """
+
+    return [amenity.id for amenity in place.amenities]
+
+
+USER_PLAN = SerializationPlan(
+    User,
+    (*BASE_COLUMNS, "first_name", "last_name", "email", "is_admin")
+)
+
+# Owner and reviewer details embedded in place responses.
+USER_CONTACT_PLAN = SerializationPlan(
+    User,
+    ("id", "first_name", "last_name", "email")
+)
+
+# Author details embedded in review responses.
+AUTHOR_PLAN = SerializationPlan(
+    User,
+    ("id", "first_name", "last_name")
+)
+
+AMENITY_PLAN = SerializationPlan(
+    Amenity,
+    (*BASE_COLUMNS, "name")
+)
+
+REVIEW_PLAN = SerializationPlan(
+    Review,
+    (*BASE_COLUMNS, "text", "rating", "user_id", "place_id")
+)
+
+PLACE_PLAN = SerializationPlan(
+    Place,
+    (
+        *BASE_COLUMNS,
+        "title",
+        "description",
+        "price",
+        "latitude",
+        "longitude",
+        "owner_id",
+        "review_count",
+        "rating_sum",
+        "average_rating"
+    ),
+    computed={
+        "rating_histogram": _rating_histogram,
+        "amenities": _amenity_ids
+    },
+    requires={
+        "rating_histogram": tuple(
+            f"rating_{rating}" for rating in RATING_VALUES
+        )
+    }
+)
+
+# Places embedded in other resources, without the amenity ID list so
+# embedding them does not load every place's amenities.
+PLACE_SUMMARY_PLAN = PLACE_PLAN.select(
+    key
+    for key in PLACE_PLAN.fields
+    if key != "amenities"
+)
@@ -6,15 +6,23 @@ Coordinates communication between:
 - API layer
 - Business logic layer
 - Persistence layer
+
+Every write operation runs inside a UnitOfWork and commits once, then
+invalidates the cached responses it affects.
 """
 
+from functools import partial
+
+from app.extensions import response_cache
 from app.models.amenity import Amenity
 from app.models.place import Place
 from app.models.review import Review
 from app.models.user import User
 from app.persistence.amenity_repository import AmenityRepository
+from app.persistence.cache import CachedRepository, LRUCache
 from app.persistence.place_repository import PlaceRepository
 from app.persistence.review_repository import ReviewRepository
+from app.persistence.unit_of_work import UnitOfWork, run_after_commit
 from app.persistence.user_repository import UserRepository
 
 
@@ -26,11 +34,70 @@ class HBnBFacade:
     def __init__(self):
         """
         Initialize SQLAlchemy repositories.
+
+        Repositories are wrapped in an entity cache that stays disabled
+        until configure_cache is called.
+        """
+        self.user_repo = CachedRepository(UserRepository())
+        self.place_repo = CachedRepository(PlaceRepository())
+        self.review_repo = CachedRepository(ReviewRepository())
+        self.amenity_repo = CachedRepository(AmenityRepository())
+
+    def configure_cache(self, config):
+        """
+        Configure the entity caches from application settings.
+
+        Every call starts with empty caches.
+
+        Args:
+            config (dict): Application configuration.
+        """
+        enabled = config.get("ENTITY_CACHE_ENABLED", False)
+        ttl = config.get("ENTITY_CACHE_TTL")
+        sizes = config.get("ENTITY_CACHE_SIZES", {})
+
+        for repo in self._repositories():
+            size = sizes.get(repo.model.__tablename__, 0)
+
+            repo.cache = (
+                LRUCache(size, ttl)
+                if enabled and size > 0
+                else None
+            )
+
+    def cache_stats(self):
+        """
+        Return entity cache counters per table.
+
+        Returns:
+            dict: Cache statistics, or None for disabled caches.
+        """
+        return {
+            repo.model.__tablename__: (
+                repo.cache.stats()
+                if repo.cache is not None
+                else None
+            )
+            for repo in self._repositories()
+        }
+
+    def _repositories(self):
+        """
+        Return the cached repositories.
+        """
+        return (
+            self.user_repo,
+            self.place_repo,
+            self.review_repo,
+            self.amenity_repo
+        )
+
+    def _invalidate_responses(self, *tags):
+        """
+        Invalidate cached responses with the tags once the current unit
+        of work commits.
         """
-        self.user_repo = UserRepository()
-        self.place_repo = PlaceRepository()
-        self.review_repo = ReviewRepository()
-        self.amenity_repo = AmenityRepository()
+        run_after_commit(partial(response_cache.invalidate, *tags))
 
     # User operations
 
@@ -38,14 +105,19 @@ class HBnBFacade:
         """
         Create and persist a user.
         """
-        user = User(**user_data)
-        return self.user_repo.add(user)
+        with UnitOfWork():
+            user = User(**user_data)
+            return self.user_repo.add(user)
 
-    def get_user(self, user_id):
+    def get_user(self, user_id, load=None):
         """
         Retrieve a user by ID.
+
+        Args:
+            user_id (str): ID of the user.
+            load (dict): Optional load plan for related objects.
         """
-        return self.user_repo.get(user_id)
+        return self.user_repo.get(user_id, load=load)
 
     def get_all_users(self):
         """
@@ -53,6 +125,26 @@ class HBnBFacade:
         """
         return self.user_repo.get_all()
 
+    def get_users_page(self, limit, cursor=None, load=None):
+        """
+        Retrieve one page of users.
+
+        Args:
+            limit (int): Maximum number of users.
+            cursor (str): Cursor returned with the previous page.
+            load (dict): Optional load plan for related objects.
+
+        Returns:
+            tuple: Users on the page and the next cursor, or None.
+        """
+        return self.user_repo.get_page(limit, cursor, load=load)
+
+    def get_users_version(self):
+        """
+        Retrieve the latest update time and count of users.
+        """
+        return self.user_repo.get_version()
+
     def get_user_by_email(self, email):
         """
         Retrieve a user by email.
@@ -63,7 +155,14 @@ class HBnBFacade:
         """
         Update and persist a user.
         """
-        return self.user_repo.update(user_id, user_data)
+        with UnitOfWork():
+            user = self.user_repo.update(user_id, user_data)
+
+            # Review lists include author names; place lists may embed
+            # owners.
+            self._invalidate_responses("users", "reviews")
+
+            return user
 
     # Place operations
 
@@ -75,39 +174,66 @@ class HBnBFacade:
             Place: Newly created place, or None if validation fails.
         """
         owner_id = place_data.get("owner_id")
+        owner = self.user_repo.get(owner_id)
 
-        if not self.user_repo.get(owner_id):
+        if not owner:
             return None
 
-        amenities = []
+        amenities, missing = self.amenity_repo.get_many(
+            place_data.get("amenity_ids", [])
+        )
 
-        for amenity_id in place_data.get("amenity_ids", []):
-            amenity = self.amenity_repo.get(amenity_id)
+        if missing:
+            return None
 
-            if not amenity:
-                return None
+        with UnitOfWork():
+            place = Place(
+                title=place_data["title"],
+                description=place_data.get("description", ""),
+                price=place_data["price"],
+                latitude=place_data["latitude"],
+                longitude=place_data["longitude"],
+                owner_id=owner_id
+            )
 
-            amenities.append(amenity)
+            place.owner = owner
+            place.reviews = []
 
-        place = Place(
-            title=place_data["title"],
-            description=place_data.get("description", ""),
-            price=place_data["price"],
-            latitude=place_data["latitude"],
-            longitude=place_data["longitude"],
-            owner_id=owner_id
-        )
+            for amenity in amenities:
+                place.add_amenity(amenity)
 
-        for amenity in amenities:
-            place.add_amenity(amenity)
+            self._invalidate_responses("places")
 
-        return self.place_repo.add(place)
+            return self.place_repo.add(place)
 
-    def get_place(self, place_id):
+    def get_place(self, place_id, load=None):
         """
         Retrieve a place by ID.
+
+        Args:
+            place_id (str): ID of the place.
+            load (dict): Optional load plan for related objects.
+        """
+        return self.place_repo.get(place_id, load=load)
+
+    def get_place_version(self, place_id):
+        """
+        Retrieve the version of a place and its detail view.
+
+        Returns:
+            tuple: Latest update time and row count, or None if the
+            place does not exist.
+        """
+        return self.place_repo.get_detail_version(place_id)
+
+    def get_places_version(self):
         """
-        return self.place_repo.get(place_id)
+        Retrieve the latest update time and count of places.
+
+        Place rows are touched by amenity links and review writes, so
+        list and search responses change only when this does.
+        """
+        return self.place_repo.get_version()
 
     def get_all_places(self):
         """
@@ -115,6 +241,172 @@ class HBnBFacade:
         """
         return self.place_repo.get_all()
 
+    def get_places_page(
+        self,
+        limit,
+        cursor=None,
+        load=None,
+        filters=None,
+        sort=None
+    ):
+        """
+        Retrieve one page of places.
+
+        Args:
+            filters (dict): Optional price, rating, and amenity filters.
+            sort (str): Optional sort name: price, -price, rating, newest.
+
+        Returns:
+            tuple: Places on the page and the next cursor, or None.
+        """
+        return self.place_repo.get_page(
+            limit,
+            cursor,
+            load=load,
+            filters=filters,
+            sort=sort
+        )
+
+    def stream_places(
+        self,
+        load=None,
+        filters=None,
+        sort=None,
+        bbox=None
+    ):
+        """
+        Iterate over every matching place in batches.
+
+        Args:
+            load (dict): Optional load plan for related objects.
+            filters (dict): Optional price, rating, and amenity filters.
+            sort (str): Optional sort name: price, -price, rating, newest.
+            bbox (tuple): Optional (min_lng, min_lat, max_lng, max_lat).
+
+        Returns:
+            generator: Lists of places, in sort order.
+        """
+        return self.place_repo.stream_places(
+            load=load,
+            filters=filters,
+            sort=sort,
+            bbox=bbox
+        )
+
+    def get_places_in_bbox_page(
+        self,
+        bbox,
+        limit,
+        cursor=None,
+        load=None,
+        filters=None,
+        sort=None
+    ):
+        """
+        Retrieve one page of places inside a bounding box.
+
+        Args:
+            bbox (tuple): (min_lng, min_lat, max_lng, max_lat).
+
+        Returns:
+            tuple: Places on the page and the next cursor, or None.
+        """
+        return self.place_repo.get_page_in_bbox(
+            bbox,
+            limit,
+            cursor,
+            load=load,
+            filters=filters,
+            sort=sort
+        )
+
+    def get_places_near_page(
+        self,
+        latitude,
+        longitude,
+        radius_km,
+        limit,
+        cursor=None,
+        load=None,
+        filters=None
+    ):
+        """
+        Retrieve one page of places within a radius, nearest first.
+
+        Returns:
+            tuple: (place, distance_km) pairs and the next cursor, or None.
+        """
+        return self.place_repo.get_page_near(
+            latitude,
+            longitude,
+            radius_km,
+            limit,
+            cursor,
+            load=load,
+            filters=filters
+        )
+
+    def search_places_page(self, query, limit, cursor=None, load=None):
+        """
+        Retrieve one page of places matching a full-text query.
+
+        Args:
+            query (str): FTS5 MATCH expression.
+
+        Returns:
+            tuple: (place, highlights) pairs and the next cursor, or None.
+        """
+        return self.place_repo.search_page(
+            query,
+            limit,
+            cursor,
+            load=load
+        )
+
+    def rebuild_place_search(self):
+        """
+        Recreate the place full-text index from the places table.
+        """
+        with UnitOfWork():
+            self.place_repo.rebuild_search_index()
+            self._invalidate_responses("places")
+
+    def rebuild_amenity_masks(self):
+        """
+        Assign missing amenity bits and recompute place amenity masks.
+
+        Returns:
+            tuple: Number of amenities given a bit and of places updated.
+        """
+        with UnitOfWork():
+            assigned = self.amenity_repo.assign_missing_bits()
+            updated = self.place_repo.rebuild_amenity_masks()
+
+            for repo in (self.amenity_repo, self.place_repo):
+                if repo.cache is not None:
+                    run_after_commit(repo.cache.clear)
+
+            self._invalidate_responses("places", "amenities")
+
+            return assigned, updated
+
+    def backfill_place_grid(self):
+        """
+        Compute missing or stale place grid cells.
+
+        Returns:
+            int: Number of places updated.
+        """
+        with UnitOfWork():
+            updated = self.place_repo.backfill_grid()
+
+            if self.place_repo.cache is not None:
+                run_after_commit(self.place_repo.cache.clear)
+
+            self._invalidate_responses("places")
+
+            return updated
+
     def update_place(self, place_id, place_data):
         """
         Update and persist a place.
@@ -131,26 +423,25 @@ class HBnBFacade:
         amenities = None
 
         if amenity_ids is not None:
-            amenities = []
-
-            for amenity_id in amenity_ids:
-                amenity = self.amenity_repo.get(amenity_id)
+            amenities, missing = self.amenity_repo.get_many(
+                amenity_ids
+            )
 
-                if not amenity:
-                    return None
+            if missing:
+                return None
 
-                amenities.append(amenity)
+        with UnitOfWork():
+            place = self.place_repo.update(place_id, update_data)
 
-        place = self.place_repo.update(place_id, update_data)
+            if not place:
+                return None
 
-        if not place:
-            return None
+            if amenities is not None:
+                place.set_amenities(amenities)
 
-        if amenities is not None:
-            place.amenities = amenities
-            place = self.place_repo.update(place_id, {})
+            self._invalidate_responses("places", f"place:{place_id}")
 
-        return place
+            return place
 
     def add_amenity_to_place(self, place_id, amenity_id):
         """
@@ -162,8 +453,12 @@ class HBnBFacade:
         if not place or not amenity:
             return None
 
-        place.add_amenity(amenity)
-        return self.place_repo.update(place_id, {})
+        with UnitOfWork():
+            place.add_amenity(amenity)
+            self.place_repo.invalidate(place_id)
+            self.place_repo.session.flush()
+            self._invalidate_responses("places", f"place:{place_id}")
+            return place
 
     def remove_amenity_from_place(self, place_id, amenity_id):
         """
@@ -175,8 +470,12 @@ class HBnBFacade:
         if not place or not amenity:
             return None
 
-        place.remove_amenity(amenity)
-        return self.place_repo.update(place_id, {})
+        with UnitOfWork():
+            place.remove_amenity(amenity)
+            self.place_repo.invalidate(place_id)
+            self.place_repo.session.flush()
+            self._invalidate_responses("places", f"place:{place_id}")
+            return place
 
     # Amenity operations
 
@@ -184,8 +483,14 @@ class HBnBFacade:
         """
         Create and persist an amenity.
         """
-        amenity = Amenity(**amenity_data)
-        return self.amenity_repo.add(amenity)
+        with UnitOfWork():
+            amenity = Amenity(**amenity_data)
+            amenity.bit = self.amenity_repo.lowest_free_bit()
+            self.amenity_repo.add(amenity)
+            # Read back the bit the INSERT chose.
+            self.amenity_repo.session.refresh(amenity, ["bit"])
+            self._invalidate_responses("amenities")
+            return amenity
 
     def get_amenity(self, amenity_id):
         """
@@ -199,6 +504,21 @@ class HBnBFacade:
         """
         return self.amenity_repo.get_all()
 
+    def get_amenities_page(self, limit, cursor=None):
+        """
+        Retrieve one page of amenities.
+
+        Returns:
+            tuple: Amenities on the page and the next cursor, or None.
+        """
+        return self.amenity_repo.get_page(limit, cursor)
+
+    def get_amenities_version(self):
+        """
+        Retrieve the latest update time and count of amenities.
+        """
+        return self.amenity_repo.get_version()
+
     def get_amenity_by_name(self, name):
         """
         Retrieve an amenity by name.
@@ -215,10 +535,12 @@ class HBnBFacade:
         """
         Update and persist an amenity.
         """
-        return self.amenity_repo.update(
-            amenity_id,
-            amenity_data
-        )
+        with UnitOfWork():
+            self._invalidate_responses("amenities")
+            return self.amenity_repo.update(
+                amenity_id,
+                amenity_data
+            )
 
     # Review operations
 
@@ -244,10 +566,10 @@ class HBnBFacade:
         ):
             return None
 
-        if not self.user_repo.get(user_id):
-            return None
+        user = self.user_repo.get(user_id)
+        place = self.place_repo.get(place_id)
 
-        if not self.place_repo.get(place_id):
+        if not user or not place:
             return None
 
         duplicate = (
@@ -260,20 +582,31 @@ class HBnBFacade:
         if duplicate:
             return None
 
-        review = Review(
-            text=text,
-            rating=rating,
-            user_id=user_id,
-            place_id=place_id
-        )
+        with UnitOfWork():
+            review = Review(
+                text=text,
+                rating=rating,
+                user_id=user_id,
+                place_id=place_id
+            )
+
+            review.user = user
+            review.place = place
 
-        return self.review_repo.add(review)
+            self.review_repo.add(review)
+            self._adjust_place_ratings(place_id, added=rating)
 
-    def get_review(self, review_id):
+            return review
+
+    def get_review(self, review_id, load=None):
         """
         Retrieve a review by ID.
+
+        Args:
+            review_id (str): ID of the review.
+            load (dict): Optional load plan for related objects.
         """
-        return self.review_repo.get(review_id)
+        return self.review_repo.get(review_id, load=load)
 
     def get_all_reviews(self):
         """
@@ -281,6 +614,21 @@ class HBnBFacade:
         """
         return self.review_repo.get_all()
 
+    def get_reviews_page(self, limit, cursor=None, load=None):
+        """
+        Retrieve one page of reviews.
+
+        Returns:
+            tuple: Reviews on the page and the next cursor, or None.
+        """
+        return self.review_repo.get_page(limit, cursor, load=load)
+
+    def get_reviews_version(self):
+        """
+        Retrieve the latest update time and count of reviews.
+        """
+        return self.review_repo.get_version()
+
     def update_review(self, review_id, review_data):
         """
         Update and persist a review.
@@ -291,16 +639,72 @@ class HBnBFacade:
         update_data.pop("user_id", None)
         update_data.pop("place_id", None)
 
-        return self.review_repo.update(
-            review_id,
-            update_data
-        )
+        with UnitOfWork():
+            review = self.review_repo.get(review_id)
+
+            if not review:
+                return None
+
+            old_rating = review.rating
+            review = self.review_repo.update(review_id, update_data)
+
+            self._adjust_place_ratings(
+                review.place_id,
+                added=review.rating,
+                removed=old_rating
+            )
+
+            return review
 
     def delete_review(self, review_id):
         """
         Delete a review.
         """
-        return self.review_repo.delete(review_id)
+        with UnitOfWork():
+            review = self.review_repo.get(review_id)
+
+            if not review:
+                return False
+
+            place_id = review.place_id
+            rating = review.rating
+
+            self.review_repo.delete(review_id)
+            self._adjust_place_ratings(place_id, removed=rating)
+
+            return True
+
+    def _adjust_place_ratings(self, place_id, added=None, removed=None):
+        """
+        Update the rating aggregates of a place after a review write.
+
+        Listings show the aggregates, so they are invalidated along with
+        the place's review list.
+        """
+        self.place_repo.adjust_ratings(
+            place_id,
+            added=added,
+            removed=removed
+        )
+        self.place_repo.invalidate(place_id)
+        self._invalidate_responses("places", f"place:{place_id}")
+
+    def reconcile_place_ratings(self):
+        """
+        Recompute every place's rating aggregates from its reviews.
+
+        Returns:
+            int: Number of places whose aggregates were corrected.
+        """
+        with UnitOfWork():
+            corrected = self.place_repo.reconcile_ratings()
+
+            if self.place_repo.cache is not None:
+                run_after_commit(self.place_repo.cache.clear)
+
+            self._invalidate_responses("places")
+
+            return corrected
 
     def get_reviews_by_place(self, place_id):
         """
@@ -313,3 +717,40 @@ class HBnBFacade:
             return None
 
         return self.review_repo.get_reviews_by_place(place_id)
+
+    def get_reviews_by_place_version(self, place_id):
+        """
+        Retrieve the latest update time and count of a place's reviews.
+
+        Returns:
+            tuple: Latest update time and review count, or None if the
+            place does not exist.
+        """
+        if not self.place_repo.get(place_id):
+            return None
+
+        return self.review_repo.get_version(Review.place_id == place_id)
+
+    def get_reviews_by_place_page(
+        self,
+        place_id,
+        limit,
+        cursor=None,
+        load=None
+    ):
+        """
+        Retrieve one page of reviews associated with a place.
+
+        Returns:
+            tuple: Reviews on the page and the next cursor, or None if
+            the place does not exist.
+        """
+        if not self.place_repo.get(place_id):
+            return None
+
+        return self.review_repo.get_reviews_by_place_page(
+            place_id,
+            limit,
+            cursor,
+            load=load
+        )
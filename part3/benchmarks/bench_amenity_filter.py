@@ -0,0 +1,228 @@
+#!/usr/bin/python3
+"""
+Compare amenity filtering through place_amenity with the amenity mask.
+
+Each query fetches the first page of places that have all (or any) of
+three amenities, the way GET /api/v1/places/?amenity= does.
+
+Usage:
+    python -m benchmarks.bench_amenity_filter [--places 100000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import func, insert, select
+
+from app import create_app
+from app.extensions import db
+from app.models.place import Place
+from app.models.place_amenity import place_amenity
+from app.models.user import User
+from app.services import facade
+from config import TestingConfig
+
+
+def seed(count, amenities, owner_id):
+    """
+    Insert places holding random amenity subsets.
+    """
+
+    random.seed(42)
+    places = []
+    links = []
+
+    for index in range(count):
+        place_id = str(uuid.uuid4())
+        chosen = random.sample(amenities, random.randint(0, 8))
+        mask = 0
+
+        for amenity in chosen:
+            mask |= amenity.mask
+            links.append({
+                "place_id": place_id,
+                "amenity_id": amenity.id
+            })
+
+        places.append({
+            "id": place_id,
+            "title": f"Place {index}",
+            "description": "",
+            "price": 100.0,
+            "latitude": 0.0,
+            "longitude": 0.0,
+            "owner_id": owner_id,
+            "amenity_mask": mask
+        })
+
+        if len(places) == 10000:
+            db.session.execute(insert(Place), places)
+            db.session.execute(insert(place_amenity), links)
+            places = []
+            links = []
+
+    if places:
+        db.session.execute(insert(Place), places)
+        db.session.execute(insert(place_amenity), links)
+
+    db.session.commit()
+
+
+def join_all(amenity_ids, limit):
+    """
+    Places with every amenity, through GROUP BY and HAVING.
+    """
+
+    matching = select(
+        place_amenity.c.place_id
+    ).where(
+        place_amenity.c.amenity_id.in_(amenity_ids)
+    ).group_by(
+        place_amenity.c.place_id
+    ).having(
+        func.count() == len(amenity_ids)
+    )
+
+    return db.session.execute(
+        select(Place)
+        .where(Place.id.in_(matching))
+        .order_by(Place.created_at, Place.id)
+        .limit(limit)
+    ).scalars().all()
+
+
+def join_any(amenity_ids, limit):
+    """
+    Places with at least one amenity, through place_amenity.
+    """
+
+    matching = select(place_amenity.c.place_id).where(
+        place_amenity.c.amenity_id.in_(amenity_ids)
+    )
+
+    return db.session.execute(
+        select(Place)
+        .where(Place.id.in_(matching))
+        .order_by(Place.created_at, Place.id)
+        .limit(limit)
+    ).scalars().all()
+
+
+def mask_all(amenity_ids, limit):
+    """
+    Places with every amenity, through the amenity mask.
+    """
+
+    return facade.get_places_page(
+        limit,
+        filters={"amenity_ids": amenity_ids}
+    )[0]
+
+
+def mask_any(amenity_ids, limit):
+    """
+    Places with at least one amenity, through the amenity mask.
+    """
+
+    return facade.get_places_page(
+        limit,
+        filters={"any_amenity_ids": amenity_ids}
+    )[0]
+
+
+def measure(function, queries, repeat):
+    """
+    Return the median duration of a function over the queries in ms.
+    """
+
+    durations = []
+
+    for _ in range(repeat):
+        for query in queries:
+            db.session.remove()
+            started = time.perf_counter()
+            function(*query)
+            durations.append(time.perf_counter() - started)
+
+    return statistics.median(durations) * 1000
+
+
+def main():
+    """
+    Seed a database file and print median filter latencies.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--places", type=int, default=100000)
+    parser.add_argument("--amenities", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="hbnb-bench-")
+    path = os.path.join(directory, "amenities.db")
+
+    class BenchmarkConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+        SERVER_TIMING_ENABLED = False
+        ENTITY_CACHE_ENABLED = False
+
+    app = create_app(BenchmarkConfig)
+
+    try:
+        with app.app_context():
+            owner = User(
+                first_name="Bench",
+                last_name="Owner",
+                email="bench@example.com",
+                password="benchmark"
+            )
+            db.session.add(owner)
+            db.session.commit()
+
+            amenities = [
+                facade.create_amenity({"name": f"Amenity {index}"})
+                for index in range(args.amenities)
+            ]
+
+            started = time.perf_counter()
+            seed(args.places, amenities, owner.id)
+            print(
+                f"seeded {args.places} places in "
+                f"{time.perf_counter() - started:.1f}s"
+            )
+
+            amenity_ids = [amenity.id for amenity in amenities]
+            queries = [
+                (random.sample(amenity_ids, 3), args.limit)
+                for _ in range(10)
+            ]
+
+            rows = [
+                ("all join", measure(join_all, queries, args.repeat)),
+                ("all mask", measure(mask_all, queries, args.repeat)),
+                ("any join", measure(join_any, queries, args.repeat)),
+                ("any mask", measure(mask_any, queries, args.repeat))
+            ]
+
+            db.session.remove()
+            db.engine.dispose()
+    finally:
+        for filename in os.listdir(directory):
+            os.remove(os.path.join(directory, filename))
+
+        os.rmdir(directory)
+
+    print(f"{'filter':<12}{'median ms':>12}")
+
+    for name, duration in rows:
+        print(f"{name:<12}{duration:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/python3
+"""
+Compare grid-indexed place searches with scanning every place.
+
+The baseline reads the coordinates of every place and filters them in
+Python, which is what clients did before bbox and near existed.
+
+Usage:
+    python -m benchmarks.bench_geo_search [--places 200000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import insert, select
+
+from app import create_app
+from app.extensions import db
+from app.geo import grid_col, grid_row, haversine_km
+from app.models.place import Place
+from app.models.user import User
+from app.services import facade
+from config import TestingConfig
+
+
+def seed(count, owner_id):
+    """
+    Insert places spread over the globe with dense urban clusters.
+    """
+
+    random.seed(42)
+    centers = [
+        (random.uniform(-60, 60), random.uniform(-180, 180))
+        for _ in range(50)
+    ]
+    batch = []
+
+    for index in range(count):
+        if index % 2:
+            center_latitude, center_longitude = random.choice(centers)
+            latitude = center_latitude + random.gauss(0, 0.5)
+            longitude = center_longitude + random.gauss(0, 0.5)
+        else:
+            latitude = random.uniform(-85, 85)
+            longitude = random.uniform(-180, 180)
+
+        latitude = max(-90.0, min(90.0, latitude))
+        longitude = (longitude + 180) % 360 - 180
+
+        batch.append({
+            "id": str(uuid.uuid4()),
+            "title": f"Place {index}",
+            "description": "",
+            "price": 100.0,
+            "latitude": latitude,
+            "longitude": longitude,
+            "owner_id": owner_id,
+            "geo_row": grid_row(latitude),
+            "geo_col": grid_col(longitude)
+        })
+
+        if len(batch) == 10000:
+            db.session.execute(insert(Place), batch)
+            batch = []
+
+    if batch:
+        db.session.execute(insert(Place), batch)
+
+    db.session.commit()
+
+    return centers
+
+
+def scan_near(latitude, longitude, radius_km, limit):
+    """
+    Baseline radius search reading every place.
+    """
+
+    matches = []
+
+    for place_id, place_latitude, place_longitude in db.session.execute(
+        select(Place.id, Place.latitude, Place.longitude)
+    ):
+        distance = haversine_km(
+            latitude,
+            longitude,
+            place_latitude,
+            place_longitude
+        )
+
+        if distance <= radius_km:
+            matches.append((distance, place_id))
+
+    return sorted(matches)[:limit]
+
+
+def scan_bbox(bbox, limit):
+    """
+    Baseline bounding-box search reading every place.
+    """
+
+    min_longitude, min_latitude, max_longitude, max_latitude = bbox
+
+    return [
+        place_id
+        for place_id, latitude, longitude in db.session.execute(
+            select(Place.id, Place.latitude, Place.longitude)
+        )
+        if min_latitude <= latitude <= max_latitude
+        and min_longitude <= longitude <= max_longitude
+    ][:limit]
+
+
+def measure(function, queries, repeat):
+    """
+    Return the median duration of a function over the queries in ms.
+    """
+
+    durations = []
+
+    for _ in range(repeat):
+        for query in queries:
+            db.session.remove()
+            started = time.perf_counter()
+            function(*query)
+            durations.append(time.perf_counter() - started)
+
+    return statistics.median(durations) * 1000
+
+
+def main():
+    """
+    Seed a database file and print median search latencies.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--places", type=int, default=200000)
+    parser.add_argument("--radius-km", type=float, default=10.0)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="hbnb-bench-")
+    path = os.path.join(directory, "geo.db")
+
+    class BenchmarkConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+        SERVER_TIMING_ENABLED = False
+        ENTITY_CACHE_ENABLED = False
+
+    app = create_app(BenchmarkConfig)
+
+    try:
+        with app.app_context():
+            owner = User(
+                first_name="Bench",
+                last_name="Owner",
+                email="bench@example.com",
+                password="benchmark"
+            )
+            db.session.add(owner)
+            db.session.commit()
+
+            started = time.perf_counter()
+            centers = seed(args.places, owner.id)
+            print(
+                f"seeded {args.places} places in "
+                f"{time.perf_counter() - started:.1f}s"
+            )
+
+            points = random.sample(centers, 10)
+            near_queries = [
+                (latitude, longitude, args.radius_km, args.limit)
+                for latitude, longitude in points
+            ]
+            bbox_queries = [
+                ((longitude - 0.2, latitude - 0.2,
+                  longitude + 0.2, latitude + 0.2), args.limit)
+                for latitude, longitude in points
+            ]
+
+            rows = [
+                (
+                    "near scan",
+                    measure(scan_near, near_queries, args.repeat)
+                ),
+                (
+                    "near grid",
+                    measure(
+                        facade.get_places_near_page,
+                        near_queries,
+                        args.repeat
+                    )
+                ),
+                (
+                    "bbox scan",
+                    measure(scan_bbox, bbox_queries, args.repeat)
+                ),
+                (
+                    "bbox grid",
+                    measure(
+                        facade.get_places_in_bbox_page,
+                        bbox_queries,
+                        args.repeat
+                    )
+                )
+            ]
+
+            db.session.remove()
+            db.engine.dispose()
+    finally:
+        for filename in os.listdir(directory):
+            os.remove(os.path.join(directory, filename))
+
+        os.rmdir(directory)
+
+    print(f"{'query':<12}{'median ms':>12}")
+
+    for name, duration in rows:
+        print(f"{name:<12}{duration:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
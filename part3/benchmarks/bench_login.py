@@ -0,0 +1,186 @@
+#!/usr/bin/python3
+"""
+Compare login throughput with inline and pooled password hashing.
+
+Client threads post logins to POST /api/v1/auth/login for a fixed
+duration while one more thread requests GET /api/v1/amenities/, once
+with bcrypt running on the request threads and once in the hashing
+pool. Logins per second, login latency, the latency of the cheap
+requests served alongside, and the peak hashing queue depth are
+printed.
+
+Usage:
+    python -m benchmarks.bench_login [--seconds 5] [--clients 8]
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from app import create_app
+from app.extensions import db
+from app.services import facade
+from config import TestingConfig
+
+
+def percentile(values, fraction):
+    """
+    Return a percentile of a list of values in milliseconds.
+    """
+
+    if not values:
+        return 0.0
+
+    values = sorted(values)
+    index = min(len(values) - 1, int(len(values) * fraction))
+
+    return values[index] * 1000
+
+
+def login(client, deadline, result):
+    """
+    Log in until the deadline.
+    """
+
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = client.post(
+            "/api/v1/auth/login",
+            json={
+                "email": "bench@example.com",
+                "password": "benchmark"
+            }
+        )
+
+        if response.status_code != 200:
+            result["errors"] += 1
+            continue
+
+        result["latencies"].append(time.perf_counter() - started)
+
+
+def browse(client, deadline, result):
+    """
+    Request a cheap listing until the deadline.
+    """
+
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        client.get("/api/v1/amenities/")
+        result["latencies"].append(time.perf_counter() - started)
+
+
+def run(name, workers, args):
+    """
+    Serve logins against a fresh database file.
+
+    Returns:
+        dict: Throughput, latencies, and pool counters.
+    """
+
+    path = os.path.join(
+        tempfile.mkdtemp(prefix="hbnb-bench-"),
+        f"{name}.db"
+    )
+
+    class BenchmarkConfig(TestingConfig):
+        SERVER_TIMING_ENABLED = False
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+        BCRYPT_LOG_ROUNDS = args.rounds
+        PASSWORD_HASH_WORKERS = workers
+
+    app = create_app(BenchmarkConfig)
+
+    with app.app_context():
+        db.create_all()
+        facade.create_user({
+            "first_name": "Bench",
+            "last_name": "User",
+            "email": "bench@example.com",
+            "password": "benchmark"
+        })
+        db.session.remove()
+
+    client = app.test_client()
+    logins = [
+        {"latencies": [], "errors": 0}
+        for _ in range(args.clients)
+    ]
+    reads = {"latencies": []}
+
+    # Start the worker processes before timing.
+    client.post(
+        "/api/v1/auth/login",
+        json={"email": "bench@example.com", "password": "benchmark"}
+    )
+
+    deadline = time.perf_counter() + args.seconds
+    threads = [
+        threading.Thread(target=login, args=(client, deadline, result))
+        for result in logins
+    ] + [
+        threading.Thread(target=browse, args=(client, deadline, reads))
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    pool = app.extensions["password_hasher"]
+    stats = pool.stats()
+    pool.shutdown()
+    latencies = [
+        latency
+        for result in logins
+        for latency in result["latencies"]
+    ]
+
+    return {
+        "logins": len(latencies) / args.seconds,
+        "login_p95": percentile(latencies, 0.95),
+        "read_p95": percentile(reads["latencies"], 0.95),
+        "errors": sum(result["errors"] for result in logins),
+        "peak_queue": stats["peak_pending"]
+    }
+
+
+def main():
+    """
+    Run both hashing modes and print a comparison table.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1
+    )
+    args = parser.parse_args()
+
+    rows = [
+        ("inline", run("inline", 0, args)),
+        (f"pool x{args.workers}", run("pool", args.workers, args))
+    ]
+
+    print(
+        f"{'hashing':<10}{'logins/s':>10}{'login p95':>11}"
+        f"{'read p95':>10}{'errors':>8}{'peak queue':>12}"
+    )
+
+    for name, row in rows:
+        print(
+            f"{name:<10}{row['logins']:>10.1f}{row['login_p95']:>11.1f}"
+            f"{row['read_p95']:>10.1f}{row['errors']:>8}"
+            f"{row['peak_queue']:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/python3
+"""
+Compare to_dict() serialization with the precompiled plans.
+
+Each run encodes one list of places, with their amenity IDs, the way
+GET /api/v1/places/ does: the previous path through Place.to_dict() and
+the standard library json module, then the serialization plans with the
+standard library and with orjson.
+
+Usage:
+    python -m benchmarks.bench_serialization [--places 5000]
+"""
+
+import argparse
+import json
+import statistics
+import time
+import uuid
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import selectinload
+
+from app import create_app
+from app.encoding import dumps_json, orjson
+from app.extensions import db
+from app.models.place import Place
+from app.models.place_amenity import place_amenity
+from app.models.user import User
+from app.serialization import PLACE_PLAN, SerializationPlan
+from app.services import facade
+from config import TestingConfig
+
+
+# The plan as built for each encoder, whichever one is installed.
+JSON_PLACE_PLAN = SerializationPlan(
+    Place,
+    PLACE_PLAN.keys,
+    computed=dict(PLACE_PLAN.computed),
+    format_datetimes=True
+)
+ORJSON_PLACE_PLAN = SerializationPlan(
+    Place,
+    PLACE_PLAN.keys,
+    computed=dict(PLACE_PLAN.computed),
+    format_datetimes=False
+)
+
+
+def seed(count, amenities, owner_id):
+    """
+    Insert places linked to three amenities each.
+    """
+
+    places = []
+    links = []
+
+    for index in range(count):
+        place_id = str(uuid.uuid4())
+
+        places.append({
+            "id": place_id,
+            "title": f"Place {index}",
+            "description": "A quiet place near the beach",
+            "price": 100.0 + index,
+            "latitude": 10.0,
+            "longitude": 20.0,
+            "owner_id": owner_id
+        })
+
+        for amenity in amenities[index % 3:index % 3 + 3]:
+            links.append({
+                "place_id": place_id,
+                "amenity_id": amenity.id
+            })
+
+    db.session.execute(insert(Place), places)
+    db.session.execute(insert(place_amenity), links)
+    db.session.commit()
+
+
+def to_dict_json(places):
+    """
+    Previous path: to_dict() per place, then the stdlib encoder.
+    """
+
+    return json.dumps([place.to_dict() for place in places]).encode()
+
+
+def plan_json(places):
+    """
+    Serialization plans with the standard library encoder.
+    """
+
+    return dumps_json(JSON_PLACE_PLAN.many(places))
+
+
+def plan_orjson(places):
+    """
+    Serialization plans with orjson.
+    """
+
+    return orjson.dumps(ORJSON_PLACE_PLAN.many(places))
+
+
+def measure(function, places, repeat):
+    """
+    Return the median duration of a function in milliseconds.
+    """
+
+    durations = []
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(places)
+        durations.append(time.perf_counter() - started)
+
+    return statistics.median(durations) * 1000
+
+
+def main():
+    """
+    Seed an in-memory database and print median encoding times.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--places", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    class BenchmarkConfig(TestingConfig):
+        SERVER_TIMING_ENABLED = False
+
+    app = create_app(BenchmarkConfig)
+
+    with app.app_context():
+        owner = User(
+            first_name="Bench",
+            last_name="Owner",
+            email="bench@example.com",
+            password="benchmark"
+        )
+        db.session.add(owner)
+        db.session.commit()
+
+        amenities = [
+            facade.create_amenity({"name": f"Amenity {index}"})
+            for index in range(5)
+        ]
+        seed(args.places, amenities, owner.id)
+
+        places = db.session.execute(
+            select(Place).options(selectinload(Place.amenities))
+        ).scalars().all()
+
+        if to_dict_json(places) != json.dumps(
+            json.loads(plan_json(places))
+        ).encode():
+            raise SystemExit("plan output differs from to_dict()")
+
+        rows = [
+            ("to_dict + json", measure(to_dict_json, places, args.repeat)),
+            ("plan + json", measure(plan_json, places, args.repeat))
+        ]
+
+        if orjson is not None:
+            rows.append(
+                ("plan + orjson", measure(plan_orjson, places, args.repeat))
+            )
+
+    print(f"{'path':<16}{'median ms':>12}{'per place us':>16}")
+
+    for name, duration in rows:
+        per_place = duration * 1000 / args.places
+        print(f"{name:<16}{duration:>12.2f}{per_place:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
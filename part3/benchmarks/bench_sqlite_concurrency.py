@@ -0,0 +1,260 @@
+#!/usr/bin/python3
+"""
+Compare SQLite read/write concurrency with and without the production
+PRAGMA profile.
+
+Readers look up places by ID while writers insert reviews, each thread
+on its own connection, for a fixed duration.
+
+Usage:
+    python -m benchmarks.bench_sqlite_concurrency [--seconds 5]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+
+from app.persistence.sqlite import apply_sqlite_pragmas
+from config import ProductionConfig
+
+
+PROFILES = {
+    "default": {},
+    "production": ProductionConfig.SQLITE_PRAGMAS
+}
+
+
+def connect(path, pragmas):
+    """
+    Open a connection configured like the application engine.
+    """
+
+    connection = sqlite3.connect(path, check_same_thread=False)
+    apply_sqlite_pragmas(connection, pragmas)
+
+    return connection
+
+
+def seed(path, pragmas, places):
+    """
+    Create the benchmark tables and insert places.
+
+    Returns:
+        list: Inserted place IDs.
+    """
+
+    connection = connect(path, pragmas)
+    place_ids = [str(uuid.uuid4()) for _ in range(places)]
+
+    connection.executescript(
+        """
+        CREATE TABLE places (
+            id CHAR(36) PRIMARY KEY,
+            title VARCHAR(100) NOT NULL,
+            price FLOAT NOT NULL
+        );
+        CREATE TABLE reviews (
+            id CHAR(36) PRIMARY KEY,
+            text TEXT NOT NULL,
+            rating INTEGER NOT NULL,
+            place_id CHAR(36) NOT NULL REFERENCES places(id)
+        );
+        CREATE INDEX ix_reviews_place_id ON reviews(place_id);
+        """
+    )
+    connection.executemany(
+        "INSERT INTO places (id, title, price) VALUES (?, ?, ?)",
+        [
+            (place_id, f"Place {index}", float(index % 300))
+            for index, place_id in enumerate(place_ids)
+        ]
+    )
+    connection.commit()
+    connection.close()
+
+    return place_ids
+
+
+def reader(path, pragmas, place_ids, deadline, result):
+    """
+    Look up a place and its review count until the deadline.
+    """
+
+    connection = connect(path, pragmas)
+
+    while time.perf_counter() < deadline:
+        place_id = random.choice(place_ids)
+        started = time.perf_counter()
+
+        try:
+            connection.execute(
+                "SELECT id, title, price FROM places WHERE id = ?",
+                (place_id,)
+            ).fetchone()
+            connection.execute(
+                "SELECT COUNT(*) FROM reviews WHERE place_id = ?",
+                (place_id,)
+            ).fetchone()
+        except sqlite3.OperationalError:
+            result["errors"] += 1
+            continue
+
+        result["latencies"].append(time.perf_counter() - started)
+
+    connection.close()
+
+
+def writer(path, pragmas, place_ids, deadline, result):
+    """
+    Insert one review per transaction until the deadline.
+    """
+
+    connection = connect(path, pragmas)
+
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+
+        try:
+            connection.execute(
+                "INSERT INTO reviews (id, text, rating, place_id) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    str(uuid.uuid4()),
+                    "Benchmark review",
+                    random.randint(1, 5),
+                    random.choice(place_ids)
+                )
+            )
+            connection.commit()
+        except sqlite3.OperationalError:
+            connection.rollback()
+            result["errors"] += 1
+            continue
+
+        result["latencies"].append(time.perf_counter() - started)
+
+    connection.close()
+
+
+def percentile(values, fraction):
+    """
+    Return a percentile of a list of values in milliseconds.
+    """
+
+    if not values:
+        return 0.0
+
+    values = sorted(values)
+    index = min(len(values) - 1, int(len(values) * fraction))
+
+    return values[index] * 1000
+
+
+def run_profile(name, pragmas, args):
+    """
+    Run readers and writers against a fresh database file.
+
+    Returns:
+        dict: Throughput, latency, and error counts.
+    """
+
+    directory = tempfile.mkdtemp(prefix="hbnb-bench-")
+    path = os.path.join(directory, f"{name}.db")
+    place_ids = seed(path, pragmas, args.places)
+
+    reads = [
+        {"latencies": [], "errors": 0}
+        for _ in range(args.readers)
+    ]
+    writes = [
+        {"latencies": [], "errors": 0}
+        for _ in range(args.writers)
+    ]
+    deadline = time.perf_counter() + args.seconds
+
+    threads = [
+        threading.Thread(
+            target=reader,
+            args=(path, pragmas, place_ids, deadline, result)
+        )
+        for result in reads
+    ] + [
+        threading.Thread(
+            target=writer,
+            args=(path, pragmas, place_ids, deadline, result)
+        )
+        for result in writes
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    read_latencies = [
+        latency
+        for result in reads
+        for latency in result["latencies"]
+    ]
+    write_latencies = [
+        latency
+        for result in writes
+        for latency in result["latencies"]
+    ]
+
+    for filename in os.listdir(directory):
+        os.remove(os.path.join(directory, filename))
+
+    os.rmdir(directory)
+
+    return {
+        "profile": name,
+        "reads_per_s": len(read_latencies) / args.seconds,
+        "writes_per_s": len(write_latencies) / args.seconds,
+        "read_p95_ms": percentile(read_latencies, 0.95),
+        "write_p95_ms": percentile(write_latencies, 0.95),
+        "errors": sum(
+            result["errors"]
+            for result in reads + writes
+        )
+    }
+
+
+def main():
+    """
+    Run every profile and print a comparison table.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--places", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(
+        f"{'profile':<12}{'reads/s':>12}{'writes/s':>12}"
+        f"{'read p95 ms':>14}{'write p95 ms':>14}{'errors':>8}"
+    )
+
+    for name, pragmas in PROFILES.items():
+        result = run_profile(name, pragmas, args)
+
+        print(
+            f"{result['profile']:<12}"
+            f"{result['reads_per_s']:>12.0f}"
+            f"{result['writes_per_s']:>12.0f}"
+            f"{result['read_p95_ms']:>14.3f}"
+            f"{result['write_p95_ms']:>14.3f}"
+            f"{result['errors']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
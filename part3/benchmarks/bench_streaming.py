@@ -0,0 +1,135 @@
+#!/usr/bin/python3
+"""
+Compare a buffered place listing with the streamed one.
+
+Each run requests every place through GET /api/v1/places/, once as a
+single page holding all of them and once with ?stream=json and
+?stream=ndjson, reading the body chunk by chunk. Time to first byte,
+total time, and the peak memory traced during the request are printed.
+
+Usage:
+    python -m benchmarks.bench_streaming [--places 50000]
+"""
+
+import argparse
+import time
+import tracemalloc
+import uuid
+
+from sqlalchemy import insert
+
+from app import create_app
+from app.extensions import db
+from app.models.place import Place
+from app.models.user import User
+from config import TestingConfig
+
+
+def seed(count, owner_id):
+    """
+    Insert places in one statement.
+    """
+
+    db.session.execute(
+        insert(Place),
+        [
+            {
+                "id": str(uuid.uuid4()),
+                "title": f"Place {index}",
+                "description": "A quiet place near the beach",
+                "price": 100.0 + index % 500,
+                "latitude": 10.0,
+                "longitude": 20.0,
+                "owner_id": owner_id
+            }
+            for index in range(count)
+        ]
+    )
+    db.session.commit()
+
+
+def measure(client, url):
+    """
+    Request a URL and consume its body without keeping it.
+
+    Returns:
+        tuple: Time to first byte and total time in milliseconds, peak
+        traced memory in MiB, and body size in bytes.
+    """
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    first_byte = None
+    size = 0
+
+    response = client.get(url, buffered=False)
+
+    for chunk in response.response:
+        if first_byte is None and chunk:
+            first_byte = time.perf_counter() - started
+
+        size += len(chunk)
+
+    response.close()
+    total = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return first_byte * 1000, total * 1000, peak / 2 ** 20, size
+
+
+def main():
+    """
+    Seed an in-memory database and print timings and peak memory.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--places", type=int, default=50000)
+    args = parser.parse_args()
+
+    class BenchmarkConfig(TestingConfig):
+        SERVER_TIMING_ENABLED = False
+        PAGE_SIZE_MAX = args.places
+
+    app = create_app(BenchmarkConfig)
+
+    with app.app_context():
+        owner = User(
+            first_name="Bench",
+            last_name="Owner",
+            email="bench@example.com",
+            password="benchmark"
+        )
+        db.session.add(owner)
+        db.session.commit()
+        seed(args.places, owner.id)
+        db.session.remove()
+
+        client = app.test_client()
+        fields = "fields=title,price"
+        rows = [
+            (
+                "buffered page",
+                measure(
+                    client,
+                    f"/api/v1/places/?limit={args.places}&{fields}"
+                )
+            ),
+            (
+                "stream=json",
+                measure(client, f"/api/v1/places/?stream=json&{fields}")
+            ),
+            (
+                "stream=ndjson",
+                measure(client, f"/api/v1/places/?stream=ndjson&{fields}")
+            )
+        ]
+
+    print(f"{'path':<16}{'ttfb ms':>10}{'total ms':>10}{'peak MiB':>10}")
+
+    for name, (first_byte, total, peak, _) in rows:
+        print(f"{name:<16}{first_byte:>10.1f}{total:>10.1f}{peak:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,59 @@ class Config:
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     DEBUG = False
+
+    # Keep committed objects loaded so responses are serialized from the
+    # state just written. Sessions are request-scoped, so objects never
+    # outlive the request that loaded them.
+    SQLALCHEMY_EXPIRE_ON_COMMIT = False
+
+    # Collection endpoints return pages of at most PAGE_SIZE_MAX items.
+    PAGE_SIZE_DEFAULT = 50
+    PAGE_SIZE_MAX = 200
+
+    # Largest radius accepted by place searches with near=.
+    GEO_MAX_RADIUS_KM = 500
+
+    # Rows inserted and committed together by flask hbnb import.
+    IMPORT_BATCH_SIZE = 1000
+
+    # bcrypt cost factor; each step doubles the time of a hash.
+    BCRYPT_LOG_ROUNDS = 12
+
+    # Hashing runs in this many worker processes, 0 meaning inline on
+    # the request thread. Requests wait up to PASSWORD_HASH_TIMEOUT
+    # seconds once PASSWORD_HASH_MAX_PENDING jobs are queued.
+    PASSWORD_HASH_WORKERS = int(
+        os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1)
+    )
+    PASSWORD_HASH_MAX_PENDING = 64
+    PASSWORD_HASH_TIMEOUT = 10.0
+
+    # Read-through primary-key cache, sized per table.
+    ENTITY_CACHE_ENABLED = True
+    ENTITY_CACHE_TTL = 300
+    ENTITY_CACHE_SIZES = {
+        "users": 1024,
+        "places": 4096,
+        "reviews": 1024,
+        "amenities": 256
+    }
+
+    # HTTP response cache for hot collection endpoints. The sqlite
+    # backend shares entries between workers through one file, by
+    # default instance/response_cache.db.
+    RESPONSE_CACHE_ENABLED = True
+    RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+    RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH")
+    RESPONSE_CACHE_TTL = 60
+    RESPONSE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+    # PRAGMA settings applied to every new SQLite connection.
+    SQLITE_PRAGMAS = {}
+
+    # Per-request query counts and phase timings.
+    SERVER_TIMING_ENABLED = False
+    REQUEST_METRICS_LOG_ENABLED = False
     TESTING = False
 
 
@@ -33,12 +86,58 @@ class DevelopmentConfig(Config):
 
     DEBUG = True
 
+    SERVER_TIMING_ENABLED = True
+    REQUEST_METRICS_LOG_ENABLED = True
+
     SQLALCHEMY_DATABASE_URI = os.getenv(
         "DATABASE_URL",
         "sqlite:///development.db"
     )
 
 
+class ProductionConfig(Config):
+    """
+    Production configuration tuned for concurrent SQLite access.
+
+    WAL lets readers proceed while a writer commits, synchronous=NORMAL
+    avoids an fsync per commit while staying durable across application
+    crashes, and busy_timeout makes writers wait for the lock instead of
+    failing with "database is locked".
+    """
+
+    SQLALCHEMY_DATABASE_URI = os.getenv(
+        "DATABASE_URL",
+        "sqlite:///production.db"
+    )
+
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", 268435456)),
+        "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", -65536)),
+        "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", 5000)),
+        "foreign_keys": "ON"
+    }
+
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": int(os.getenv("SQLALCHEMY_POOL_SIZE", 10)),
+        "max_overflow": int(os.getenv("SQLALCHEMY_MAX_OVERFLOW", 20)),
+        "pool_timeout": int(os.getenv("SQLALCHEMY_POOL_TIMEOUT", 30)),
+        "pool_recycle": int(os.getenv("SQLALCHEMY_POOL_RECYCLE", 3600)),
+        "connect_args": {
+            "check_same_thread": False
+        }
+    }
+
+    # Gunicorn and similar servers run several workers per host.
+    RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "sqlite")
+
+    # The entity cache lives in each worker and is only invalidated by
+    # that worker's writes, so other workers would keep serving stale
+    # users, including roles and password hashes, until the TTL.
+    ENTITY_CACHE_ENABLED = False
+
+
 class TestingConfig(Config):
     """
     Testing configuration using an in-memory SQLite database.
@@ -46,6 +145,15 @@ class TestingConfig(Config):
 
     TESTING = True
 
+    SERVER_TIMING_ENABLED = True
+
+    # Tests count queries per request; cached responses skip them.
+    RESPONSE_CACHE_ENABLED = False
+
+    # Cheap inline hashing keeps tests fast.
+    BCRYPT_LOG_ROUNDS = 4
+    PASSWORD_HASH_WORKERS = 0
+
     SECRET_KEY = (
         "testing-secret-key-with-at-least-thirty-two-bytes"
     )
@@ -59,6 +167,7 @@ class TestingConfig(Config):
 
 config = {
     "development": DevelopmentConfig,
+    "production": ProductionConfig,
     "testing": TestingConfig,
     "default": DevelopmentConfig
 }
@@ -1,6 +1,10 @@
 #!/usr/bin/python3
 """
 Run the HBnB Flask application.
+
+The application is only created when the script runs, not on import:
+password hashing workers import the main module when they start.
+``flask --app run`` finds the create_app factory imported here.
 """
 
 import os
@@ -10,9 +14,6 @@ from app.extensions import db
 from app.services import facade
 
 
-app = create_app()
-
-
 def create_default_admin():
     """
     Create a development administrator when one does not exist.
@@ -53,6 +54,8 @@ def create_default_admin():
 
 
 if __name__ == "__main__":
+    app = create_app()
+
     with app.app_context():
         db.create_all()
         create_default_admin()
@@ -2,6 +2,7 @@
 
 PRAGMA foreign_keys = ON;
 
+DROP TABLE IF EXISTS places_fts;
 DROP TABLE IF EXISTS place_amenity;
 DROP TABLE IF EXISTS reviews;
 DROP TABLE IF EXISTS places;
@@ -31,6 +32,17 @@ CREATE TABLE places (
     longitude FLOAT NOT NULL
         CHECK (longitude >= -180 AND longitude <= 180),
     owner_id VARCHAR(36) NOT NULL,
+    amenity_mask BIGINT NOT NULL DEFAULT 0,
+    review_count INTEGER NOT NULL DEFAULT 0,
+    rating_sum INTEGER NOT NULL DEFAULT 0,
+    rating_1 INTEGER NOT NULL DEFAULT 0,
+    rating_2 INTEGER NOT NULL DEFAULT 0,
+    rating_3 INTEGER NOT NULL DEFAULT 0,
+    rating_4 INTEGER NOT NULL DEFAULT 0,
+    rating_5 INTEGER NOT NULL DEFAULT 0,
+    average_rating FLOAT NOT NULL DEFAULT 0,
+    geo_row INTEGER,
+    geo_col INTEGER,
     FOREIGN KEY (owner_id)
         REFERENCES users(id)
         ON DELETE CASCADE
@@ -59,7 +71,8 @@ CREATE TABLE amenities (
     id VARCHAR(36) PRIMARY KEY,
     created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-    name VARCHAR(50) NOT NULL UNIQUE
+    name VARCHAR(50) NOT NULL UNIQUE,
+    bit INTEGER UNIQUE
 );
 
 CREATE TABLE place_amenity (
@@ -82,3 +95,73 @@ ON reviews(user_id);
 
 CREATE INDEX idx_reviews_place_id
 ON reviews(place_id);
+
+CREATE INDEX ix_users_created_at_id
+ON users(created_at, id);
+
+CREATE INDEX ix_places_created_at_id
+ON places(created_at, id);
+
+CREATE INDEX ix_amenities_created_at_id
+ON amenities(created_at, id);
+
+CREATE INDEX ix_reviews_created_at_id
+ON reviews(created_at, id);
+
+CREATE INDEX ix_reviews_place_id_created_at_id
+ON reviews(place_id, created_at, id);
+
+CREATE INDEX ix_places_price_id
+ON places(price, id);
+
+CREATE INDEX ix_places_average_rating_id
+ON places(average_rating, id);
+
+CREATE INDEX ix_place_amenity_amenity_id_place_id
+ON place_amenity(amenity_id, place_id);
+
+CREATE INDEX ix_places_geo_grid
+ON places(geo_row, geo_col, latitude, longitude);
+
+CREATE INDEX ix_users_updated_at
+ON users(updated_at);
+
+CREATE INDEX ix_places_updated_at
+ON places(updated_at);
+
+CREATE INDEX ix_amenities_updated_at
+ON amenities(updated_at);
+
+CREATE INDEX ix_reviews_updated_at
+ON reviews(updated_at);
+
+CREATE VIRTUAL TABLE places_fts USING fts5(
+    title,
+    description,
+    content='places',
+    content_rowid='rowid',
+    tokenize='porter unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER places_fts_after_insert
+AFTER INSERT ON places
+BEGIN
+    INSERT INTO places_fts (rowid, title, description)
+    VALUES (new.rowid, new.title, new.description);
+END;
+
+CREATE TRIGGER places_fts_after_delete
+AFTER DELETE ON places
+BEGIN
+    INSERT INTO places_fts (places_fts, rowid, title, description)
+    VALUES ('delete', old.rowid, old.title, old.description);
+END;
+
+CREATE TRIGGER places_fts_after_update
+AFTER UPDATE OF title, description ON places
+BEGIN
+    INSERT INTO places_fts (places_fts, rowid, title, description)
+    VALUES ('delete', old.rowid, old.title, old.description);
+    INSERT INTO places_fts (rowid, title, description)
+    VALUES (new.rowid, new.title, new.description);
+END;
@@ -3,10 +3,15 @@
 Tests for the authenticated HBnB API endpoints.
 """
 
+from contextlib import contextmanager
+import json
 import unittest
 
+from sqlalchemy import event
+
 from app import create_app
-from app.extensions import db
+from app.extensions import db, response_cache
+from app.persistence.repository import encode_cursor_values
 from app.services import facade
 
 
@@ -111,6 +116,32 @@ class HBnBApiTestCase(unittest.TestCase):
 
         return user, token
 
+    @contextmanager
+    def count_queries(self):
+        """
+        Count SQL statements executed inside the block.
+        """
+        statements = []
+
+        def before_cursor_execute(*args):
+            statements.append(args[2])
+
+        db.session.remove()
+        event.listen(
+            db.engine,
+            "before_cursor_execute",
+            before_cursor_execute
+        )
+
+        try:
+            yield statements
+        finally:
+            event.remove(
+                db.engine,
+                "before_cursor_execute",
+                before_cursor_execute
+            )
+
     def create_place(self, token, title="Test Place"):
         """
         Create a place and return its ID.
@@ -653,6 +684,986 @@ class HBnBApiTestCase(unittest.TestCase):
 
         self.assertEqual(response.status_code, 400)
 
+    # Pagination tests
+
+    def test_amenity_list_pages_with_cursor(self):
+        """
+        Test that cursor pages cover every amenity exactly once.
+        """
+        for name in ["WiFi", "Pool", "Parking", "Kitchen", "Gym"]:
+            facade.create_amenity({"name": name})
+
+        seen = []
+        cursor = None
+
+        while True:
+            url = "/api/v1/amenities/?limit=2"
+
+            if cursor:
+                url += f"&cursor={cursor}"
+
+            response = self.client.get(url)
+
+            self.assertEqual(response.status_code, 200)
+
+            data = response.get_json()
+
+            self.assertLessEqual(len(data["items"]), 2)
+
+            seen.extend(item["name"] for item in data["items"])
+            cursor = data["next_cursor"]
+
+            if not cursor:
+                break
+
+        self.assertEqual(
+            sorted(seen),
+            sorted(["WiFi", "Pool", "Parking", "Kitchen", "Gym"])
+        )
+
+    def test_place_list_returns_next_cursor(self):
+        """
+        Test that a partial place page returns a cursor.
+        """
+        _, token = self.create_regular_token()
+
+        first_id = self.create_place(token, title="First")
+        second_id = self.create_place(token, title="Second")
+
+        first_page = self.client.get("/api/v1/places/?limit=1")
+        data = first_page.get_json()
+
+        self.assertEqual(first_page.status_code, 200)
+        self.assertEqual(len(data["items"]), 1)
+        self.assertIsNotNone(data["next_cursor"])
+
+        second_page = self.client.get(
+            "/api/v1/places/?limit=1&cursor="
+            + data["next_cursor"]
+        )
+        second_data = second_page.get_json()
+
+        self.assertEqual(
+            {data["items"][0]["id"], second_data["items"][0]["id"]},
+            {first_id, second_id}
+        )
+        self.assertIsNone(second_data["next_cursor"])
+
+    def test_place_list_streams_json_and_ndjson(self):
+        """
+        Test that streamed listings hold every place of the page view.
+        """
+        _, token = self.create_regular_token()
+
+        for title in ["First", "Second", "Third"]:
+            self.create_place(token, title=title)
+
+        page = self.client.get("/api/v1/places/?fields=title").get_json()
+
+        # Streamed responses keep their request context until closed.
+        with self.client.get(
+            "/api/v1/places/?stream=json&fields=title"
+        ) as streamed:
+            self.assertEqual(streamed.status_code, 200)
+            self.assertIn("ETag", streamed.headers)
+            self.assertEqual(streamed.get_json(), page)
+
+        with self.client.get(
+            "/api/v1/places/?stream=ndjson&fields=title"
+        ) as lines:
+            self.assertEqual(lines.mimetype, "application/x-ndjson")
+            self.assertEqual(
+                [
+                    json.loads(line)
+                    for line in lines.get_data(as_text=True).splitlines()
+                ],
+                page["items"]
+            )
+
+        invalid = self.client.get("/api/v1/places/?stream=xml")
+
+        self.assertEqual(invalid.status_code, 400)
+
+    def test_list_rejects_invalid_pagination(self):
+        """
+        Test that malformed limits and cursors are rejected.
+        """
+        self.assertEqual(
+            self.client.get("/api/v1/places/?limit=0").status_code,
+            400
+        )
+        self.assertEqual(
+            self.client.get("/api/v1/users/?limit=abc").status_code,
+            400
+        )
+        self.assertEqual(
+            self.client.get(
+                "/api/v1/reviews/?cursor=not-a-cursor"
+            ).status_code,
+            400
+        )
+
+    def test_list_rejects_mistyped_cursor_values(self):
+        """
+        Test that well-formed cursors with values of the wrong type
+        are rejected without reaching the database.
+        """
+        self.create_priced_places(80, 20)
+
+        for url, values in (
+            ("/api/v1/places/?", ["2020-01-01T00:00:00", {"a": 1}]),
+            ("/api/v1/places/?", ["2020-01-01T00:00:00", ["id"]]),
+            ("/api/v1/places/?", ["yesterday", "id"]),
+            ("/api/v1/places/?sort=price&", ["cheap", "id"]),
+            ("/api/v1/places/?sort=price&", [True, "id"])
+        ):
+            response = self.client.get(
+                url + "cursor=" + encode_cursor_values(values)
+            )
+
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(
+                response.get_json(),
+                {"error": "Invalid cursor"}
+            )
+
+    # Filter and sort tests
+
+    def create_priced_places(self, *prices, amenity_ids=None, owner=None):
+        """
+        Create places with the given prices and return their IDs.
+        """
+        owner = owner or self.create_user()
+
+        return [
+            facade.create_place({
+                "title": f"Place {price}",
+                "description": "Priced place",
+                "price": price,
+                "latitude": 10,
+                "longitude": 20,
+                "owner_id": owner.id,
+                "amenity_ids": amenity_ids or []
+            }).id
+            for price in prices
+        ]
+
+    def test_place_list_filters_and_sorts_by_price(self):
+        """
+        Test price filters with price sorting across pages.
+        """
+        ids = self.create_priced_places(80, 20, 150, 50)
+
+        first_page = self.client.get(
+            "/api/v1/places/?min_price=30&max_price=100"
+            "&sort=-price&limit=1"
+        ).get_json()
+        second_page = self.client.get(
+            "/api/v1/places/?min_price=30&max_price=100"
+            "&sort=-price&limit=1&cursor=" + first_page["next_cursor"]
+        ).get_json()
+
+        self.assertEqual(
+            [
+                item["id"]
+                for item in first_page["items"] + second_page["items"]
+            ],
+            [ids[0], ids[3]]
+        )
+        self.assertIsNone(second_page["next_cursor"])
+
+    def test_place_list_filters_by_amenities_and_rating(self):
+        """
+        Test all-of amenity filtering and minimum rating.
+        """
+        wifi_id, pool_id = [
+            facade.create_amenity({"name": name}).id
+            for name in ["WiFi", "Pool"]
+        ]
+        owner = self.create_user()
+        both_id, = self.create_priced_places(
+            100,
+            amenity_ids=[wifi_id, pool_id],
+            owner=owner
+        )
+        wifi_only_id, = self.create_priced_places(
+            90,
+            amenity_ids=[wifi_id],
+            owner=owner
+        )
+        reviewer = self.create_user(email="reviewer@test.com")
+
+        for place_id, rating in [(both_id, 2), (wifi_only_id, 5)]:
+            facade.create_review({
+                "text": "Stayed here",
+                "rating": rating,
+                "user_id": reviewer.id,
+                "place_id": place_id
+            })
+
+        with_both = self.client.get(
+            f"/api/v1/places/?amenity={wifi_id},{pool_id}"
+        ).get_json()
+        rated = self.client.get(
+            f"/api/v1/places/?amenity={wifi_id}&min_rating=4"
+        ).get_json()
+        by_rating = self.client.get(
+            "/api/v1/places/?sort=rating"
+        ).get_json()
+        with_any = self.client.get(
+            f"/api/v1/places/?amenity_any={pool_id},unknown"
+        ).get_json()
+
+        self.assertEqual(
+            [item["id"] for item in with_both["items"]],
+            [both_id]
+        )
+        self.assertEqual(
+            [item["id"] for item in rated["items"]],
+            [wifi_only_id]
+        )
+        self.assertEqual(
+            [item["id"] for item in by_rating["items"]],
+            [wifi_only_id, both_id]
+        )
+        self.assertEqual(
+            [item["id"] for item in with_any["items"]],
+            [both_id]
+        )
+
+    def test_place_list_rejects_invalid_filters(self):
+        """
+        Test that malformed filters and sorts are rejected.
+        """
+        for query in [
+            "min_price=abc",
+            "max_price=-1",
+            "min_price=50&max_price=10",
+            "min_rating=6",
+            "sort=title",
+            "near=0,0&radius_km=5&sort=price"
+        ]:
+            response = self.client.get(f"/api/v1/places/?{query}")
+
+            self.assertEqual(response.status_code, 400, query)
+
+    # Geographic search tests
+
+    def create_located_places(self, *coordinates):
+        """
+        Create places at (title, latitude, longitude) coordinates.
+        """
+        owner = self.create_user()
+
+        return {
+            title: facade.create_place({
+                "title": title,
+                "description": "Located place",
+                "price": 100,
+                "latitude": latitude,
+                "longitude": longitude,
+                "owner_id": owner.id
+            }).id
+            for title, latitude, longitude in coordinates
+        }
+
+    def test_place_list_filters_by_bbox(self):
+        """
+        Test that bbox returns only places inside the box.
+        """
+        ids = self.create_located_places(
+            ("Paris", 48.8566, 2.3522),
+            ("Versailles", 48.8049, 2.1204),
+            ("London", 51.5072, -0.1276),
+            ("Fiji", -17.7134, 178.065),
+            ("Samoa", -13.759, -172.1046)
+        )
+
+        response = self.client.get(
+            "/api/v1/places/?bbox=2.0,48.7,2.5,48.9"
+        )
+        wrapped = self.client.get(
+            "/api/v1/places/?bbox=175,-20,-170,-10"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            {item["id"] for item in response.get_json()["items"]},
+            {ids["Paris"], ids["Versailles"]}
+        )
+        self.assertEqual(
+            {item["id"] for item in wrapped.get_json()["items"]},
+            {ids["Fiji"], ids["Samoa"]}
+        )
+
+    def test_place_list_near_sorts_by_distance(self):
+        """
+        Test that near returns places within the radius, nearest first.
+        """
+        ids = self.create_located_places(
+            ("Versailles", 48.8049, 2.1204),
+            ("Paris", 48.8566, 2.3522),
+            ("Orleans", 47.9029, 1.9093),
+            ("London", 51.5072, -0.1276)
+        )
+
+        first_page = self.client.get(
+            "/api/v1/places/?near=48.85,2.35&radius_km=150&limit=2"
+        ).get_json()
+        second_page = self.client.get(
+            "/api/v1/places/?near=48.85,2.35&radius_km=150&limit=2"
+            "&cursor=" + first_page["next_cursor"]
+        ).get_json()
+        items = first_page["items"] + second_page["items"]
+
+        self.assertEqual(
+            [item["id"] for item in items],
+            [ids["Paris"], ids["Versailles"], ids["Orleans"]]
+        )
+        self.assertLess(items[0]["distance_km"], 1)
+        self.assertIsNone(second_page["next_cursor"])
+
+    def test_place_list_near_keeps_places_at_the_box_edge(self):
+        """
+        Test that places just inside the radius survive the prefilter.
+        """
+        ids = self.create_located_places(
+            ("North", 0.899, 0.0),
+            ("East", 0.0, 0.899),
+            ("Outside", 0.9, 0.0)
+        )
+
+        items = self.client.get(
+            "/api/v1/places/?near=0,0&radius_km=100"
+        ).get_json()["items"]
+
+        self.assertEqual(
+            sorted(item["id"] for item in items),
+            sorted([ids["North"], ids["East"]])
+        )
+        self.assertTrue(all(item["distance_km"] <= 100 for item in items))
+
+    def test_place_list_rejects_invalid_geo_parameters(self):
+        """
+        Test that malformed search areas are rejected.
+        """
+        for query in [
+            "bbox=1,2,3",
+            "bbox=0,50,1,40",
+            "near=48.8,2.3",
+            "near=48.8,2.3&radius_km=-1",
+            "near=91,0&radius_km=5",
+            "radius_km=5",
+            "bbox=0,0,1,1&near=0,0&radius_km=5"
+        ]:
+            response = self.client.get(f"/api/v1/places/?{query}")
+
+            self.assertEqual(response.status_code, 400, query)
+
+    # Full-text search tests
+
+    def test_place_search_ranks_and_highlights_matches(self):
+        """
+        Test that search ranks title matches first and pages results.
+        """
+        owner = self.create_user()
+        places = {}
+
+        for title, description in [
+            ("Beach cottage", "Steps from the sand"),
+            ("City loft", "Walk to the beach in <10> minutes"),
+            ("Mountain cabin", "Quiet and remote")
+        ]:
+            places[title] = facade.create_place({
+                "title": title,
+                "description": description,
+                "price": 100,
+                "latitude": 10,
+                "longitude": 20,
+                "owner_id": owner.id
+            }).id
+
+        first_page = self.client.get(
+            "/api/v1/places/search?q=beach&limit=1"
+        ).get_json()
+        second_page = self.client.get(
+            "/api/v1/places/search?q=beach&limit=1&cursor="
+            + first_page["next_cursor"]
+        ).get_json()
+
+        first = first_page["items"][0]
+        second = second_page["items"][0]
+
+        self.assertEqual(first["id"], places["Beach cottage"])
+        self.assertEqual(
+            first["search"]["title"],
+            "<mark>Beach</mark> cottage"
+        )
+        self.assertEqual(second["id"], places["City loft"])
+        self.assertIn("&lt;10&gt;", second["search"]["description"])
+        self.assertIsNone(second_page["next_cursor"])
+
+    def test_place_search_follows_updates(self):
+        """
+        Test that the search index follows title updates.
+        """
+        owner = self.create_user()
+        place = facade.create_place({
+            "title": "Beach cottage",
+            "description": "Cozy",
+            "price": 100,
+            "latitude": 10,
+            "longitude": 20,
+            "owner_id": owner.id
+        })
+
+        facade.update_place(place.id, {"title": "Lake house"})
+
+        beach = self.client.get("/api/v1/places/search?q=beach")
+        lake = self.client.get("/api/v1/places/search?q=lak")
+        empty = self.client.get("/api/v1/places/search?q=%22%2A")
+
+        self.assertEqual(beach.get_json()["items"], [])
+        self.assertEqual(
+            [item["id"] for item in lake.get_json()["items"]],
+            [place.id]
+        )
+        self.assertEqual(empty.status_code, 400)
+
+    # Eager loading tests
+
+    def test_place_detail_query_count_is_constant(self):
+        """
+        Test that place details do not lazy load each review author.
+        """
+        owner, token = self.create_regular_token()
+        owner_id = owner.id
+        place_id = self.create_place(token)
+
+        for name in ["WiFi", "Pool", "Parking"]:
+            amenity = facade.create_amenity({"name": name})
+            facade.add_amenity_to_place(place_id, amenity.id)
+
+        for index in range(3):
+            reviewer = self.create_user(
+                email=f"reviewer{index}@test.com"
+            )
+            facade.create_review({
+                "text": "Nice",
+                "rating": 4,
+                "user_id": reviewer.id,
+                "place_id": place_id
+            })
+
+        with self.count_queries() as statements:
+            response = self.client.get(f"/api/v1/places/{place_id}")
+
+        data = response.get_json()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data["owner"]["id"], owner_id)
+        self.assertEqual(len(data["amenities"]), 3)
+        self.assertEqual(len(data["reviews"]), 3)
+        self.assertTrue(
+            all("user" in review for review in data["reviews"])
+        )
+        # One version query for the ETag, then the eager load.
+        self.assertLessEqual(len(statements), 4)
+
+    def test_place_list_loads_amenities_in_one_query(self):
+        """
+        Test that a place page loads amenities with one extra query.
+        """
+        _, token = self.create_regular_token()
+        amenity_id = facade.create_amenity({"name": "WiFi"}).id
+
+        for index in range(4):
+            place_id = self.create_place(token, title=f"Place {index}")
+            facade.add_amenity_to_place(place_id, amenity_id)
+
+        with self.count_queries() as statements:
+            response = self.client.get("/api/v1/places/")
+
+        items = response.get_json()["items"]
+
+        self.assertEqual(len(items), 4)
+        self.assertTrue(
+            all(item["amenities"] == [amenity_id] for item in items)
+        )
+        # One version query for the ETag, the page, and the amenities.
+        self.assertLessEqual(len(statements), 3)
+
+    # Write-path tests
+
+    def assert_no_reload_after_write(self, statements):
+        """
+        Assert that no SELECT runs after the last INSERT or UPDATE.
+        """
+        write_indexes = [
+            index
+            for index, statement in enumerate(statements)
+            if statement.lstrip().upper().startswith(
+                ("INSERT", "UPDATE")
+            )
+        ]
+
+        self.assertTrue(write_indexes)
+        self.assertEqual(
+            [
+                statement
+                for statement in statements[write_indexes[-1] + 1:]
+                if statement.lstrip().upper().startswith("SELECT")
+            ],
+            []
+        )
+
+    def test_created_place_is_serialized_without_reload(self):
+        """
+        Test that a new place is serialized from memory.
+        """
+        _, token = self.create_regular_token()
+        amenity_id = facade.create_amenity({"name": "WiFi"}).id
+
+        with self.count_queries() as statements:
+            response = self.client.post(
+                "/api/v1/places/",
+                headers=self.auth_headers(token),
+                json={
+                    "title": "Loft",
+                    "description": "Downtown loft",
+                    "price": 90,
+                    "latitude": 18.4,
+                    "longitude": -66.0,
+                    "amenity_ids": [amenity_id]
+                }
+            )
+
+        data = response.get_json()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(data["amenities"][0]["id"], amenity_id)
+        self.assertEqual(data["reviews"], [])
+        self.assertIsNotNone(data["owner"])
+        self.assert_no_reload_after_write(statements)
+
+    def test_updated_review_is_serialized_without_reload(self):
+        """
+        Test that an updated review is serialized from memory.
+        """
+        _, token = self.create_regular_token()
+        place_id = self.create_place(token)
+
+        created = self.client.post(
+            "/api/v1/reviews/",
+            headers=self.auth_headers(token),
+            json={
+                "text": "Good",
+                "rating": 3,
+                "place_id": place_id
+            }
+        )
+        review_id = created.get_json()["id"]
+
+        with self.count_queries() as statements:
+            response = self.client.put(
+                f"/api/v1/reviews/{review_id}",
+                headers=self.auth_headers(token),
+                json={
+                    "rating": 5
+                }
+            )
+
+        data = response.get_json()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data["rating"], 5)
+        self.assertIn("user", data)
+        self.assert_no_reload_after_write(statements)
+
+    def test_written_timestamps_match_reads(self):
+        """
+        Test that create, update, and get return the same timestamps.
+        """
+        _, token = self.create_regular_token()
+        timestamps = ("created_at", "updated_at")
+
+        created = self.client.post(
+            "/api/v1/places/",
+            headers=self.auth_headers(token),
+            json={
+                "title": "Cabin",
+                "description": "Quiet cabin",
+                "price": 120,
+                "latitude": 18.2,
+                "longitude": -66.4
+            }
+        ).get_json()
+        url = f"/api/v1/places/{created['id']}"
+        fetched_created = self.client.get(url).get_json()
+        updated = self.client.put(
+            url,
+            headers=self.auth_headers(token),
+            json={
+                "price": 150
+            }
+        ).get_json()
+        fetched_updated = self.client.get(url).get_json()
+
+        self.assertEqual(
+            [created[key] for key in timestamps],
+            [fetched_created[key] for key in timestamps]
+        )
+        self.assertEqual(
+            [updated[key] for key in timestamps],
+            [fetched_updated[key] for key in timestamps]
+        )
+
+    # Rating aggregate tests
+
+    def test_review_writes_maintain_place_ratings(self):
+        """
+        Test that review writes update the place rating aggregates.
+        """
+        _, owner_token = self.create_regular_token()
+        place_id = self.create_place(owner_token)
+        _, reviewer_token = self.create_regular_token(
+            email="reviewer@test.com",
+            password="review123"
+        )
+
+        first = self.client.post(
+            "/api/v1/reviews/",
+            headers=self.auth_headers(owner_token),
+            json={
+                "text": "Good",
+                "rating": 4,
+                "place_id": place_id
+            }
+        ).get_json()
+        second = self.client.post(
+            "/api/v1/reviews/",
+            headers=self.auth_headers(reviewer_token),
+            json={
+                "text": "Poor",
+                "rating": 2,
+                "place_id": place_id
+            }
+        ).get_json()
+
+        place = self.client.get(f"/api/v1/places/{place_id}").get_json()
+
+        self.assertEqual(place["review_count"], 2)
+        self.assertEqual(place["rating_sum"], 6)
+        self.assertEqual(place["average_rating"], 3.0)
+
+        self.client.put(
+            f"/api/v1/reviews/{second['id']}",
+            headers=self.auth_headers(reviewer_token),
+            json={
+                "rating": 5
+            }
+        )
+        self.client.delete(
+            f"/api/v1/reviews/{first['id']}",
+            headers=self.auth_headers(owner_token)
+        )
+
+        place = self.client.get(f"/api/v1/places/{place_id}").get_json()
+
+        self.assertEqual(place["review_count"], 1)
+        self.assertEqual(place["rating_sum"], 5)
+        self.assertEqual(place["average_rating"], 5.0)
+        self.assertEqual(
+            place["rating_histogram"],
+            {"1": 0, "2": 0, "3": 0, "4": 0, "5": 1}
+        )
+
+    # Conditional request tests
+
+    def test_place_detail_revalidates_with_etag(self):
+        """
+        Test that an unchanged place detail answers 304 without loading.
+        """
+        _, owner_token = self.create_regular_token()
+        place_id = self.create_place(owner_token)
+
+        first = self.client.get(f"/api/v1/places/{place_id}")
+        etag = first.headers["ETag"]
+
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("Last-Modified", first.headers)
+
+        with self.count_queries() as statements:
+            second = self.client.get(
+                f"/api/v1/places/{place_id}",
+                headers={"If-None-Match": etag}
+            )
+
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.data, b"")
+        self.assertEqual(second.headers["ETag"], etag)
+        self.assertEqual(len(statements), 1)
+
+        self.client.post(
+            "/api/v1/reviews/",
+            headers=self.auth_headers(owner_token),
+            json={
+                "text": "Good",
+                "rating": 4,
+                "place_id": place_id
+            }
+        )
+
+        third = self.client.get(
+            f"/api/v1/places/{place_id}",
+            headers={"If-None-Match": etag}
+        )
+
+        self.assertEqual(third.status_code, 200)
+        self.assertNotEqual(third.headers["ETag"], etag)
+        self.assertEqual(len(third.get_json()["reviews"]), 1)
+
+    def test_place_detail_honours_if_modified_since(self):
+        """
+        Test that If-Modified-Since is compared with Last-Modified.
+        """
+        _, token = self.create_regular_token()
+        place_id = self.create_place(token)
+
+        first = self.client.get(f"/api/v1/places/{place_id}")
+        second = self.client.get(
+            f"/api/v1/places/{place_id}",
+            headers={
+                "If-Modified-Since": first.headers["Last-Modified"]
+            }
+        )
+        stale = self.client.get(
+            f"/api/v1/places/{place_id}",
+            headers={
+                "If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"
+            }
+        )
+
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(stale.status_code, 200)
+
+    def test_place_list_etag_follows_data_and_query(self):
+        """
+        Test that collection tags change with the rows and parameters.
+        """
+        _, token = self.create_regular_token()
+        self.create_place(token, title="First")
+
+        first = self.client.get("/api/v1/places/")
+        etag = first.headers["ETag"]
+
+        unchanged = self.client.get(
+            "/api/v1/places/",
+            headers={"If-None-Match": etag}
+        )
+        other_query = self.client.get(
+            "/api/v1/places/?sort=price",
+            headers={"If-None-Match": etag}
+        )
+
+        self.assertEqual(unchanged.status_code, 304)
+        self.assertEqual(other_query.status_code, 200)
+
+        self.create_place(token, title="Second")
+
+        changed = self.client.get(
+            "/api/v1/places/",
+            headers={"If-None-Match": etag}
+        )
+
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(len(changed.get_json()["items"]), 2)
+
+    # Sparse fieldset tests
+
+    def test_place_list_fields_narrow_keys_and_columns(self):
+        """
+        Test that fields limits both the response keys and the SELECT.
+        """
+        _, token = self.create_regular_token()
+        self.create_place(token)
+
+        with self.count_queries() as statements:
+            response = self.client.get("/api/v1/places/?fields=title,price")
+
+        item = response.get_json()["items"][0]
+        place_selects = [
+            statement
+            for statement in statements
+            if statement.startswith("SELECT places.")
+        ]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(item), {"id", "title", "price"})
+        self.assertEqual(len(place_selects), 1)
+        self.assertNotIn("places.description", place_selects[0])
+
+    def test_place_detail_expands_requested_relationships(self):
+        """
+        Test that expand replaces the default detail relationships.
+        """
+        _, token = self.create_regular_token()
+        place_id = self.create_place(token)
+
+        response = self.client.get(
+            f"/api/v1/places/{place_id}?fields=title&expand=owner"
+        )
+        data = response.get_json()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(data), {"id", "title", "owner"})
+        self.assertEqual(data["owner"]["email"], "regular@test.com")
+
+    def test_review_and_user_fieldsets(self):
+        """
+        Test fields and expand on review and user endpoints.
+        """
+        user, token = self.create_regular_token()
+        place_id = self.create_place(token)
+        self.client.post(
+            "/api/v1/reviews/",
+            headers=self.auth_headers(token),
+            json={
+                "text": "Good",
+                "rating": 5,
+                "place_id": place_id
+            }
+        )
+
+        reviews = self.client.get(
+            f"/api/v1/reviews/places/{place_id}?fields=rating&expand=place"
+        ).get_json()["items"]
+        user_data = self.client.get(
+            f"/api/v1/users/{user.id}?fields=email&expand=places,reviews"
+        ).get_json()
+
+        self.assertEqual(set(reviews[0]), {"id", "rating", "place"})
+        self.assertEqual(reviews[0]["place"]["id"], place_id)
+        self.assertEqual(
+            set(user_data),
+            {"id", "email", "places", "reviews"}
+        )
+        self.assertEqual(user_data["places"][0]["id"], place_id)
+        self.assertEqual(user_data["reviews"][0]["rating"], 5)
+
+    def test_fieldsets_reject_unknown_names(self):
+        """
+        Test that unknown fields and expansions are rejected.
+        """
+        user, _ = self.create_regular_token()
+
+        for url in (
+            "/api/v1/places/?fields=bogus",
+            "/api/v1/places/?expand=bogus",
+            "/api/v1/reviews/?expand=user.places",
+            f"/api/v1/users/{user.id}?fields=password"
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("error", response.get_json())
+
+    # Response cache tests
+
+    def enable_response_cache(self):
+        """
+        Enable the in-process response cache for this application.
+        """
+        self.app.config["RESPONSE_CACHE_ENABLED"] = True
+        response_cache.init_app(self.app)
+
+    def test_place_list_cached_until_review_write(self):
+        """
+        Test that listings are served from cache until a review write.
+        """
+        self.enable_response_cache()
+        _, token = self.create_regular_token()
+        place_id = self.create_place(token)
+
+        first = self.client.get("/api/v1/places/?limit=10")
+
+        with self.count_queries() as statements:
+            second = self.client.get("/api/v1/places/?limit=10")
+
+        self.assertEqual(first.headers["X-Cache"], "MISS")
+        self.assertEqual(second.headers["X-Cache"], "HIT")
+        self.assertEqual(second.get_json(), first.get_json())
+        self.assertEqual(len(statements), 0)
+
+        revalidated = self.client.get(
+            "/api/v1/places/?limit=10",
+            headers={"If-None-Match": first.headers["ETag"]}
+        )
+
+        self.assertEqual(revalidated.status_code, 304)
+
+        self.client.post(
+            "/api/v1/reviews/",
+            headers=self.auth_headers(token),
+            json={
+                "text": "Good",
+                "rating": 4,
+                "place_id": place_id
+            }
+        )
+
+        third = self.client.get("/api/v1/places/?limit=10")
+
+        self.assertEqual(third.headers["X-Cache"], "MISS")
+        self.assertEqual(third.get_json()["items"][0]["review_count"], 1)
+
+    def test_place_review_list_invalidated_by_place_tag(self):
+        """
+        Test that a review write only invalidates its own place's list.
+        """
+        self.enable_response_cache()
+        _, token = self.create_regular_token()
+        first_id = self.create_place(token, title="First")
+        second_id = self.create_place(token, title="Second")
+
+        self.client.get(f"/api/v1/reviews/places/{first_id}")
+        self.client.get(f"/api/v1/reviews/places/{second_id}")
+
+        self.client.post(
+            "/api/v1/reviews/",
+            headers=self.auth_headers(token),
+            json={
+                "text": "Good",
+                "rating": 5,
+                "place_id": first_id
+            }
+        )
+
+        first = self.client.get(f"/api/v1/reviews/places/{first_id}")
+        second = self.client.get(f"/api/v1/reviews/places/{second_id}")
+
+        self.assertEqual(first.headers["X-Cache"], "MISS")
+        self.assertEqual(len(first.get_json()["items"]), 1)
+        self.assertEqual(second.headers["X-Cache"], "HIT")
+
+    # Instrumentation tests
+
+    def test_response_reports_server_timing(self):
+        """
+        Test that responses report query counts and phases.
+        """
+        facade.create_amenity({"name": "WiFi"})
+
+        response = self.client.get("/api/v1/amenities/")
+        server_timing = response.headers.get("Server-Timing", "")
+
+        self.assertIn('db;dur=', server_timing)
+        # The ETag version query and the page query.
+        self.assertIn('desc="2 queries"', server_timing)
+        self.assertIn("serialize;dur=", server_timing)
+        self.assertIn("total;dur=", server_timing)
+
 
 if __name__ == "__main__":
     unittest.main()
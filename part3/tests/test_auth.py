@@ -9,6 +9,7 @@ from flask_jwt_extended import decode_token
 
 from app import create_app
 from app.extensions import db
+from app.password_hashing import HashingPool, check_password, hash_password
 from app.services import facade
 
 
@@ -258,6 +259,73 @@ class AuthTestCase(unittest.TestCase):
             "user@test.com"
         )
 
+    def test_login_reports_auth_timing(self):
+        """
+        Test that login timing separates password verification.
+        """
+
+        response = self.login(
+            "user@test.com",
+            "password123"
+        )
+
+        server_timing = response.headers.get("Server-Timing", "")
+
+        self.assertIn("auth;dur=", server_timing)
+        self.assertIn('desc="1 queries"', server_timing)
+        self.assertIn('hash_queue;desc="0"', server_timing)
+
+    def test_password_hashing_runs_in_worker_process(self):
+        """
+        Test that the pool hashes and verifies in a worker process.
+        """
+
+        pool = HashingPool(1, 4, 10.0, "spawn")
+
+        try:
+            password_hash = pool.run(hash_password, "password123", 4)
+
+            self.assertTrue(
+                pool.run(check_password, password_hash, "password123")
+            )
+            self.assertEqual(
+                pool.run_many(
+                    check_password,
+                    [
+                        (password_hash, "password123"),
+                        (password_hash, "wrong")
+                    ]
+                ),
+                [True, False]
+            )
+        finally:
+            pool.shutdown()
+
+        self.assertEqual(pool.stats()["completed"], 4)
+        self.assertEqual(pool.stats()["pending"], 0)
+
+    def test_login_returns_503_when_hashing_is_saturated(self):
+        """
+        Test that a full hashing queue rejects logins with Retry-After.
+        """
+
+        pool = HashingPool(1, 1, 0, "spawn")
+        self.app.extensions["password_hasher"] = pool
+
+        try:
+            job = pool.submit(hash_password, "password123", 4)
+            response = self.login(
+                "user@test.com",
+                "password123"
+            )
+            job.result()
+        finally:
+            pool.shutdown()
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers.get("Retry-After"), "1")
+        self.assertEqual(pool.stats()["rejected"], 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,791 @@
+#!/usr/bin/python3
+"""
+Tests for the HBnB persistence layer.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.persistence.amenity_repository import AmenityRepository
+from app.persistence.cache import LRUCache
+from app.persistence.repository import InMemoryRepository
+from app.persistence.unit_of_work import UnitOfWork
+from app.encoding import dumps_json
+from app.response_cache import (
+    MemoryResponseBackend,
+    SQLiteResponseBackend
+)
+from app.serialization import PLACE_PLAN, SerializationPlan
+from app.services import facade
+from config import ProductionConfig, TestingConfig
+
+
+class RepositoryTestCase(unittest.TestCase):
+    """
+    Test repository operations against in-memory SQLite.
+    """
+
+    def setUp(self):
+        """
+        Create a fresh in-memory database for each test.
+        """
+        self.app = create_app("config.TestingConfig")
+        self.context = self.app.app_context()
+        self.context.push()
+
+        db.create_all()
+
+        self.amenity_repo = AmenityRepository()
+
+    def tearDown(self):
+        """
+        Remove all database data after each test.
+        """
+        db.session.remove()
+        db.drop_all()
+        self.context.pop()
+
+    def create_amenities(self, *names):
+        """
+        Persist amenities and return their IDs.
+        """
+        return [
+            self.amenity_repo.add(Amenity(name)).id
+            for name in names
+        ]
+
+    def test_get_many_preserves_input_order(self):
+        """
+        Test that get_many returns objects in the requested order.
+        """
+        wifi_id, pool_id, gym_id = self.create_amenities(
+            "WiFi",
+            "Pool",
+            "Gym"
+        )
+
+        found, missing = self.amenity_repo.get_many(
+            [gym_id, wifi_id, pool_id]
+        )
+
+        self.assertEqual(
+            [amenity.id for amenity in found],
+            [gym_id, wifi_id, pool_id]
+        )
+        self.assertEqual(missing, [])
+
+    def test_get_many_reports_missing_ids(self):
+        """
+        Test that get_many reports IDs that do not exist.
+        """
+        (wifi_id,) = self.create_amenities("WiFi")
+
+        found, missing = self.amenity_repo.get_many(
+            ["unknown-1", wifi_id, "unknown-2"]
+        )
+
+        self.assertEqual(
+            [amenity.id for amenity in found],
+            [wifi_id]
+        )
+        self.assertEqual(missing, ["unknown-1", "unknown-2"])
+
+    def test_in_memory_get_many_matches_sql_behavior(self):
+        """
+        Test the in-memory implementation of get_many.
+        """
+        repo = InMemoryRepository()
+        wifi = Amenity("WiFi")
+        wifi.id = "wifi"
+        pool = Amenity("Pool")
+        pool.id = "pool"
+
+        repo.add(wifi)
+        repo.add(pool)
+
+        found, missing = repo.get_many(["pool", "sauna", "wifi"])
+
+        self.assertEqual(found, [pool, wifi])
+        self.assertEqual(missing, ["sauna"])
+
+    def test_in_memory_indexes_follow_writes(self):
+        """
+        Test that attribute indexes follow add, update, and delete.
+        """
+        repo = InMemoryRepository(unique=("name",), indexed=("bit",))
+        wifi = Amenity("WiFi")
+        wifi.id = "wifi"
+        wifi.bit = 1
+        pool = Amenity("Pool")
+        pool.id = "pool"
+        pool.bit = 1
+
+        repo.add(wifi)
+        repo.add(pool)
+
+        self.assertIs(repo.get_by_attribute("name", "Pool"), pool)
+        self.assertEqual(repo.get_all_by_attribute("bit", 1), [wifi, pool])
+
+        repo.update(wifi.id, {"name": " Fast WiFi "})
+
+        self.assertIsNone(repo.get_by_attribute("name", "WiFi"))
+        self.assertIs(repo.get_by_attribute("name", "Fast WiFi"), wifi)
+
+        with self.assertRaises(ValueError):
+            repo.update(pool.id, {"name": "Fast WiFi", "bit": 3})
+
+        self.assertEqual((pool.name, pool.bit), ("Pool", 1))
+        self.assertIsNone(pool.updated_at)
+        self.assertIs(repo.get_by_attribute("name", "Pool"), pool)
+
+        pool.bit = 2
+        repo.reindex(pool)
+        repo.delete(wifi.id)
+
+        self.assertIsNone(repo.get_by_attribute("name", "Fast WiFi"))
+        self.assertEqual(repo.get_all_by_attribute("bit", 1), [])
+        self.assertEqual(repo.get_all_by_attribute("bit", 2), [pool])
+
+    def count_queries_for(self, function, *args):
+        """
+        Call a function in a fresh session and count its SQL statements.
+        """
+        statements = []
+
+        def before_cursor_execute(*event_args):
+            statements.append(event_args[2])
+
+        db.session.remove()
+        event.listen(
+            db.engine,
+            "before_cursor_execute",
+            before_cursor_execute
+        )
+
+        try:
+            result = function(*args)
+        finally:
+            event.remove(
+                db.engine,
+                "before_cursor_execute",
+                before_cursor_execute
+            )
+
+        return result, statements
+
+    def test_cached_get_skips_primary_key_query(self):
+        """
+        Test that a repeated lookup is served from the entity cache.
+        """
+        amenity_id = facade.create_amenity({"name": "WiFi"}).id
+
+        first, first_statements = self.count_queries_for(
+            facade.get_amenity,
+            amenity_id
+        )
+        second, second_statements = self.count_queries_for(
+            facade.get_amenity,
+            amenity_id
+        )
+
+        self.assertEqual(first.name, "WiFi")
+        self.assertEqual(second.name, "WiFi")
+        self.assertEqual(len(first_statements), 1)
+        self.assertEqual(len(second_statements), 0)
+        self.assertEqual(facade.cache_stats()["amenities"]["hits"], 1)
+
+    def test_update_invalidates_cached_entity(self):
+        """
+        Test that an update is visible through the cache.
+        """
+        amenity_id = facade.create_amenity({"name": "WiFi"}).id
+
+        facade.get_amenity(amenity_id)
+        facade.update_amenity(amenity_id, {"name": "Fast WiFi"})
+
+        db.session.remove()
+
+        self.assertEqual(
+            facade.get_amenity(amenity_id).name,
+            "Fast WiFi"
+        )
+
+    def test_lru_cache_evicts_and_expires_entries(self):
+        """
+        Test LRU eviction and TTL expiry counters.
+        """
+        now = [0.0]
+        cache = LRUCache(2, ttl=10, clock=lambda: now[0])
+
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+
+        now[0] = 11.0
+
+        self.assertIsNone(cache.get("c"))
+
+        stats = cache.stats()
+
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["expirations"], 1)
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 2)
+
+    def test_lru_cache_discards_loads_racing_an_invalidation(self):
+        """
+        Test that a value loaded before an invalidation is not stored.
+        """
+        cache = LRUCache(4)
+        generation = cache.generation()
+
+        # A writer commits and invalidates while the reader loads.
+        cache.delete("a")
+
+        self.assertFalse(cache.set("a", "stale", generation))
+        self.assertIsNone(cache.get("a"))
+        self.assertTrue(cache.set("a", "fresh", cache.generation()))
+        self.assertEqual(cache.get("a"), "fresh")
+
+    def test_response_cache_backends(self):
+        """
+        Test tag invalidation, byte eviction, expiry, and stale writes.
+        """
+        directory = tempfile.mkdtemp()
+        now = [100.0]
+
+        def clock():
+            return now[0]
+
+        backends = {
+            "memory": MemoryResponseBackend(10, clock=clock),
+            "sqlite": SQLiteResponseBackend(
+                os.path.join(directory, "responses.db"),
+                10,
+                clock=clock
+            )
+        }
+
+        try:
+            for name, backend in backends.items():
+                with self.subTest(backend=name):
+                    now[0] = 100.0
+                    headers = {"ETag": '"a"'}
+
+                    backend.set("a", b"aaaa", headers, ["places"], ttl=5)
+                    backend.set("b", b"bbbb", {}, ["place:1"], ttl=5)
+                    now[0] = 101.5
+
+                    self.assertEqual(backend.get("a"), (b"aaaa", headers))
+
+                    now[0] = 102.0
+                    backend.set("c", b"cccc", {}, ["place:2"], ttl=5)
+
+                    self.assertIsNone(backend.get("b"))
+                    self.assertIsNotNone(backend.get("a"))
+
+                    backend.invalidate(["places"])
+
+                    self.assertIsNone(backend.get("a"))
+                    self.assertIsNotNone(backend.get("c"))
+
+                    stored = backend.set(
+                        "d",
+                        b"dd",
+                        {},
+                        ["places"],
+                        started=101.0
+                    )
+
+                    self.assertFalse(stored)
+                    self.assertIsNone(backend.get("d"))
+
+                    now[0] = 108.0
+
+                    self.assertIsNone(backend.get("c"))
+                    self.assertEqual(backend.stats()["entries"], 0)
+        finally:
+            for filename in os.listdir(directory):
+                os.remove(os.path.join(directory, filename))
+
+            os.rmdir(directory)
+
+    def test_facade_write_commits_once(self):
+        """
+        Test that a place update with amenities is one transaction.
+        """
+        owner = facade.create_user({
+            "first_name": "Owner",
+            "last_name": "User",
+            "email": "owner@test.com",
+            "password": "owner123"
+        })
+        wifi_id, pool_id = [
+            facade.create_amenity({"name": name}).id
+            for name in ["WiFi", "Pool"]
+        ]
+        place = facade.create_place({
+            "title": "Cabin",
+            "description": "Quiet",
+            "price": 80,
+            "latitude": 10,
+            "longitude": 20,
+            "owner_id": owner.id
+        })
+        commits = []
+
+        def after_commit(session):
+            commits.append(session)
+
+        event.listen(Session, "after_commit", after_commit)
+
+        try:
+            facade.update_place(
+                place.id,
+                {"price": 90, "amenity_ids": [wifi_id, pool_id]}
+            )
+        finally:
+            event.remove(Session, "after_commit", after_commit)
+
+        self.assertEqual(len(commits), 1)
+        self.assertEqual(place.price, 90)
+        self.assertEqual(
+            {amenity.id for amenity in place.amenities},
+            {wifi_id, pool_id}
+        )
+
+    def test_failed_write_rolls_back(self):
+        """
+        Test that an error inside a unit of work leaves no changes.
+        """
+        amenity_id = facade.create_amenity({"name": "WiFi"}).id
+
+        with self.assertRaises(RuntimeError):
+            with UnitOfWork():
+                self.amenity_repo.update(amenity_id, {"name": "Pool"})
+                raise RuntimeError("write failed")
+
+        db.session.remove()
+
+        self.assertEqual(facade.get_amenity(amenity_id).name, "WiFi")
+
+    def test_production_pragmas_applied_on_connect(self):
+        """
+        Test that the production profile tunes new SQLite connections.
+        """
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "hbnb.db")
+
+        class TunedConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+            SQLITE_PRAGMAS = ProductionConfig.SQLITE_PRAGMAS
+
+        app = create_app(TunedConfig)
+
+        try:
+            with app.app_context():
+                with db.engine.connect() as connection:
+                    journal_mode = connection.exec_driver_sql(
+                        "PRAGMA journal_mode"
+                    ).scalar()
+                    foreign_keys = connection.exec_driver_sql(
+                        "PRAGMA foreign_keys"
+                    ).scalar()
+
+                db.engine.dispose()
+        finally:
+            for filename in os.listdir(directory):
+                os.remove(os.path.join(directory, filename))
+
+            os.rmdir(directory)
+
+        self.assertEqual(journal_mode, "wal")
+        self.assertEqual(foreign_keys, 1)
+
+    def test_reconcile_ratings_command_repairs_drift(self):
+        """
+        Test that the reconcile command recomputes rating aggregates.
+        """
+        user = facade.create_user({
+            "first_name": "Owner",
+            "last_name": "User",
+            "email": "owner@test.com",
+            "password": "owner123"
+        })
+        place = facade.create_place({
+            "title": "Cabin",
+            "description": "Quiet",
+            "price": 80,
+            "latitude": 10,
+            "longitude": 20,
+            "owner_id": user.id
+        })
+        facade.create_review({
+            "text": "Great",
+            "rating": 5,
+            "user_id": user.id,
+            "place_id": place.id
+        })
+        place_id = place.id
+
+        db.session.execute(
+            db.update(Place).values(review_count=0, rating_5=0)
+        )
+        db.session.commit()
+
+        result = self.app.test_cli_runner().invoke(
+            args=["hbnb", "reconcile-ratings"]
+        )
+        db.session.remove()
+        place = db.session.get(Place, place_id)
+
+        self.assertIn("1 place(s)", result.output)
+        self.assertEqual(place.review_count, 1)
+        self.assertEqual(place.rating_5, 1)
+        self.assertEqual(place.average_rating, 5.0)
+
+    def test_import_command_validates_batches_and_resumes(self):
+        """
+        Test that imports reject invalid rows, link references, and
+        resume after the rows recorded in their checkpoint.
+        """
+        owner = facade.create_user({
+            "first_name": "Owner",
+            "last_name": "User",
+            "email": "owner@test.com",
+            "password": "owner123"
+        })
+        wifi = facade.create_amenity({"name": "WiFi"})
+        owner_id, wifi_id, wifi_mask = owner.id, wifi.id, wifi.mask
+        runner = self.app.test_cli_runner()
+
+        with tempfile.TemporaryDirectory() as directory:
+            places_path = os.path.join(directory, "places.csv")
+            reviews_path = os.path.join(directory, "reviews.ndjson")
+
+            with open(places_path, "w", encoding="utf-8") as file:
+                file.write(
+                    "id,title,description,price,latitude,longitude,"
+                    "owner_email,amenity_names\n"
+                    "p-0,Skipped,Quiet,80,10,20,owner@test.com,WiFi\n"
+                    "p-1,Cabin,Quiet,80,10,20,owner@test.com,WiFi\n"
+                    "p-2,Loft,Quiet,-5,10,20,owner@test.com,\n"
+                    "p-3,Barn,Quiet,60,10,20,nobody@test.com,\n"
+                )
+
+            with open(
+                places_path + ".checkpoint", "w", encoding="utf-8"
+            ) as file:
+                json.dump(
+                    {
+                        "source": os.path.abspath(places_path),
+                        "entity": "places",
+                        "rows": 1
+                    },
+                    file
+                )
+
+            with open(reviews_path, "w", encoding="utf-8") as file:
+                for rating in (4, 2):
+                    file.write(json.dumps({
+                        "text": "Nice",
+                        "rating": rating,
+                        "place_id": "p-1",
+                        "user_email": "owner@test.com"
+                    }) + "\n")
+
+            places = runner.invoke(args=[
+                "hbnb", "import", "places", places_path, "--batch-size", "2"
+            ])
+            reviews = runner.invoke(
+                args=["hbnb", "import", "reviews", reviews_path]
+            )
+
+            with open(places_path + ".checkpoint", encoding="utf-8") as file:
+                checkpoint = json.load(file)
+
+        db.session.remove()
+        place = db.session.get(Place, "p-1")
+
+        self.assertIn("Resuming after 1 committed row(s)", places.output)
+        self.assertIn(
+            "Line 4: Price must be greater than zero",
+            places.output
+        )
+        self.assertIn("Line 5: Owner not found", places.output)
+        self.assertIn("Imported 1 places from 3 row(s)", places.output)
+        self.assertEqual(checkpoint["rows"], 4)
+        self.assertIsNone(db.session.get(Place, "p-0"))
+        self.assertEqual(place.owner_id, owner_id)
+        self.assertEqual([a.id for a in place.amenities], [wifi_id])
+        self.assertEqual(place.amenity_mask, wifi_mask)
+        self.assertIn(
+            "Line 2: User has already reviewed this place",
+            reviews.output
+        )
+        self.assertEqual(place.review_count, 1)
+        self.assertEqual(place.average_rating, 4.0)
+
+    def test_import_command_does_not_duplicate_replayed_rows(self):
+        """
+        Test that rows without an ID committed before a lost checkpoint
+        are rejected, not inserted again, when the import resumes.
+        """
+        facade.create_user({
+            "first_name": "Owner",
+            "last_name": "User",
+            "email": "owner@test.com",
+            "password": "owner123"
+        })
+        runner = self.app.test_cli_runner()
+
+        with tempfile.TemporaryDirectory() as directory:
+            places_path = os.path.join(directory, "places.csv")
+
+            with open(places_path, "w", encoding="utf-8") as file:
+                file.write(
+                    "title,description,price,latitude,longitude,"
+                    "owner_email\n"
+                    "Cabin,Quiet,80,10,20,owner@test.com\n"
+                    "Loft,Quiet,60,10,20,owner@test.com\n"
+                )
+
+            args = ["hbnb", "import", "places", places_path]
+            runner.invoke(args=args)
+            # The process stopped before the checkpoint was saved.
+            os.remove(places_path + ".checkpoint")
+            replay = runner.invoke(args=args)
+
+        db.session.remove()
+
+        self.assertIn("Line 2: Place ID already exists", replay.output)
+        self.assertIn("Imported 0 places", replay.output)
+        self.assertEqual(db.session.query(Place).count(), 2)
+
+    def test_rebuild_search_command_restores_index(self):
+        """
+        Test that the rebuild command reindexes existing places.
+        """
+        user = facade.create_user({
+            "first_name": "Owner",
+            "last_name": "User",
+            "email": "owner@test.com",
+            "password": "owner123"
+        })
+        place = facade.create_place({
+            "title": "Beach cottage",
+            "description": "Quiet",
+            "price": 80,
+            "latitude": 10,
+            "longitude": 20,
+            "owner_id": user.id
+        })
+
+        db.session.execute(db.text(
+            "INSERT INTO places_fts (places_fts) VALUES ('delete-all')"
+        ))
+        db.session.commit()
+
+        before, _ = facade.search_places_page('"beach"', 10)
+        result = self.app.test_cli_runner().invoke(
+            args=["hbnb", "rebuild-search"]
+        )
+        after, _ = facade.search_places_page('"beach"', 10)
+
+        self.assertEqual(before, [])
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual([match.id for match, _ in after], [place.id])
+
+    def test_amenity_mask_follows_place_amenities(self):
+        """
+        Test that place amenity masks track amenity changes.
+        """
+        user = facade.create_user({
+            "first_name": "Owner",
+            "last_name": "User",
+            "email": "owner@test.com",
+            "password": "owner123"
+        })
+        wifi, pool, gym = [
+            facade.create_amenity({"name": name})
+            for name in ["WiFi", "Pool", "Gym"]
+        ]
+        place = facade.create_place({
+            "title": "Cabin",
+            "description": "Quiet",
+            "price": 80,
+            "latitude": 10,
+            "longitude": 20,
+            "owner_id": user.id,
+            "amenity_ids": [wifi.id]
+        })
+
+        self.assertEqual([wifi.bit, pool.bit, gym.bit], [0, 1, 2])
+        self.assertEqual(place.amenity_mask, wifi.mask)
+
+        facade.add_amenity_to_place(place.id, pool.id)
+        self.assertEqual(place.amenity_mask, wifi.mask | pool.mask)
+
+        facade.remove_amenity_from_place(place.id, wifi.id)
+        self.assertEqual(place.amenity_mask, pool.mask)
+
+        facade.update_place(place.id, {"amenity_ids": [gym.id]})
+        self.assertEqual(place.amenity_mask, gym.mask)
+
+    def test_amenity_bit_is_chosen_by_the_insert(self):
+        """
+        Test that a bit taken after the creation started is skipped.
+        """
+        repository = AmenityRepository()
+        gym = Amenity("Gym")
+        gym.bit = repository.lowest_free_bit()
+
+        # Another creation commits between choosing and inserting.
+        wifi = facade.create_amenity({"name": "WiFi"})
+
+        with UnitOfWork():
+            repository.add(gym)
+
+        db.session.refresh(gym)
+
+        self.assertEqual([wifi.bit, gym.bit], [0, 1])
+
+    def test_stream_places_yields_sorted_batches(self):
+        """
+        Test that streamed places arrive in batches, in sort order.
+        """
+        user = facade.create_user({
+            "first_name": "Owner",
+            "last_name": "User",
+            "email": "owner@test.com",
+            "password": "owner123"
+        })
+
+        for price in [30, 10, 20, 50, 40]:
+            facade.create_place({
+                "title": f"Place {price}",
+                "description": "Quiet",
+                "price": price,
+                "latitude": 10,
+                "longitude": 20,
+                "owner_id": user.id
+            })
+
+        batches = list(
+            facade.place_repo.stream_places(
+                filters={"min_price": 20},
+                sort="price",
+                batch_size=2
+            )
+        )
+
+        self.assertEqual([len(batch) for batch in batches], [2, 2])
+        self.assertEqual(
+            [place.price for batch in batches for place in batch],
+            [20, 30, 40, 50]
+        )
+
+    def test_serialization_plan_matches_to_dict(self):
+        """
+        Test that plans encode like to_dict(), loaded or expired.
+        """
+        user = facade.create_user({
+            "first_name": "Owner",
+            "last_name": "User",
+            "email": "owner@test.com",
+            "password": "owner123"
+        })
+        wifi = facade.create_amenity({"name": "WiFi"})
+        place = facade.create_place({
+            "title": "Cabin",
+            "description": "Quiet",
+            "price": 80,
+            "latitude": 10,
+            "longitude": 20,
+            "owner_id": user.id,
+            "amenity_ids": [wifi.id]
+        })
+        formatted_plan = SerializationPlan(
+            Place,
+            PLACE_PLAN.keys,
+            computed=dict(PLACE_PLAN.computed),
+            format_datetimes=True
+        )
+
+        for plan in (PLACE_PLAN, formatted_plan):
+            with self.subTest(datetimes=bool(plan.datetime_keys)):
+                self.assertEqual(
+                    json.loads(dumps_json(plan(place))),
+                    place.to_dict()
+                )
+
+        db.session.expire(place)
+
+        self.assertEqual(
+            json.loads(dumps_json(PLACE_PLAN(place))),
+            place.to_dict()
+        )
+
+    def test_rebuild_amenity_masks_command(self):
+        """
+        Test that the rebuild command assigns bits and repairs masks.
+        """
+        user = facade.create_user({
+            "first_name": "Owner",
+            "last_name": "User",
+            "email": "owner@test.com",
+            "password": "owner123"
+        })
+        wifi = facade.create_amenity({"name": "WiFi"})
+        place = facade.create_place({
+            "title": "Cabin",
+            "description": "Quiet",
+            "price": 80,
+            "latitude": 10,
+            "longitude": 20,
+            "owner_id": user.id,
+            "amenity_ids": [wifi.id]
+        })
+        place_id = place.id
+        wifi_id = wifi.id
+
+        db.session.execute(db.update(Amenity).values(bit=None))
+        db.session.execute(db.update(Place).values(amenity_mask=0))
+        db.session.commit()
+        db.session.remove()
+
+        join_page, _ = facade.get_places_page(
+            10,
+            filters={"amenity_ids": [wifi_id]}
+        )
+        join_ids = [match.id for match in join_page]
+        result = self.app.test_cli_runner().invoke(
+            args=["hbnb", "rebuild-amenity-masks"]
+        )
+        db.session.remove()
+        mask_page, _ = facade.get_places_page(
+            10,
+            filters={"amenity_ids": [wifi_id]}
+        )
+
+        self.assertEqual(join_ids, [place_id])
+        self.assertIn("Assigned 1 amenity bit(s)", result.output)
+        self.assertEqual([match.id for match in mask_page], [place_id])
+        self.assertEqual(db.session.get(Place, place_id).amenity_mask, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,12 @@
 const API_URL = "http://127.0.0.1:5000/api/v1";
 
+// Places are fetched one page at a time, with only the card fields.
+const PLACES_PAGE_SIZE = 24;
+const PLACE_CARD_FIELDS = ["id", "title", "description", "price"];
+
 let allPlaces = [];
+let placesCursor = null;
+let placesRequestId = 0;
 
 
 document.addEventListener("DOMContentLoaded", () => {
@@ -28,7 +34,7 @@ document.addEventListener("DOMContentLoaded", () => {
     if (priceFilter) {
         priceFilter.addEventListener(
             "change",
-            applyPlaceFilters
+            () => fetchPlaces(token)
         );
     }
 
@@ -151,20 +157,36 @@ async function handleLogin(event) {
 }
 
 
-async function fetchPlaces(token) {
+async function fetchPlaces(token, cursor = null) {
     const placesList = document.getElementById("places-list");
 
     if (!placesList) {
         return;
     }
 
+    const requestId = ++placesRequestId;
+    const params = getPlaceQueryParams();
+
+    params.set("limit", String(PLACES_PAGE_SIZE));
+    params.set("fields", PLACE_CARD_FIELDS.join(","));
+
+    if (cursor) {
+        params.set("cursor", cursor);
+    } else {
+        placesCursor = null;
+        updateLoadMoreButton(token);
+    }
+
     placesList.setAttribute("aria-busy", "true");
 
     try {
         const response = await fetch(
-            `${API_URL}/places/`,
+            `${API_URL}/places/?${params.toString()}`,
             {
                 method: "GET",
+                // Revalidate the stored copy with its ETag; an
+                // unchanged page comes back as an empty 304.
+                cache: "no-cache",
                 headers: {
                     Authorization: `Bearer ${token}`
                 }
@@ -186,23 +208,70 @@ async function fetchPlaces(token) {
             );
         }
 
-        allPlaces = Array.isArray(data)
-            ? data
+        // A newer request started while this one was loading.
+        if (requestId !== placesRequestId) {
+            return;
+        }
+
+        const places = Array.isArray(data.items)
+            ? data.items
             : [];
 
+        allPlaces = cursor
+            ? allPlaces.concat(places)
+            : places;
+        placesCursor = data.next_cursor || null;
+
         populateCountryFilter(allPlaces);
-        displayPlaces(allPlaces);
+        applyPlaceFilters();
     } catch (error) {
-        placesList.textContent =
-            "Unable to load places. Check that the API is running.";
+        if (requestId === placesRequestId) {
+            placesList.textContent =
+                "Unable to load places. Check that the API is running.";
+        }
 
         console.error(error);
     } finally {
-        placesList.setAttribute("aria-busy", "false");
+        if (requestId === placesRequestId) {
+            placesList.setAttribute("aria-busy", "false");
+            updateLoadMoreButton(token);
+        }
     }
 }
 
 
+// Shows the next-page button while the API reports more places.
+function updateLoadMoreButton(token) {
+    const loadMoreButton = document.getElementById("load-more");
+
+    if (!loadMoreButton) {
+        return;
+    }
+
+    loadMoreButton.hidden = !placesCursor;
+    loadMoreButton.onclick = placesCursor
+        ? () => {
+            loadMoreButton.hidden = true;
+            fetchPlaces(token, placesCursor);
+        }
+        : null;
+}
+
+
+function getPlaceQueryParams() {
+    const priceFilter =
+        document.getElementById("price-filter");
+
+    const params = new URLSearchParams();
+
+    if (priceFilter && priceFilter.value !== "all") {
+        params.set("max_price", priceFilter.value);
+    }
+
+    return params;
+}
+
+
 function displayPlaces(places) {
     const placesList = document.getElementById("places-list");
 
@@ -277,6 +346,8 @@ function populateCountryFilter(places) {
         return;
     }
 
+    const selectedCountry = countryFilter.value;
+
     const countries = places
         .map((place) => getPlaceCountry(place))
         .filter((country) => country)
@@ -304,39 +375,33 @@ function populateCountryFilter(places) {
 
         countryFilter.appendChild(option);
     });
+
+    if (
+        countries.some(
+            (country) => country.toLowerCase() === selectedCountry
+        )
+    ) {
+        countryFilter.value = selectedCountry;
+    }
 }
 
 
+// Price is filtered by the API; country is not an API field.
 function applyPlaceFilters() {
-    const priceFilter =
-        document.getElementById("price-filter");
-
     const countryFilter =
         document.getElementById("country-filter");
 
-    const selectedPrice = priceFilter
-        ? priceFilter.value
-        : "all";
-
     const selectedCountry = countryFilter
         ? countryFilter.value.toLowerCase()
         : "all";
 
     const filteredPlaces = allPlaces.filter((place) => {
-        const price = Number(place.price);
         const country = getPlaceCountry(place).toLowerCase();
 
-        const priceMatches = (
-            selectedPrice === "all" ||
-            price <= Number(selectedPrice)
-        );
-
-        const countryMatches = (
+        return (
             selectedCountry === "all" ||
             country === selectedCountry
         );
-
-        return priceMatches && countryMatches;
     });
 
     displayPlaces(filteredPlaces);
@@ -448,7 +513,8 @@ async function fetchPlaceDetails(placeId) {
         const response = await fetch(
             `${API_URL}/places/${encodeURIComponent(placeId)}`,
             {
-                method: "GET"
+                method: "GET",
+                cache: "no-cache"
             }
         );
 
@@ -676,7 +742,8 @@ async function loadReviewPlaceName(placeId) {
         const response = await fetch(
             `${API_URL}/places/${encodeURIComponent(placeId)}`,
             {
-                method: "GET"
+                method: "GET",
+                cache: "no-cache"
             }
         );
 